@@ -0,0 +1,81 @@
+"""Бенчмарк сжатия динамических ответов: затраты CPU против сэкономленных байт
+
+Запуск: `python -m benchmarks.compression [--iterations 200] [--levels 1 6 9]`
+
+Для каждого тела ответа и уровня сжатия измеряется процессорное время на один ответ и размер после сжатия.
+Потоковый режим сжимает тело частями по `config.TEMPLATES_STREAM_CHUNK_SIZE` со сбросом каждой части
+(`Z_SYNC_FLUSH`), как `CompressionMiddleware` для потоковых ответов.
+"""
+import argparse
+import json
+import sys
+import time
+import zlib
+
+from fastapi.testclient import TestClient
+
+from src import config
+from tests.webhooks.fake_events import FakeWebhookPayloads
+
+
+def get_bodies() -> dict[str, bytes]:
+    """Типичные тела ответов: страницы приложения, большая HTML таблица и JSON"""
+    from src.main import gitlab_wh
+
+    client = TestClient(gitlab_wh.app)
+    fake = FakeWebhookPayloads(seed=0)
+    rows = "".join(
+        f"<tr><td>{number}</td><td>group-{number % 10}/project-{number}</td><td>main</td></tr>\n"
+        for number in range(5_000)
+    )
+    return {
+        "index.html": client.get("/").content,
+        "not_found.html": client.get("/not-found").content,
+        "table.html": f"<table>{rows}</table>".encode(),
+        "events.json": json.dumps([fake.random_payload() for _ in range(200)]).encode(),
+    }
+
+
+def compress(body: bytes, level: int, chunk_size: int | None = None) -> int:
+    """Сжать тело gzip целиком или частями со сбросом каждой части
+
+    Returns:
+        Размер сжатого тела
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if chunk_size is None:
+        return len(compressor.compress(body) + compressor.flush())
+    size = 0
+    for start in range(0, len(body), chunk_size):
+        size += len(compressor.compress(body[start:start + chunk_size]) + compressor.flush(zlib.Z_SYNC_FLUSH))
+    return size + len(compressor.flush())
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="количество сжатий каждого тела")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9], help="уровни сжатия")
+    args = parser.parse_args()
+
+    import logging
+
+    logging.disable(logging.CRITICAL)
+
+    sys.stdout.write(f"{'body':>16} {'mode':>9} {'level':>5} {'size':>9} {'saved':>7} {'cpu/response':>13}\n")
+    for name, body in get_bodies().items():
+        for mode, chunk_size in (("whole", None), ("streaming", config.TEMPLATES_STREAM_CHUNK_SIZE)):
+            for level in args.levels:
+                start = time.process_time()
+                for _ in range(args.iterations):
+                    size = compress(body, level, chunk_size)
+                cpu_us = (time.process_time() - start) / args.iterations * 1_000_000
+                saved = 1 - size / len(body)
+                sys.stdout.write(
+                    f"{name:>16} {mode:>9} {level:>5} {size:>9} {saved:>7.1%} {cpu_us:>10.0f} µs"
+                    f"  (исходный размер {len(body)})\n",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Бенчмарк слоя HTTP запросов в GitLab (`src/repository/http_requests`)
+
+Запуск: `python -m benchmarks.http_requests [--sizes 100 1000 5000] [--latencies 0 0.02] [--repeat 5]
+[--output results.json] [--compare baseline.json] [--threshold 0.2]`
+
+Методы `GitLabHTTPv4` (list_projects, list_groups, list_group_members, list_personal_access_tokens,
+list_project_access_tokens) выполняются против локального `FakeGitLab` при разных размерах данных и задержках
+ответа. Для каждого вызова записываются время (медиана по `--repeat` запускам), процессорное время потока
+клиента, количество запросов в GitLab и пик памяти (отдельный запуск под tracemalloc, чтобы он не искажал время).
+
+`FakeGitLab` работает в отдельном потоке со своим event loop: процессорное время клиента не включает
+работу сервера. Пик памяти считается по всему процессу и включает страницы, которые сервер сериализует
+во время вызова.
+
+`--output` сохраняет результаты в JSON. `--compare` сравнивает результаты с сохраненными ранее (например,
+на предыдущем коммите) и завершается с кодом 1, если время, процессорное время, количество запросов или пик
+памяти какого-либо вызова выросли больше чем на `--threshold`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+from tests.repository.http_requests.fake_gitlab import MAX_COUNTED_RECORDS, FakeGitLab, FakeGitLabData
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+
+METRICS = ("wall", "cpu", "requests", "peak_memory")
+
+CASES: dict[str, Callable[[GitLabHTTPv4], Awaitable[list[Any]]]] = {
+    "list_projects": lambda gitlab_http: gitlab_http.list_projects(),
+    "list_groups": lambda gitlab_http: gitlab_http.list_groups(),
+    "list_group_members": lambda gitlab_http: gitlab_http.list_group_members(1),
+    "list_personal_access_tokens": lambda gitlab_http: gitlab_http.list_personal_access_tokens(),
+    "list_project_access_tokens": lambda gitlab_http: gitlab_http.list_project_access_tokens(1),
+}
+
+
+class Result(NamedTuple):
+    """Результат бенчмарка одного вызова
+
+    case: вызываемый метод
+    size: размер данных (репозитории, пользователи, участники группы, токены)
+    latency: задержка ответа fake GitLab в секундах
+    items: количество полученных записей
+    wall: время вызова в секундах (медиана)
+    cpu: процессорное время потока клиента в секундах (медиана)
+    requests: количество запросов в GitLab за вызов
+    peak_memory: пик памяти процесса за вызов в байтах
+    """
+    case: str
+    size: int
+    latency: float
+    items: int
+    wall: float
+    cpu: float
+    requests: int
+    peak_memory: int
+
+    @property
+    def key(self) -> str:
+        """Ключ для сравнения результатов разных запусков"""
+        return f"{self.case}[size={self.size},latency={self.latency:g}]"
+
+
+class FakeGitLabThread:
+    """`FakeGitLab` в отдельном потоке со своим event loop"""
+    def __init__(self, fake_gitlab: FakeGitLab) -> None:
+        """Конструктор"""
+        self.fake_gitlab = fake_gitlab
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fake-gitlab", daemon=True)
+
+    def __enter__(self) -> FakeGitLab:
+        """Запустить сервер"""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.fake_gitlab.start(), self._loop).result()
+        return self.fake_gitlab
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None,
+                 ) -> None:
+        """Остановить сервер"""
+        asyncio.run_coroutine_threadsafe(self.fake_gitlab.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def generate_data(size: int, seed: int) -> FakeGitLabData:
+    """Данные fake GitLab размера `size`: в первой группе `size` участников, у первого репозитория 10 токенов"""
+    data = FakeGitLabData.generate(
+        groups=max(size // 10, 1), projects=size, users=size, members=5, tokens=1, seed=seed,
+    )
+    data.group_members[1] = {user["id"]: 30 for user in data.users[:size]}
+    data.project_access_tokens[1] = [
+        {**data.make_token(f"bot-token-{index}", 1, expires_in_days=365), "access_level": 30} for index in range(10)
+    ]
+    return data
+
+
+async def measure(gitlab_http: GitLabHTTPv4,
+                  fake_gitlab: FakeGitLab,
+                  case: str,
+                  *,
+                  size: int,
+                  latency: float,
+                  repeat: int,
+                  ) -> Result:
+    """Измерить один вызов: `repeat` запусков для времени и один запуск под tracemalloc для памяти"""
+    call = CASES[case]
+    await call(gitlab_http)  # прогрев: соединения в пуле, импорты
+
+    walls, cpus = [], []
+    for _ in range(repeat):
+        fake_gitlab.reset_counters()
+        cpu_start, wall_start = time.thread_time(), time.perf_counter()
+        items = await call(gitlab_http)
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.thread_time() - cpu_start)
+    requests = fake_gitlab.requests
+
+    tracemalloc.start()
+    try:
+        await call(gitlab_http)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        case=case,
+        size=size,
+        latency=latency,
+        items=len(items),
+        wall=statistics.median(walls),
+        cpu=statistics.median(cpus),
+        requests=requests,
+        peak_memory=peak_memory,
+    )
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    """Запустить бенчмарк для всех размеров данных и задержек"""
+    results = []
+    for size in args.sizes:
+        data = generate_data(size, args.seed)
+        for latency in args.latencies:
+            fake_gitlab = FakeGitLab(
+                data, latency=latency, jitter=latency / 10, max_counted_records=args.max_counted_records,
+            )
+            with FakeGitLabThread(fake_gitlab):
+                async with fake_gitlab.session() as session:
+                    gitlab_http = GitLabHTTPv4(session)
+                    for case in args.cases:
+                        result = await measure(
+                            gitlab_http, fake_gitlab, case, size=size, latency=latency, repeat=args.repeat,
+                        )
+                        results.append(result)
+                        sys.stdout.write(format_result(result) + "\n")
+    return results
+
+
+def format_result(result: Result) -> str:
+    """Результат одной строкой"""
+    return (
+        f"{result.key:<60} items: {result.items:>6}  wall: {result.wall * 1_000:8.1f} ms  "
+        f"cpu: {result.cpu * 1_000:8.1f} ms  requests: {result.requests:>4}  "
+        f"peak: {result.peak_memory / 2**20:7.2f} MiB"
+    )
+
+
+def save(path: Path, results: list[Result], args: argparse.Namespace) -> None:
+    """Сохранить результаты в JSON"""
+    document = {
+        "label": args.label,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [{"key": result.key, **result._asdict()} for result in results],
+    }
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n")
+
+
+def compare(path: Path, results: list[Result], threshold: float) -> list[str]:
+    """Сравнить результаты с сохраненными в `path`
+
+    Returns:
+        Описания регрессий: метрики, которые выросли больше чем на `threshold` (доля)
+    """
+    baseline = {result["key"]: result for result in json.loads(path.read_text())["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None:
+            continue
+        changes = []
+        for metric in METRICS:
+            old, new = previous[metric], getattr(result, metric)
+            change = (new - old) / old if old else 0.0
+            changes.append(f"{metric} {change:+.0%}")
+            if change > threshold:
+                regressions.append(f"{result.key}: {metric} {old:g} -> {new:g} ({change:+.0%})")
+        sys.stdout.write(f"{result.key:<60} {', '.join(changes)}\n")
+    return regressions
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 5_000], help="размеры данных")
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.0, 0.02], help="задержки ответа, секунды")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES), help="вызываемые методы")
+    parser.add_argument("--repeat", type=int, default=5, help="запусков каждого вызова для медианы времени")
+    parser.add_argument("--max-counted-records", type=int, default=MAX_COUNTED_RECORDS,
+                        help="для списков длиннее fake GitLab не возвращает X-Total-Pages")
+    parser.add_argument("--output", type=Path, help="сохранить результаты в JSON")
+    parser.add_argument("--compare", type=Path, help="сравнить с результатами из JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост метрик при сравнении (доля)")
+    parser.add_argument("--label", default="", help="метка запуска в JSON (например, коммит)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        save(args.output, results, args)
+    if args.compare:
+        regressions = compare(args.compare, results, args.threshold)
+        if regressions:
+            sys.stdout.write("Регрессии:\n" + "".join(f"  {regression}\n" for regression in regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
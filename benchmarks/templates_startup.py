@@ -0,0 +1,104 @@
+"""Бенчмарк холодного старта шаблонов Jinja2
+
+Запуск: `python -m benchmarks.templates_startup [--runs 5]`
+
+Каждый сценарий запускается в отдельном процессе (как новый воркер после деплоя) и измеряет:
+время импорта приложения, время старта (lifespan) и задержку первых запросов к `/` и к странице 404.
+
+Сценарии:
+    lazy - без предкомпиляции и без кэша байткода (поведение до добавления кэша)
+    precompile-cold - предкомпиляция при старте, пустой кэш байткода (первый воркер после деплоя)
+    precompile-warm - предкомпиляция при старте, кэш байткода уже заполнен (перезапуск воркера)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = {
+    "lazy": {"GITLAB_WH_TEMPLATES_PRECOMPILE": "0", "GITLAB_WH_TEMPLATES_BYTECODE_CACHE": ""},
+    "precompile-cold": {"GITLAB_WH_TEMPLATES_PRECOMPILE": "1"},
+    "precompile-warm": {"GITLAB_WH_TEMPLATES_PRECOMPILE": "1"},
+}
+
+
+def child() -> None:
+    """Замеры внутри нового процесса, результат - JSON в stdout"""
+    import logging
+
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    from src.main import gitlab_wh
+    import_ms = (time.perf_counter() - start) * 1_000
+
+    client = TestClient(gitlab_wh.app)
+    start = time.perf_counter()
+    with client:
+        startup_ms = (time.perf_counter() - start) * 1_000
+
+        start = time.perf_counter()
+        client.get("/")
+        index_ms = (time.perf_counter() - start) * 1_000
+
+        start = time.perf_counter()
+        client.get("/not-found")
+        error_ms = (time.perf_counter() - start) * 1_000
+
+        start = time.perf_counter()
+        client.get("/")
+        index_second_ms = (time.perf_counter() - start) * 1_000
+
+    sys.stdout.write(json.dumps({
+        "import_ms": import_ms,
+        "startup_ms": startup_ms,
+        "first_index_ms": index_ms,
+        "first_error_ms": error_ms,
+        "second_index_ms": index_second_ms,
+    }))
+
+
+def run_scenario(env: dict[str, str]) -> dict[str, float]:
+    """Запустить замеры в новом процессе"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.templates_startup", "--child"],  # noqa: S603
+        env={**os.environ, **env},
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    measurements: dict[str, float] = json.loads(result.stdout)
+    return measurements
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="количество запусков каждого сценария")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    for scenario, scenario_env in SCENARIOS.items():
+        runs = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cache_path:
+                env = {"GITLAB_WH_TEMPLATES_BYTECODE_CACHE": cache_path, **scenario_env}
+                if scenario == "precompile-warm":
+                    run_scenario(env)  # заполнить кэш байткода
+                runs.append(run_scenario(env))
+
+        medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        sys.stdout.write(f"{scenario:>16}: " + ", ".join(f"{key}={value:.1f}" for key, value in medians.items()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Нагрузочный бенчмарк приема вебхуков
+
+Запуск: `python -m benchmarks.webhook_ingestion [--requests 5000] [--rate 0] [--concurrency 50] [--size 3]`
+
+Генерирует реалистичные тела вебхуков GitLab (push, merge_request, pipeline, member, системные хуки),
+отправляет их в ASGI приложение в том же процессе (без сети) и выводит p50/p99 задержки подтверждения
+(ответа 202) и устойчивую пропускную способность.
+
+`--rate 0` - замкнутый цикл: `--concurrency` клиентов отправляют запросы без пауз (максимальная пропускная
+способность). `--rate N` - открытый цикл: запросы отправляются с частотой N в секунду независимо от скорости
+ответов, что показывает поведение при заданной нагрузке (включая 429/503 при перегрузке).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from src.dependencies.webhooks import get_webhook_processor, get_webhook_secret_registry
+from src.main import gitlab_wh
+from src.webhooks.dispatcher import WebhookDispatcher
+from src.webhooks.events import WebhookEvent
+from src.webhooks.processing import WebhookProcessor
+from src.webhooks.rules import WebhookRule, WebhookRuleEngine
+from src.webhooks.secrets import WebhookSecretRegistry
+from tests.webhooks.fake_events import FakeWebhookPayloads
+
+HOOK_KEY = "benchmark"
+HOOK_SECRET = "benchmark-secret"  # noqa: S105
+
+
+async def noop_action(_event: WebhookEvent) -> None:
+    """Действие-заглушка: обработка события без побочных эффектов"""
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Перцентиль по отсортированному списку значений"""
+    index = min(int(len(sorted_values) * percent / 100), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Запустить бенчмарк"""
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if not args.access_log:
+        logging.getLogger("gitlab-wh.access").setLevel(logging.WARNING)
+
+    generator = FakeWebhookPayloads(size=args.size, seed=args.seed)
+    bodies = [json.dumps(generator.random_payload()).encode() for _ in range(args.requests)]
+    headers = {"X-Gitlab-Token": HOOK_SECRET, "Content-Type": "application/json"}
+
+    processor = WebhookProcessor(
+        WebhookDispatcher(WebhookRuleEngine([WebhookRule("*", "**", "noop")]), {"noop": noop_action}),
+        coalesce_window=args.coalesce_window,
+    )
+    app = gitlab_wh.app
+    app.dependency_overrides[get_webhook_secret_registry] = lambda: WebhookSecretRegistry({HOOK_KEY: HOOK_SECRET})
+    app.dependency_overrides[get_webhook_processor] = lambda: processor
+
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+
+        async def send(body: bytes) -> None:
+            start = time.perf_counter()
+            response = await client.post(f"/api/webhooks/{HOOK_KEY}", content=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+        processor.start()
+        start = time.perf_counter()
+        if args.rate > 0:
+            tasks = []
+            for number, body in enumerate(bodies):
+                delay = start + number / args.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(send(body)))
+            await asyncio.gather(*tasks)
+        else:
+            queue = iter(bodies)
+
+            async def client_loop() -> None:
+                for body in queue:
+                    await send(body)
+
+            await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        await processor.close()
+
+    app.dependency_overrides.clear()
+    latencies.sort()
+    sys.stdout.write(
+        f"requests: {len(latencies)}, body size: ~{sum(map(len, bodies)) // len(bodies)} B\n"
+        f"statuses: {dict(statuses)}\n"
+        f"throughput: {len(latencies) / elapsed:.0f} req/s\n"
+        f"ack latency p50: {percentile(latencies, 50) * 1_000:.2f} ms\n"
+        f"ack latency p99: {percentile(latencies, 99) * 1_000:.2f} ms\n",
+    )
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000, help="количество доставок")
+    parser.add_argument("--rate", type=float, default=0, help="доставок в секунду, 0 - без ограничения")
+    parser.add_argument("--concurrency", type=int, default=50, help="количество клиентов при --rate 0")
+    parser.add_argument("--size", type=int, default=3, help="размер тела (коммиты/изменения/джобы)")
+    parser.add_argument("--coalesce-window", type=float, default=2.0, help="окно объединения событий, секунды")
+    parser.add_argument("--access-log", action="store_true", help="писать access log (по умолчанию отключен)")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Бенчмарк сопоставления событий вебхуков с правилами
+
+Запуск: `python -m benchmarks.webhook_rules [--rules 10000] [--events 20000]`
+
+Сравнивает скомпилированный `WebhookRuleEngine` с последовательным перебором правил через fnmatch.
+Перед замером проверяется, что оба способа находят одинаковые правила.
+"""
+import argparse
+import fnmatch
+import random
+import sys
+import time
+
+from src.webhooks.rules import WebhookRule, WebhookRuleEngine
+
+EVENT_KINDS = ["push", "tag_push", "merge_request", "pipeline", "build", "note", "issue", "member"]
+
+
+def generate_rules(count: int, rnd: random.Random) -> list[WebhookRule]:
+    """Сгенерировать правила на пространстве имен вида group-N/subgroup-M/project-K"""
+    rules = []
+    for number in range(count):
+        group = f"group-{rnd.randrange(200)}"
+        subgroup = f"subgroup-{rnd.randrange(20)}"
+        project = f"project-{rnd.randrange(50)}"
+        pattern = rnd.choice([
+            f"{group}/{subgroup}/{project}",
+            f"{group}/{subgroup}/*",
+            f"{group}/**",
+            f"{group}/*/project-{rnd.randrange(5)}*",
+        ])
+        rules.append(WebhookRule(rnd.choice(EVENT_KINDS), pattern, f"action-{number}"))
+    return rules
+
+
+def generate_events(count: int, rnd: random.Random) -> list[tuple[str, str]]:
+    """Сгенерировать события (вид события, path_with_namespace)"""
+    return [
+        (
+            rnd.choice(EVENT_KINDS),
+            f"group-{rnd.randrange(200)}/subgroup-{rnd.randrange(20)}/project-{rnd.randrange(50)}",
+        )
+        for _ in range(count)
+    ]
+
+
+def match_segments(pattern: list[str], segments: list[str]) -> bool:
+    """Сопоставить шаблон проекта с путем по сегментам: `*` - один сегмент, `**` - любое количество сегментов
+
+    fnmatch для всего пути не подходит: его `*` совпадает и с `/`.
+    """
+    if not pattern:
+        return not segments
+    if pattern[0] == "**":
+        return any(match_segments(pattern[1:], segments[index:]) for index in range(len(segments) + 1))
+    return bool(segments) and fnmatch.fnmatchcase(segments[0], pattern[0]) and match_segments(pattern[1:], segments[1:])
+
+
+def linear_match(rules: list[WebhookRule], event_kind: str, project_path: str) -> list[WebhookRule]:
+    """Наивное сопоставление: перебор всех правил"""
+    segments = project_path.split("/") if project_path else []
+    return [
+        rule for rule in rules
+        if rule.event in (event_kind, "*")
+        and match_segments(rule.project.strip("/").split("/") if rule.project.strip("/") else [], segments)
+    ]
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10_000, help="количество правил")
+    parser.add_argument("--events", type=int, default=20_000, help="количество событий")
+    parser.add_argument("--linear-events", type=int, default=500, help="количество событий для перебора")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    rules = generate_rules(args.rules, rnd)
+    events = generate_events(args.events, rnd)
+
+    start = time.perf_counter()
+    engine = WebhookRuleEngine(rules)
+    compile_s = time.perf_counter() - start
+
+    matched = 0
+    start = time.perf_counter()
+    for event_kind, project_path in events:
+        matched += len(engine.match(event_kind, project_path))
+    indexed_us = (time.perf_counter() - start) / len(events) * 1_000_000
+
+    linear_events = events[:args.linear_events]
+    for event_kind, project_path in linear_events:
+        if engine.match(event_kind, project_path) != linear_match(rules, event_kind, project_path):
+            sys.exit(f"Результаты сопоставления различаются: {event_kind} {project_path}")
+
+    start = time.perf_counter()
+    for event_kind, project_path in linear_events:
+        linear_match(rules, event_kind, project_path)
+    linear_us = (time.perf_counter() - start) / len(linear_events) * 1_000_000
+
+    sys.stdout.write(
+        f"rules: {len(engine)}\n"
+        f"compile: {compile_s * 1_000:.1f} ms\n"
+        f"indexed match: {indexed_us:.1f} us/event (avg {matched / len(events):.2f} matched rules)\n"
+        f"linear match: {linear_us:.1f} us/event\n"
+        f"speedup: x{linear_us / indexed_us:.0f}\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
+
+from src import config
+
+STATIC_URL_PREFIX = "/static/"
+# Для адресов с хэшем содержимого: файл по такому адресу никогда не меняется
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Ресурсы, блокирующие первую отрисовку страниц (подключаются в base.html.j2): (путь, значение as для preload)
+CRITICAL_ASSETS = (
+    ("css/bootstrap.min.css", "style"),
+    ("css/bootstrap-icons.min.css", "style"),
+    ("css/color-modes.css", "style"),
+)
+# Сжатые копии (см. `src.app.static.precompress`) отдаются вместо оригинала и в манифест не попадают
+_PRECOMPRESSED_SUFFIXES = frozenset({".gz", ".br"})
+
+
+class Asset(NamedTuple):
+    """Файл статики из манифеста
+
+    path: путь файла относительно директории статики
+    digest: хэш содержимого файла
+    """
+    path: str
+    digest: str
+
+
+def get_fingerprinted_path(path: str, digest: str) -> str:
+    """Путь файла с хэшем содержимого в имени: `css/style.css` -> `css/style.<digest>.css`"""
+    pure_path = PurePosixPath(path)
+    return str(pure_path.with_name(f"{pure_path.stem}.{digest}{pure_path.suffix}"))
+
+
+class AssetManifest:
+    """Манифест статики: соответствие файлов и адресов с хэшем содержимого
+
+    Шаблоны получают адрес файла через `static_url("css/style.css")` -> `/static/css/style.<digest>.css`.
+    При изменении файла меняется и адрес, поэтому такие ответы можно кэшировать навсегда
+    (`Cache-Control: immutable`), а браузеры и CDN не перепроверяют неизмененные файлы.
+    """
+    def __init__(self, assets: dict[str, str]) -> None:
+        """Конструктор
+
+        Args:
+            assets: хэши содержимого файлов по их путям относительно директории статики
+        """
+        self._urls = {path: STATIC_URL_PREFIX + get_fingerprinted_path(path, digest) for path, digest in assets.items()}
+        self._assets = {get_fingerprinted_path(path, digest): Asset(path, digest) for path, digest in assets.items()}
+
+    def __len__(self) -> int:
+        """Количество файлов в манифесте"""
+        return len(self._assets)
+
+    @classmethod
+    def from_directory(cls, directory: Path, digest_size: int = 8) -> "AssetManifest":
+        """Собрать манифест по файлам директории статики
+
+        Args:
+            directory: директория статики
+            digest_size: размер хэша в байтах
+
+        Returns:
+            Манифест статики
+        """
+        assets = {}
+        for file_path in sorted(directory.rglob("*")):
+            if not file_path.is_file() or file_path.suffix in _PRECOMPRESSED_SUFFIXES:
+                continue
+            digest = hashlib.blake2b(file_path.read_bytes(), digest_size=digest_size).hexdigest()
+            assets[file_path.relative_to(directory).as_posix()] = digest
+        return cls(assets)
+
+    def url(self, path: str) -> str:
+        """Адрес файла статики с хэшем содержимого
+
+        Args:
+            path: путь файла относительно директории статики, например `css/style.css`
+
+        Returns:
+            Адрес с хэшем содержимого или обычный адрес, если файла нет в манифесте
+        """
+        path = path.lstrip("/")
+        return self._urls.get(path, STATIC_URL_PREFIX + path)
+
+    def preload_links(self, assets: Iterable[tuple[str, str]] = CRITICAL_ASSETS) -> list[str]:
+        """Значения заголовка Link для предзагрузки ресурсов
+
+        Args:
+            assets: ресурсы: путь относительно директории статики и значение `as`
+
+        Returns:
+            Значения вида `</static/css/style.<digest>.css>; rel=preload; as=style`
+        """
+        return [f"<{self.url(path)}>; rel=preload; as={destination}" for path, destination in assets]
+
+    def resolve(self, fingerprinted_path: str) -> Asset | None:
+        """Найти файл по пути с хэшем содержимого
+
+        Args:
+            fingerprinted_path: путь с хэшем содержимого относительно директории статики
+
+        Returns:
+            Файл из манифеста или None, если путь не содержит актуальный хэш
+        """
+        return self._assets.get(fingerprinted_path)
+
+
+asset_manifest = AssetManifest.from_directory(config.STATIC_FOLDER_PATH)
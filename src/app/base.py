@@ -1,17 +1,37 @@
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
 from pathlib import Path
 
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware import Middleware
-from fastapi.staticfiles import StaticFiles
 
+from src import config
+
+from .assets import AssetManifest
 from .exception_handlers import exception_handlers
-from .middleware import AccessLogMiddleware
+from .log import AccessLogSampler
+from .metrics import AppMetrics
+from .middleware import (
+    AccessLogMiddleware,
+    CompressionMiddleware,
+    EarlyHintsMiddleware,
+    MetricsMiddleware,
+    ServerTimingMiddleware,
+)
+from .static import PrecompressedStaticFiles
 
 
 class GitLabWH:
     """Приложение GitLab-WH"""
 
-    def __init__(self, app_type: type[FastAPI], main_router: APIRouter, static_folder_path: Path) -> None:
+    def __init__(self,
+                 app_type: type[FastAPI],
+                 main_router: APIRouter,
+                 static_folder_path: Path,
+                 lifespan: Callable[[FastAPI], AbstractAsyncContextManager[None]] | None = None,
+                 asset_manifest: AssetManifest | None = None,
+                 metrics: AppMetrics | None = None,
+                 ) -> None:
         """Конструктор приложения"""
         self._app = app_type(
             title="GitLab-WH",
@@ -21,6 +41,10 @@ class GitLabWH:
                     "name": "api.service",
                     "description": "Сервисные методы приложения",
                 },
+                {
+                    "name": "api.webhooks",
+                    "description": "Прием вебхуков GitLab",
+                },
                 {
                     "name": "pages.index",
                     "description": "Главная страница",
@@ -29,6 +53,10 @@ class GitLabWH:
                     "name": "pages.users",
                     "description": "Страницы для работы с учетной записью пользователя",
                 },
+                {
+                    "name": "pages.browser",
+                    "description": "Списки репозиториев, групп, пользователей и токенов GitLab",
+                },
             ],
             swagger_ui_parameters={
                 "displayRequestDuration": True,
@@ -36,10 +64,21 @@ class GitLabWH:
                 "requestSnippetsEnabled": True,
             },
             exception_handlers=exception_handlers,
-            middleware=[Middleware(AccessLogMiddleware)],
+            middleware=[
+                Middleware(AccessLogMiddleware, sampler=AccessLogSampler(config.ACCESS_LOG_RULES)),
+                *([Middleware(MetricsMiddleware, metrics=metrics)] if metrics else []),
+                *(
+                    [Middleware(ServerTimingMiddleware, debug=config.SERVER_TIMING_DEBUG)]
+                    if config.SERVER_TIMING else []
+                ),
+                Middleware(CompressionMiddleware),
+                Middleware(EarlyHintsMiddleware, links=asset_manifest.preload_links() if asset_manifest else ()),
+            ],
+            lifespan=lifespan,
         )
         self._app.include_router(main_router)
-        self._app.mount("/static", StaticFiles(directory=static_folder_path), name="static")
+        static_files = PrecompressedStaticFiles(directory=static_folder_path, manifest=asset_manifest)
+        self._app.mount("/static", static_files, name="static")
 
     @property
     def app(self) -> FastAPI:
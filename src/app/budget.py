@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from src.repository.http_requests.base import HTTPCall
+
+INTERACTIVE_JOB = "request"
+
+_job: ContextVar[str] = ContextVar("gitlab_job", default=INTERACTIVE_JOB)
+
+
+def token_fingerprint(token: str) -> str:
+    """Отпечаток токена для учета запросов: по нему нельзя восстановить токен"""
+    return hashlib.sha256(token.encode()).hexdigest()[:12] if token else ""
+
+
+def get_job() -> str:
+    """Метка задачи, от имени которой выполняются запросы в текущем контексте"""
+    return _job.get()
+
+
+@contextmanager
+def gitlab_job(name: str) -> Iterator[None]:
+    """Выполнять запросы в GitLab от имени задачи `name` (запросы без метки - интерактивные, `request`)
+
+    Args:
+        name: метка задачи, например `dashboard`
+    """
+    token = _job.set(name)
+    try:
+        yield
+    finally:
+        _job.reset(token)
+
+
+class SlidingWindow:
+    """Количество запросов и байт за последние `seconds` секунд
+
+    Окно разбито на `buckets` интервалов: значения старше окна отбрасываются целым интервалом,
+    поэтому запись и подсчет не зависят от числа запросов.
+    """
+    def __init__(self, seconds: float, buckets: int = 60) -> None:
+        """Конструктор
+
+        Args:
+            seconds: длина окна в секундах
+            buckets: количество интервалов в окне
+        """
+        self.seconds = seconds
+        self._width = seconds / buckets
+        self._slots = [-1] * buckets
+        self._counts = [0] * buckets
+        self._sizes = [0] * buckets
+
+    def add(self, now: float, size: int = 0) -> None:
+        """Записать запрос
+
+        Args:
+            now: время запроса (`time.monotonic`)
+            size: размер ответа в байтах
+        """
+        slot = int(now // self._width)
+        index = slot % len(self._slots)
+        if self._slots[index] != slot:
+            self._slots[index] = slot
+            self._counts[index] = 0
+            self._sizes[index] = 0
+        self._counts[index] += 1
+        self._sizes[index] += size
+
+    def _live(self, now: float) -> list[tuple[int, int, int]]:
+        """Интервалы внутри окна: (номер интервала, запросы, байты) по возрастанию времени"""
+        current = int(now // self._width)
+        return sorted(
+            (slot, count, size)
+            for slot, count, size in zip(self._slots, self._counts, self._sizes, strict=True)
+            if 0 <= current - slot < len(self._slots)
+        )
+
+    def totals(self, now: float) -> tuple[int, int]:
+        """Количество запросов и байт за окно"""
+        live = self._live(now)
+        return sum(count for _, count, _ in live), sum(size for _, _, size in live)
+
+    def retry_after(self, now: float, limit: int) -> float:
+        """Через сколько секунд количество запросов в окне станет меньше `limit`"""
+        live = self._live(now)
+        count = sum(count for _, count, _ in live)
+        if count < limit:
+            return 0.0
+        for slot, slot_count, _ in live:
+            count -= slot_count
+            if count < limit:
+                return max(0.0, (slot + len(self._slots)) * self._width - now)
+        return self.seconds
+
+
+class RateLimitHeadroom(NamedTuple):
+    """Остаток лимита запросов токена по последнему ответу GitLab
+
+    limit: лимит запросов (`RateLimit-Limit`)
+    remaining: остаток лимита (`RateLimit-Remaining`)
+    expires_at: до какого времени (`time.monotonic`) остаток актуален: восстановление лимита (`RateLimit-Reset`),
+        но не дольше первого окна учета
+    """
+    limit: int
+    remaining: int
+    expires_at: float
+
+
+class GitLabBudget:
+    """Учет запросов в GitLab по учетным данным (отпечаток токена) и задачам (`gitlab_job`)
+
+    Для каждой пары (токен, задача) считаются запросы и байты в скользящих окнах, для каждого токена
+    запоминается остаток лимита GitLab (заголовки `RateLimit-*`). Фоновые задачи перед работой
+    спрашивают `retry_after`: задача превысила свой лимит запросов в минуту или у токена осталось меньше
+    `rate_limit_reserve` лимита GitLab (остаток оставляется интерактивным запросам). Остаток лимита учитывается
+    только до восстановления лимита: задача, которая ждет, сама запросов не делает и остаток не обновит.
+    """
+    def __init__(self,
+                 limits: Mapping[str, int] | None = None,
+                 windows: tuple[float, ...] = (60, 3600),
+                 rate_limit_reserve: float = 0.1,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            limits: лимиты запросов в минуту по меткам задач
+            windows: длины скользящих окон в секундах (первое окно - для `limits`, должно быть 60)
+            rate_limit_reserve: доля лимита GitLab, которая оставляется интерактивным запросам
+        """
+        self._limits = dict(limits or {})
+        self._windows = windows
+        self._rate_limit_reserve = rate_limit_reserve
+        self._usage: dict[tuple[str, str], list[SlidingWindow]] = {}
+        self._rate_limits: dict[str, RateLimitHeadroom] = {}
+
+    def observe_http_call(self, call: HTTPCall) -> None:
+        """Записать запрос BaseHTTP (наблюдатель `BaseHTTP.observers`)"""
+        key = (call.identity, get_job())
+        windows = self._usage.get(key)
+        if windows is None:
+            windows = self._usage[key] = [SlidingWindow(seconds) for seconds in self._windows]
+        now = time.monotonic()
+        for window in windows:
+            window.add(now, call.size)
+        if call.rate_limit is not None and call.rate_limit_remaining is not None:
+            expires_in = self._windows[0]
+            if call.rate_limit_reset is not None:
+                expires_in = max(0.0, min(expires_in, call.rate_limit_reset - time.time()))
+            self._rate_limits[call.identity] = RateLimitHeadroom(
+                call.rate_limit, call.rate_limit_remaining, now + expires_in,
+            )
+
+    def get_rate_limit(self, identity: str) -> RateLimitHeadroom | None:
+        """Актуальный остаток лимита запросов токена или None, если он неизвестен или устарел"""
+        headroom = self._rate_limits.get(identity)
+        if headroom is None or headroom.expires_at <= time.monotonic():
+            return None
+        return headroom
+
+    def retry_after(self, job: str, identity: str = "") -> float:
+        """Через сколько секунд задача может продолжить работу
+
+        Args:
+            job: метка задачи
+            identity: отпечаток токена, от имени которого задача выполняет запросы
+
+        Returns:
+            0 - задача в пределах бюджета, иначе - рекомендуемая задержка в секундах
+        """
+        headroom = self.get_rate_limit(identity) if job != INTERACTIVE_JOB else None
+        if headroom is not None and headroom.remaining < headroom.limit * self._rate_limit_reserve:
+            return headroom.expires_at - time.monotonic()
+
+        limit_per_minute = self._limits.get(job)
+        windows = self._usage.get((identity, job))
+        if limit_per_minute is None or windows is None:
+            return 0.0
+        return windows[0].retry_after(time.monotonic(), limit_per_minute)
+
+    def usage(self) -> list[dict[str, Any]]:
+        """Использование GitLab API по токенам и задачам"""
+        now = time.monotonic()
+        result = []
+        for (identity, job), windows in sorted(self._usage.items()):
+            rate_limit = self.get_rate_limit(identity)
+            item: dict[str, Any] = {
+                "identity": identity,
+                "job": job,
+                "limit_per_minute": self._limits.get(job),
+                "rate_limit": rate_limit and {
+                    "limit": rate_limit.limit,
+                    "remaining": rate_limit.remaining,
+                    "expires_in": rate_limit.expires_at - now,
+                },
+                "retry_after": self.retry_after(job, identity),
+            }
+            for window in windows:
+                requests, size = window.totals(now)
+                item[f"{int(window.seconds)}s"] = {"requests": requests, "bytes": size}
+            result.append(item)
+        return result
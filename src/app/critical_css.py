@@ -0,0 +1,181 @@
+"""Извлечение критического CSS для базовых шаблонов (шаг сборки)
+
+Запуск: `python -m src.app.critical_css`
+
+Из CSS, подключаемого в `base.html.j2`, оставляются только правила, селекторы которых используют теги,
+классы, id и атрибуты из базовых шаблонов. Результат сохраняется в `config.CRITICAL_CSS_PATH` и при
+`config.TEMPLATES_INLINE_CRITICAL_CSS` встраивается в `<head>`, а полные стили загружаются без блокировки
+первой отрисовки.
+"""
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from src import config
+
+logger = logging.getLogger("gitlab-wh.critical-css")
+
+# Шаблоны, из которых состоит первый экран любой страницы
+CRITICAL_TEMPLATES = (
+    "base.html.j2",
+    "base_authorized.html.j2",
+    "elements/color_modes.html.j2",
+    "elements/logo.html.j2",
+)
+CRITICAL_STYLESHEETS = ("css/bootstrap.min.css", "css/color-modes.css")
+# Атрибуты, которые выставляются скриптами до первой отрисовки (color-modes.js)
+DYNAMIC_ATTRIBUTES = frozenset({"data-bs-theme"})
+# Группирующие at-правила, внутри которых правила отбираются так же, как на верхнем уровне
+_GROUPING_AT_RULES = ("@media", "@supports")
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_JINJA_RE = re.compile(r"{{.*?}}|{%.*?%}", re.DOTALL)
+_PSEUDO_RE = re.compile(r"::?[\w-]+(\([^)]*\))?")
+_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+_ID_RE = re.compile(r"#(-?[_a-zA-Z][\w-]*)")
+_ATTRIBUTE_RE = re.compile(r"\[\s*([\w-]+)")
+_TAG_RE = re.compile(r"(?:^|[\s>+~(])([a-zA-Z][\w-]*)")
+
+
+class UsedSelectors(NamedTuple):
+    """Теги, классы, id и атрибуты, которые встречаются в HTML"""
+    tags: frozenset[str]
+    classes: frozenset[str]
+    ids: frozenset[str]
+    attributes: frozenset[str]
+
+
+def collect_used_selectors(html: str, extra_attributes: Iterable[str] = DYNAMIC_ATTRIBUTES) -> UsedSelectors:
+    """Собрать теги, классы, id и атрибуты из HTML (выражения Jinja2 пропускаются)
+
+    Args:
+        html: HTML или исходник шаблона Jinja2
+        extra_attributes: атрибуты, которые появляются в HTML динамически
+
+    Returns:
+        Используемые селекторы
+    """
+    html = _JINJA_RE.sub(" ", html)
+    classes = {name for value in re.findall(r'class="([^"]*)"', html) for name in value.split()}
+    return UsedSelectors(
+        tags=frozenset({"html", "body", *(tag.lower() for tag in re.findall(r"<([a-zA-Z][\w-]*)", html))}),
+        classes=frozenset(classes),
+        ids=frozenset(re.findall(r'id="([^"]+)"', html)),
+        attributes=frozenset({*re.findall(r"\s([a-zA-Z][\w-]*)=", html), *extra_attributes}),
+    )
+
+
+def is_selector_used(selector: str, used: UsedSelectors) -> bool:
+    """Применим ли селектор к HTML с такими тегами, классами, id и атрибутами
+
+    Псевдоклассы и псевдоэлементы не учитываются: `a:hover` считается используемым, если есть `<a>`.
+    """
+    selector = _PSEUDO_RE.sub("", selector)
+    return (
+        set(_CLASS_RE.findall(selector)) <= used.classes
+        and set(_ID_RE.findall(selector)) <= used.ids
+        and set(_ATTRIBUTE_RE.findall(selector)) <= used.attributes
+        and {tag.lower() for tag in _TAG_RE.findall(re.sub(r"\[[^\]]*\]", "", selector))} <= used.tags
+    )
+
+
+def _split_top_level(text: str, separator: str = ",") -> list[str]:
+    """Разделить текст по разделителю вне скобок"""
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _iter_rules(css: str) -> Iterator[tuple[str, str]]:
+    """Правила CSS верхнего уровня: (прелюдия, тело без фигурных скобок)"""
+    position = 0
+    while (open_index := css.find("{", position)) != -1:
+        prelude = css[position:open_index].strip()
+        depth = 1
+        index = open_index + 1
+        while depth and index < len(css):
+            if css[index] == "{":
+                depth += 1
+            elif css[index] == "}":
+                depth -= 1
+            index += 1
+        # Прелюдия может начинаться с at-правил без тела (@charset "UTF-8";)
+        yield prelude.rsplit(";", 1)[-1].strip(), css[open_index + 1:index - 1]
+        position = index
+
+
+def extract_critical_css(css: str, used: UsedSelectors) -> str:
+    """Оставить в CSS только правила, применимые к HTML с используемыми селекторами
+
+    Args:
+        css: исходный CSS
+        used: используемые селекторы
+
+    Returns:
+        Критический CSS
+    """
+    result = []
+    for prelude, body in _iter_rules(_COMMENT_RE.sub("", css)):
+        if prelude.startswith(_GROUPING_AT_RULES):
+            inner = extract_critical_css(body, used)
+            if inner:
+                result.append(f"{prelude}{{{inner}}}")
+        elif not prelude.startswith("@"):
+            selectors = [selector.strip() for selector in _split_top_level(prelude)]
+            used_selectors = [selector for selector in selectors if is_selector_used(selector, used)]
+            if used_selectors:
+                result.append(f"{','.join(used_selectors)}{{{body.strip()}}}")
+    return "".join(result)
+
+
+def build_critical_css(static_folder_path: Path = config.STATIC_FOLDER_PATH,
+                       templates_folder_path: Path = config.HTML_TEMPLATES_FOLDER_PATH,
+                       ) -> str:
+    """Собрать критический CSS базовых шаблонов
+
+    Args:
+        static_folder_path: директория статики
+        templates_folder_path: директория шаблонов
+
+    Returns:
+        Критический CSS
+    """
+    html = "".join(Path(templates_folder_path, name).read_text(encoding="utf-8") for name in CRITICAL_TEMPLATES)
+    used = collect_used_selectors(html)
+    return "".join(
+        extract_critical_css(Path(static_folder_path, name).read_text(encoding="utf-8"), used)
+        for name in CRITICAL_STYLESHEETS
+    )
+
+
+def load_critical_css(path: Path = config.CRITICAL_CSS_PATH) -> str | None:
+    """Загрузить заранее собранный критический CSS
+
+    Args:
+        path: путь до файла критического CSS
+
+    Returns:
+        Критический CSS или None, если файл не собран
+    """
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.warning("Критический CSS не собран (%s), стили загружаются без встраивания", path)
+        return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    critical_css = build_critical_css()
+    config.CRITICAL_CSS_PATH.write_text(critical_css, encoding="utf-8")
+    logger.info("%s: %s байт", config.CRITICAL_CSS_PATH, len(critical_css.encode()))
@@ -1,7 +1,8 @@
-
 import logging
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable, Mapping
+from http import HTTPStatus
 from traceback import format_exc
+from types import MappingProxyType
 from typing import Any, NotRequired, TypedDict
 
 from fastapi.exception_handlers import (
@@ -11,7 +12,7 @@ from fastapi.exception_handlers import (
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import PlainTextResponse, Response
+from starlette.responses import HTMLResponse, PlainTextResponse, Response
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY, HTTP_500_INTERNAL_SERVER_ERROR
 
 from src import config
@@ -38,7 +39,13 @@ class ErrorPageFields(ErrorPageDefaultFields):
     debug: NotRequired[DebugFields]
 
 
-error_messages: dict[int, ErrorPageDefaultFields] = {
+ERROR_PAGE_TEMPLATE = "pages/common/error.html.j2"
+# Статусы, страницы которых рендерятся заранее при старте приложения
+PRERENDERED_ERROR_STATUSES = (400, 401, 403, 404, 405, 422, 429, 500, 502, 503, 504)
+# Стандартные фразы статусов (нестандартные коды, например 499, в HTTPStatus отсутствуют)
+STATUS_PHRASES: Mapping[int, str] = MappingProxyType({status.value: status.phrase for status in HTTPStatus})
+
+error_messages: Mapping[int, ErrorPageDefaultFields] = MappingProxyType({
     HTTP_404_NOT_FOUND: {
         "error_title": "Страница не найдена",
         "error_message": "В адресе есть ошибка или страница удалена.",
@@ -51,7 +58,7 @@ error_messages: dict[int, ErrorPageDefaultFields] = {
         "error_title": "Ошибка сервера",
         "error_message": "Попробуйте обновить страницу позже.",
     },
-}
+})
 
 default_error_message: ErrorPageDefaultFields = {
     "error_title": "Что-то пошло не так",
@@ -59,30 +66,75 @@ default_error_message: ErrorPageDefaultFields = {
 }
 
 
+def get_error_page_context(status_code: int,
+                           error_title: str | None = None,
+                           error_message: str | None = None,
+                           ) -> ErrorPageFields:
+    """Собрать новый контекст страницы ошибки (общие сообщения по умолчанию не изменяются)"""
+    defaults = error_messages.get(status_code, default_error_message)
+    return {
+        "error_code": status_code,
+        "error_title": error_title or defaults["error_title"],
+        "error_message": error_message or defaults["error_message"],
+    }
+
+
+class ErrorPages:
+    """Заранее отрендеренные страницы ошибок
+
+    Во время массовых ошибок (например, GitLab недоступен) страница ошибки отдается готовыми байтами:
+    без создания генератора ответа, без рендеринга и без обращения к кэшу страниц.
+    """
+    def __init__(self) -> None:
+        """Конструктор"""
+        self._pages: Mapping[int, bytes] = MappingProxyType({})
+
+    def __len__(self) -> int:
+        """Количество готовых страниц"""
+        return len(self._pages)
+
+    def prerender(self, statuses: Iterable[int] = PRERENDERED_ERROR_STATUSES) -> None:
+        """Отрендерить страницы ошибок с сообщениями по умолчанию
+
+        Args:
+            statuses: статус коды страниц
+        """
+        pages = {
+            status_code: CommonTemplateResponseGenerator.render(
+                ERROR_PAGE_TEMPLATE, get_error_page_context(status_code),
+            ).encode()
+            for status_code in statuses
+        }
+        self._pages = MappingProxyType(pages)
+
+    def get(self, status_code: int) -> bytes | None:
+        """Готовая страница ошибки или None, если она не рендерилась заранее"""
+        return self._pages.get(status_code)
+
+
+error_pages = ErrorPages()
+
+
 async def get_html_error_page(request: Request,
                               status_code: int,
                               error_title: str | None = None,
                               error_message: str | None = None,
                               ) -> Response:
     """Сгенерировать HTML страницу ошибки"""
-    ctrg = CommonTemplateResponseGenerator(request, "pages/common")
-
-    # Работаем с одним context для уменьшения нагрузки в рантайме
-    context: ErrorPageFields = error_messages.get(status_code, default_error_message)   # type: ignore[assignment]
-    context["error_code"] = status_code
-
-    if error_title:
-        context["error_title"] = error_title
-
-    if error_message:
-        context["error_message"] = error_message
+    if not config.SHOW_TRACEBACK and not error_title and not error_message:
+        page = error_pages.get(status_code)
+        if page is not None:
+            return HTMLResponse(page, status_code=status_code, headers=CommonTemplateResponseGenerator.preload_headers)
 
+    context = get_error_page_context(status_code, error_title, error_message)
     if config.SHOW_TRACEBACK:
         context["debug"] = {"traceback": format_exc()}
 
-
-    return ctrg.generate_response("error.html.j2", context=context, status_code=status_code)
-
+    ctrg = CommonTemplateResponseGenerator(request)
+    # Кэшируются только страницы с сообщениями по умолчанию (их не больше, чем статус кодов):
+    # traceback уникален для каждой ошибки, а текст ошибки может содержать данные запроса
+    cache = not config.SHOW_TRACEBACK and not error_title and not error_message
+    return ctrg.generate_response(ERROR_PAGE_TEMPLATE, context=context, status_code=status_code, cache=cache)
 
 
 async def html_http_exception_handler(request: Request, exc: HTTPException) -> Response:
@@ -92,7 +144,10 @@ async def html_http_exception_handler(request: Request, exc: HTTPException) -> R
     if request.url.path.startswith("/api"):
         return await http_exception_handler(request, exc)
 
-    error_message = exc.detail if exc.status_code != HTTP_404_NOT_FOUND else None
+    # Без detail starlette подставляет стандартную фразу статуса: это не особое сообщение, подойдет готовая страница
+    error_message: str | None = exc.detail
+    if exc.status_code == HTTP_404_NOT_FOUND or error_message == STATUS_PHRASES.get(exc.status_code):
+        error_message = None
 
     return await get_html_error_page(request=request, status_code=exc.status_code, error_message=error_message)
 
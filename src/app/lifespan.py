@@ -0,0 +1,38 @@
+import logging
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from src import config
+from src.dependencies.dashboard import dashboard_collector
+from src.dependencies.gitlab import gitlab_connection
+from src.dependencies.service import loop_monitor
+from src.dependencies.webhooks import webhook_processor
+
+from .exception_handlers import error_pages
+from .templates import CommonTemplateResponseGenerator
+
+logger = logging.getLogger("gitlab-wh.lifespan")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    """Запуск и остановка фоновых компонентов приложения"""
+    if config.TEMPLATES_PRECOMPILE:
+        start_time = time.perf_counter()
+        templates_count = CommonTemplateResponseGenerator.precompile()
+        duration_ms = (time.perf_counter() - start_time) * 1_000
+        logger.info("Скомпилировано шаблонов: %s (%.1f мс)", templates_count, duration_ms)
+
+    error_pages.prerender()
+    loop_monitor.start()
+    gitlab_connection.start()
+    dashboard_collector.start()
+    webhook_processor.start()
+    yield
+    await webhook_processor.close()
+    await dashboard_collector.close()
+    await gitlab_connection.close()
+    await loop_monitor.close()
@@ -0,0 +1,152 @@
+import copy
+import json
+import logging
+import queue
+import random
+import time
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, NamedTuple, TextIO
+
+import colorlog
+
+COLOR_FORMAT = "%(asctime)s - %(purple)s%(name)s%(reset)s - %(log_color)s%(levelname)s%(reset)s - %(message)s"
+# Атрибуты LogRecord, которые не попадают в JSON как дополнительные поля (extra)
+_RESERVED_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Форматирование записей в JSON (одна запись - одна строка)
+
+    Поля: time, level, logger, message и дополнительные поля из `extra`.
+    """
+    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
+        """Отформатировать запись"""
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        data.update((key, value) for key, value in vars(record).items() if key not in _RESERVED_ATTRIBUTES)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """QueueHandler для очереди внутри процесса
+
+    Стандартный `prepare` форматирует запись и удаляет `exc_info` (записи могут передаваться в другой процесс),
+    из-за чего traceback попадает в текст сообщения. Здесь в сообщение подставляются только аргументы,
+    а `exc_info` остается: traceback оформляет handler (например, отдельное поле в JSON).
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Подготовить запись к записи в очередь"""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+def setup_logging(*,
+                  json_format: bool = False,
+                  level: int = logging.INFO,
+                  stream: TextIO | None = None,
+                  ) -> QueueListener:
+    """Настроить логирование через очередь
+
+    Обработчики root логгера только кладут запись в очередь, а вывод в stdout выполняется в отдельном
+    потоке `QueueListener`, поэтому запись логов не блокирует event loop.
+
+    Args:
+        json_format: выводить записи в JSON вместо цветного текста
+        level: уровень root логгера
+        stream: поток вывода, None - stderr
+
+    Returns:
+        Запущенный QueueListener (остановить при завершении процесса, чтобы вывести оставшиеся записи)
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter() if json_format else colorlog.ColoredFormatter(fmt=COLOR_FORMAT))
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    # Аргументы подставляются в сообщение до записи в очередь, оформление - на стороне handler
+    queue_handler = _InProcessQueueHandler(log_queue)
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+    listener.start()
+    return listener
+
+
+class AccessLogRule(NamedTuple):
+    """Правило записи access log для префикса пути
+
+    sample_rate: доля записываемых запросов (от 0 до 1)
+    rate_limit: максимум записей в секунду, 0 - без ограничения
+    """
+    sample_rate: float = 1.0
+    rate_limit: float = 0.0
+
+
+class _TokenBucket:
+    """Ограничение частоты: не больше `rate` событий в секунду (с запасом на одну секунду)"""
+    def __init__(self, rate: float) -> None:
+        self._rate = rate
+        self._capacity = max(rate, 1.0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+
+    def acquire(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class AccessLogSampler:
+    """Выборка записей access log по префиксам пути
+
+    Для частых и малоинтересных запросов (статика, проверки доступности) пишется только часть записей
+    или не больше заданного числа записей в секунду. Выбирается правило с самым длинным подходящим префиксом.
+    Ответы с ошибкой сервера (5xx) записываются всегда.
+    """
+    def __init__(self, rules: Mapping[str, tuple[float, float]], default: AccessLogRule | None = None) -> None:
+        """Конструктор
+
+        Args:
+            rules: правила по префиксам пути: (доля записываемых запросов, максимум записей в секунду)
+            default: правило для остальных путей, None - записывать все запросы
+        """
+        self._rules = sorted(((prefix, AccessLogRule(*rule)) for prefix, rule in rules.items()),
+                             key=lambda item: len(item[0]),
+                             reverse=True)
+        self._default = default or AccessLogRule()
+        self._buckets = {
+            prefix: _TokenBucket(rule.rate_limit)
+            for prefix, rule in [*self._rules, ("", self._default)] if rule.rate_limit > 0
+        }
+
+    def should_log(self, path: str, status_code: int) -> bool:
+        """Нужно ли записать запрос в access log
+
+        Args:
+            path: путь запроса
+            status_code: статус код ответа
+
+        Returns:
+            True - запрос нужно записать
+        """
+        if status_code >= 500:  # noqa: PLR2004
+            return True
+        prefix, rule = next(((prefix, rule) for prefix, rule in self._rules if path.startswith(prefix)),
+                            ("", self._default))
+        # Выборка для логов, не для криптографии
+        if rule.sample_rate < 1 and random.random() >= rule.sample_rate:  # noqa: S311
+            return False
+        bucket = self._buckets.get(prefix)
+        return bucket is None or bucket.acquire()
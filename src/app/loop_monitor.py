@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .metrics import AppMetrics
+
+logger = logging.getLogger("gitlab-wh.loop-monitor")
+
+
+class LoopMonitor:
+    """Мониторинг отзывчивости event loop
+
+    Задача в event loop каждые `interval` секунд засыпает и измеряет, насколько позже положенного
+    она проснулась (lag - время, которое loop был занят другими callback'ами). Отдельный поток-сторож
+    проверяет, что задача просыпается вовремя: если loop занят дольше `slow_threshold`, сторож
+    снимает стек потока event loop (виновник еще выполняется) и пишет его в лог.
+    """
+    def __init__(self,
+                 metrics: AppMetrics | None = None,
+                 *,
+                 interval: float = 0.1,
+                 slow_threshold: float = 0.1,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            metrics: метрики приложения, None - без метрик
+            interval: период измерения lag в секундах
+            slow_threshold: длительность блокировки event loop в секундах, после которой она логируется
+        """
+        self._metrics = metrics
+        self._interval = interval
+        self._slow_threshold = slow_threshold
+        self._last_beat = time.monotonic()
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.slow_callbacks = 0
+        self.last_slow_callback: dict[str, Any] | None = None
+
+    def stats(self) -> dict[str, Any]:
+        """Текущие показатели: последний и максимальный lag, количество и последняя долгая блокировка"""
+        return {
+            "lag_last": self.lag_last,
+            "lag_max": self.lag_max,
+            "slow_callbacks": self.slow_callbacks,
+            "slow_threshold": self._slow_threshold,
+            "last_slow_callback": self.last_slow_callback,
+        }
+
+    def start(self) -> None:
+        """Запустить мониторинг. Должен вызываться из потока работающего event loop"""
+        if self._task is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure_lag())
+        self._thread = threading.Thread(
+            target=self._watch, args=(threading.get_ident(),), name="loop-monitor", daemon=True,
+        )
+        self._thread.start()
+
+    async def close(self) -> None:
+        """Остановить мониторинг"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def _measure_lag(self) -> None:
+        """Измерение lag event loop"""
+        while True:
+            start_time = time.monotonic()
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            lag = max(0.0, now - start_time - self._interval)
+            self._last_beat = now
+            self.lag_last = lag
+            self.lag_max = max(self.lag_max, lag)
+            if self._metrics is not None:
+                self._metrics.event_loop_lag.observe(lag)
+
+    def _watch(self, thread_id: int) -> None:
+        """Поток-сторож: обнаружение долгих блокировок event loop (по одной записи на блокировку)"""
+        reported_beat = None
+        while not self._stop.wait(self._slow_threshold / 2):
+            last_beat = self._last_beat
+            blocked = time.monotonic() - last_beat - self._interval
+            if blocked > self._slow_threshold and reported_beat != last_beat:
+                reported_beat = last_beat
+                frame = sys._current_frames().get(thread_id)  # noqa: SLF001
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+                del frame
+                self._report_slow_callback(blocked, stack)
+
+    def _report_slow_callback(self, blocked: float, stack: str) -> None:
+        """Записать долгую блокировку event loop"""
+        self.slow_callbacks += 1
+        self.last_slow_callback = {"blocked": blocked, "detected_at": time.time(), "stack": stack}
+        if self._metrics is not None:
+            self._metrics.event_loop_slow_callbacks.inc()
+        logger.warning("Event loop заблокирован дольше %.0f мс:\n%s", blocked * 1_000, stack)
@@ -0,0 +1,186 @@
+"""Учет памяти отдельных операций (постраничные запросы в GitLab, рендеринг шаблонов) через tracemalloc
+
+Включается явно (`start_memory_tracing`): tracemalloc замедляет каждую аллокацию, поэтому по умолчанию выключен.
+tracemalloc считает пик памяти всего процесса, поэтому пик операции - это рост пика относительно памяти
+в ее начале, и он включает аллокации операций, которые выполнялись одновременно с ней.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger("gitlab-wh.memory")
+
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+class MemoryTracingDisabledError(Exception):
+    """Учет памяти не включен"""
+
+
+class MemoryRecord(NamedTuple):
+    """Пик памяти операции
+
+    kind: вид операции (pagination, render)
+    description: подробности (адрес запроса, имя шаблона)
+    peak: рост пика памяти процесса за время операции в байтах
+    finished_at: время окончания операции (Unix time)
+    """
+    kind: str
+    description: str
+    peak: int
+    finished_at: float
+
+
+class _OpenSpan:
+    """Операция, которая еще выполняется: память в начале и наблюдаемый пик"""
+    __slots__ = ("start", "peak")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.peak = start
+
+
+class _MemoryTracing:
+    """Состояние учета памяти процесса (tracemalloc один на процесс, поэтому и состояние одно)"""
+    def __init__(self) -> None:
+        self.budget = 0
+        self.history = 20
+        self.open_spans: list[_OpenSpan] = []
+        self.recent: dict[str, deque[MemoryRecord]] = {}
+        self.largest: dict[str, MemoryRecord] = {}
+
+    def fold_peak(self) -> int:
+        """Передать пик процесса выполняющимся операциям и начать отсчет пика заново
+
+        Returns:
+            Текущая память процесса в байтах
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        for span in self.open_spans:
+            span.peak = max(span.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def record(self, record: MemoryRecord) -> None:
+        """Запомнить пик операции и предупредить о превышении бюджета"""
+        recent = self.recent.get(record.kind)
+        if recent is None:
+            recent = self.recent[record.kind] = deque(maxlen=self.history)
+        recent.append(record)
+        largest = self.largest.get(record.kind)
+        if largest is None or record.peak > largest.peak:
+            self.largest[record.kind] = record
+        if self.budget and record.peak > self.budget:
+            logger.warning(
+                "Операция %s %s превысила бюджет памяти: пик %.1f МБ при бюджете %.1f МБ",
+                record.kind, record.description, record.peak / 2**20, self.budget / 2**20,
+            )
+
+
+_tracing = _MemoryTracing()
+
+
+def start_memory_tracing(frames: int = 1, budget: int = 0, history: int = 20) -> None:
+    """Включить учет памяти
+
+    Args:
+        frames: глубина стека, сохраняемого для каждой аллокации (больше - точнее и медленнее)
+        budget: пик памяти одной операции в байтах, после которого пишется предупреждение, 0 - без предупреждений
+        history: количество последних операций каждого вида, которые хранятся для `memory_stats`
+    """
+    _tracing.budget = budget
+    _tracing.history = history
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_memory_tracing() -> None:
+    """Выключить учет памяти (собранные пики операций сохраняются)"""
+    tracemalloc.stop()
+    _tracing.open_spans.clear()
+
+
+def is_memory_tracing() -> bool:
+    """Включен ли учет памяти"""
+    return tracemalloc.is_tracing()
+
+
+@contextmanager
+def memory_span(kind: str, description: str = "") -> Iterator[None]:
+    """Записать пик памяти операции (ничего не делает, если учет памяти выключен)
+
+    Args:
+        kind: вид операции
+        description: подробности
+    """
+    if not tracemalloc.is_tracing():
+        yield
+        return
+
+    span = _OpenSpan(_tracing.fold_peak())
+    _tracing.open_spans.append(span)
+    try:
+        yield
+    finally:
+        if tracemalloc.is_tracing() and span in _tracing.open_spans:
+            _tracing.fold_peak()
+            _tracing.open_spans.remove(span)
+            _tracing.record(MemoryRecord(kind, description, span.peak - span.start, time.time()))
+
+
+def memory_stats() -> dict[str, Any]:
+    """Память процесса по данным tracemalloc, самые большие и последние пики операций по видам"""
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "enabled": tracemalloc.is_tracing(),
+        "traced_current": current,
+        "traced_peak": max([peak, *(span.peak for span in _tracing.open_spans)]),
+        "budget": _tracing.budget,
+        "operations": {
+            kind: {
+                "largest": _tracing.largest[kind]._asdict(),
+                "recent": [record._asdict() for record in recent],
+            }
+            for kind, recent in _tracing.recent.items()
+        },
+    }
+
+
+def top_allocations(limit: int = 20,
+                    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+                    ) -> list[dict[str, Any]]:
+    """Места, в которых выделено больше всего памяти, которая сейчас занята
+
+    Снимок делается синхронно и блокирует event loop на время обхода всех аллокаций.
+
+    Args:
+        limit: количество мест
+        key_type: группировка: строка кода, файл или стек (глубина задается `frames` в `start_memory_tracing`)
+
+    Returns:
+        Места по убыванию занятой памяти: размер, количество блоков и стек (от вызывающего к месту аллокации)
+
+    Raises:
+        MemoryTracingDisabledError: учет памяти не включен
+    """
+    if not tracemalloc.is_tracing():
+        raise MemoryTracingDisabledError
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(inclusive=False, filename_pattern=filename) for filename in _IGNORED_FILES],
+    )
+    return [
+        {
+            "size": statistic.size,
+            "count": statistic.count,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in reversed(statistic.traceback)],
+        }
+        for statistic in snapshot.statistics(key_type)[:limit]
+    ]
@@ -0,0 +1,232 @@
+"""Метрики приложения в текстовом формате Prometheus
+
+Запись значения - изменение списка или числа в словаре без блокировок: каждую метрику обновляет
+только один поток (event loop или поток-сторож `LoopMonitor`), а сериализация в текст выполняется
+только при запросе `/api/service/metrics`.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from src.repository.http_requests.base import HTTPCall
+
+# Формат Prometheus; "; charset=utf-8" добавляет Response для text/* сам
+CONTENT_TYPE = "text/plain; version=0.0.4"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    """Экранировать значение метки"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Метки в формате Prometheus: `{name="value",...}`"""
+    labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True))
+    return f"{{{labels}}}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Counter:
+    """Счетчик с метками"""
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Конструктор
+
+        Args:
+            name: имя метрики
+            description: описание метрики (HELP)
+            labelnames: имена меток
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), value: float = 1) -> None:
+        """Увеличить счетчик
+
+        Args:
+            labels: значения меток в порядке `labelnames`
+            value: на сколько увеличить
+        """
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def get(self, labels: tuple[str, ...] = ()) -> float:
+        """Текущее значение счетчика"""
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        """Строки значений в текстовом формате Prometheus"""
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    """Значения гистограммы для одного набора меток: количество по интервалам (не накопительное)"""
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Гистограмма с метками
+
+    Значение попадает в один интервал (`bisect`), накопительные значения `_bucket` считаются при сериализации.
+    """
+    type_name = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            name: имя метрики
+            description: описание метрики (HELP)
+            labelnames: имена меток
+            buckets: верхние границы интервалов по возрастанию (интервал +Inf добавляется автоматически)
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        """Записать значение
+
+        Args:
+            value: значение
+            labels: значения меток в порядке `labelnames`
+        """
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+        series.count += 1
+
+    def get_count(self, labels: tuple[str, ...] = ()) -> int:
+        """Количество записанных значений"""
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def samples(self) -> Iterator[str]:
+        """Строки значений в текстовом формате Prometheus"""
+        labelnames = (*self.labelnames, "le")
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*map(repr, self.buckets), "+Inf"), series.counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(labelnames, (*labels, bound))} {cumulative}"
+            formatted_labels = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{formatted_labels} {_format_value(series.total)}"
+            yield f"{self.name}_count{formatted_labels} {series.count}"
+
+
+class MetricsRegistry:
+    """Набор метрик для сериализации в текстовый формат Prometheus"""
+    def __init__(self) -> None:
+        """Конструктор"""
+        self._metrics: list[Counter | Histogram] = []
+
+    def counter(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Создать и зарегистрировать счетчик"""
+        metric = Counter(name, description, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self,
+                  name: str,
+                  description: str,
+                  labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS,
+                  ) -> Histogram:
+        """Создать и зарегистрировать гистограмму"""
+        metric = Histogram(name, description, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class AppMetrics:
+    """Метрики приложения: входящие запросы, исходящие запросы в GitLab (BaseHTTP) и отзывчивость event loop"""
+    def __init__(self) -> None:
+        """Конструктор"""
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.histogram(
+            "gitlab_wh_http_request_duration_seconds",
+            "Длительность обработки входящих запросов",
+            ("method", "route", "status"),
+        )
+        self.http_client_requests = self.registry.histogram(
+            "gitlab_wh_http_client_request_duration_seconds",
+            "Длительность исходящих запросов BaseHTTP",
+            ("method", "endpoint", "status"),
+        )
+        self.http_client_response_bytes = self.registry.counter(
+            "gitlab_wh_http_client_response_bytes_total",
+            "Размер тел ответов на исходящие запросы BaseHTTP",
+            ("method", "endpoint"),
+        )
+        self.http_client_pages = self.registry.counter(
+            "gitlab_wh_http_client_pages_total",
+            "Количество страниц, полученных постраничными запросами BaseHTTP",
+            ("endpoint",),
+        )
+        self.event_loop_lag = self.registry.histogram(
+            "gitlab_wh_event_loop_lag_seconds",
+            "Задержка пробуждения задачи в event loop относительно положенного времени",
+            buckets=LAG_BUCKETS,
+        )
+        self.event_loop_slow_callbacks = self.registry.counter(
+            "gitlab_wh_event_loop_slow_callbacks_total",
+            "Количество блокировок event loop дольше порога",
+        )
+
+    def observe_request(self, method: str, route: str, status_code: int, duration: float) -> None:
+        """Записать входящий запрос
+
+        Args:
+            method: HTTP метод
+            route: шаблон пути маршрута (например, `/groups/{group_id}/members`)
+            status_code: статус код ответа
+            duration: длительность обработки в секундах
+        """
+        self.requests.observe(duration, (method, route, f"{status_code // 100}xx"))
+
+    def observe_http_call(self, call: HTTPCall) -> None:
+        """Записать исходящий запрос BaseHTTP (наблюдатель `BaseHTTP.observers`)"""
+        endpoint = call.endpoint
+        self.http_client_requests.observe(call.duration, (call.method, endpoint, str(call.status_code)))
+        self.http_client_response_bytes.inc((call.method, endpoint), call.size)
+        if call.page is not None:
+            self.http_client_pages.inc((endpoint,))
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        return self.registry.render()
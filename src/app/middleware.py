@@ -1,12 +1,26 @@
+import hmac
 import http
 import logging
 import time
+import zlib
+from collections.abc import Iterable
+from typing import Any
 from urllib.parse import quote
 
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import BaseRoute, Match, Mount
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src import config
+
+from .log import AccessLogSampler
+from .metrics import AppMetrics
+from .static import parse_accept_encoding
+from .timing import start_request_timing, stop_request_timing
+
 logger = logging.getLogger("gitlab-wh.access")
 logger.setLevel(logging.INFO)
+timing_logger = logging.getLogger("gitlab-wh.timing")
 
 class AccessLogMiddleware:
     """Логирование запросов
@@ -14,10 +28,20 @@ class AccessLogMiddleware:
     Данный Middleware осуществляет простой access log, для того чтобы выводить в терминал записи о запросах.
     Он необходим при использовании granian, тк он не логирует самостоятельно.
     При использовании, например, uvicorn, надобность в этом мидлвейре отпадет.
+
+    Запись только кладется в очередь логирования (см. `src.app.log.setup_logging`), а часть записей
+    для частых запросов отбрасывается `AccessLogSampler`. Поля запроса передаются в `extra`
+    и попадают в JSON логи как отдельные поля.
     """
-    def __init__(self, app: ASGIApp) -> None:
-        """Инициализация мидлвейра"""
+    def __init__(self, app: ASGIApp, sampler: AccessLogSampler | None = None) -> None:
+        """Инициализация мидлвейра
+
+        Args:
+            app: ASGI приложение
+            sampler: выборка записей, None - записывать все запросы
+        """
         self.app = app
+        self.sampler = sampler
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Обработка запроса"""
@@ -25,11 +49,6 @@ class AccessLogMiddleware:
             await self.app(scope, receive, send)
             return
 
-        full_path = self._get_path_with_query_string(scope)
-        protocol = f"HTTP/{scope['http_version']}"
-        method = scope["method"]
-        full_request_line = f"{method} {full_path} {protocol}"
-
         status_code = -1
         async def send_save_status(message: Message) -> None:
             nonlocal status_code
@@ -37,26 +56,38 @@ class AccessLogMiddleware:
                 status_code = message["status"]
             await send(message)
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         try:
             await self.app(scope, receive, send_save_status)
         except Exception:
             status_code = 500
             raise
         finally:
-            end_time = time.time()
-            duration_ms = int((end_time - start_time) * 1_000)
-            status_phrase = http.HTTPStatus(status_code).phrase
-            logger.info(
-                '"%(full_request_line)s" %(status_code)s %(status_phrase)s (%(duration_ms)s мс)',
-                {
-                    "full_request_line": full_request_line,
-                    "status_code": status_code,
-                    "status_phrase": status_phrase,
-                    "duration_ms": duration_ms,
-                },
-            )
+            duration_ms = round((time.perf_counter_ns() - start_time) / 1_000_000, 3)
+            if self.sampler is None or self.sampler.should_log(scope["path"], status_code):
+                self._log(scope, status_code, duration_ms)
 
+    def _log(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        """Записать запрос в access log"""
+        full_request_line = f"{scope['method']} {self._get_path_with_query_string(scope)} HTTP/{scope['http_version']}"
+        try:
+            phrase = http.HTTPStatus(status_code).phrase
+        except ValueError:
+            # Нестандартный статус или -1: приложение завершилось, не начав ответ
+            phrase = ""
+        logger.info(
+            '"%s" %s %s (%.3f мс)',
+            full_request_line,
+            status_code,
+            phrase,
+            duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+            },
+        )
 
     @staticmethod
     def _get_path_with_query_string(scope: Scope) -> str:
@@ -65,3 +96,270 @@ class AccessLogMiddleware:
         if scope["query_string"]:
             return f"{path_with_query_string}?{scope['query_string'].decode('ascii')}"
         return path_with_query_string
+
+
+class MetricsMiddleware:
+    """Метрики входящих запросов: гистограмма длительности по методу, шаблону маршрута и классу статуса
+
+    Метка маршрута - шаблон пути (`/groups/{group_id}/members`), а не фактический путь, чтобы число
+    рядов не росло с числом идентификаторов. Запросы, не попавшие ни в один маршрут, получают метку `<unmatched>`.
+    """
+    UNMATCHED_ROUTE = "<unmatched>"
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics) -> None:
+        """Инициализация мидлвейра
+
+        Args:
+            app: ASGI приложение
+            metrics: метрики приложения
+        """
+        self.app = app
+        self.metrics = metrics
+        self._routes_by_endpoint: dict[Any, list[BaseRoute]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        async def send_save_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send_save_status)
+        finally:
+            duration = (time.perf_counter_ns() - start_time) / 1_000_000_000
+            self.metrics.observe_request(scope["method"], self._get_route_template(scope), status_code, duration)
+
+    def _get_route_template(self, scope: Scope) -> str:
+        """Шаблон пути маршрута, обработавшего запрос (роутер сохраняет его endpoint в scope)"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return self.UNMATCHED_ROUTE
+
+        routes = self._routes_by_endpoint.get(endpoint)
+        if routes is None:
+            routes = self._routes_by_endpoint[endpoint] = [
+                route for route in scope["app"].routes
+                if getattr(route, "endpoint", None) is endpoint or (isinstance(route, Mount) and route.app is endpoint)
+            ]
+        # Один endpoint может обслуживать несколько маршрутов (например, страница и ее фрагмент `/rows`)
+        for route in routes:
+            if len(routes) == 1 or route.matches(scope)[0] != Match.NONE:
+                return str(getattr(route, "path_format", self.UNMATCHED_ROUTE))
+        return self.UNMATCHED_ROUTE
+
+
+class ServerTimingMiddleware:
+    """Заголовок Server-Timing с разбивкой времени обработки запроса
+
+    На время обработки запроса в контексте создается учет участков (`src.app.timing`): запросы в GitLab,
+    декодирование их JSON и рендеринг шаблонов. Суммы по участкам отправляются в заголовке Server-Timing
+    (видны в devtools браузера). Учитываются участки, завершенные до отправки заголовков ответа:
+    рендеринг потоковых страниц идет после них и в заголовок не попадает.
+    Заголовок раскрывает внутреннее устройство (количество и время запросов в GitLab), поэтому он отправляется
+    только запросам с верным `X-Service-Token` (`config.SERVICE_TOKEN`).
+    При `debug=True` дерево участков каждого запроса пишется в лог `gitlab-wh.timing`.
+    """
+    def __init__(self, app: ASGIApp, *, debug: bool = False) -> None:
+        """Инициализация мидлвейра
+
+        Args:
+            app: ASGI приложение
+            debug: писать дерево участков каждого запроса в лог
+        """
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing, token = start_request_timing()
+        send_header = self._has_service_token(scope)
+        async def send_with_server_timing(message: Message) -> None:
+            if send_header and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.server_timing(time.perf_counter()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            stop_request_timing(token)
+            if self.debug:
+                timing_logger.info("%s %s\n%s", scope["method"], scope["path"], timing.format_tree())
+
+    @staticmethod
+    def _has_service_token(scope: Scope) -> bool:
+        """Передан ли в запросе верный `X-Service-Token`"""
+        if not config.SERVICE_TOKEN:
+            return False
+        service_token = Headers(scope=scope).get("x-service-token")
+        return service_token is not None and hmac.compare_digest(service_token.encode(), config.SERVICE_TOKEN.encode())
+
+
+class CompressionMiddleware:
+    """Сжатие динамических ответов (HTML, JSON) gzip
+
+    Сжимаются только ответы с типом из `content_types` и телом не меньше `minimum_size`, если клиент
+    допускает gzip и ответ еще не сжат (например, статика отдается предварительно сжатой).
+    Потоковые ответы сжимаются по частям: каждая часть сбрасывается (`Z_SYNC_FLUSH`) и сразу отправляется
+    клиенту, тело целиком в памяти не собирается.
+    """
+    def __init__(self,
+                 app: ASGIApp,
+                 minimum_size: int = config.COMPRESSION_MIN_SIZE,
+                 compress_level: int = config.COMPRESSION_LEVEL,
+                 content_types: frozenset[str] = config.COMPRESSION_CONTENT_TYPES,
+                 ) -> None:
+        """Инициализация мидлвейра
+
+        Args:
+            app: ASGI приложение
+            minimum_size: минимальный размер тела ответа в байтах, меньшие ответы не сжимаются
+            compress_level: уровень сжатия gzip (1-9)
+            content_types: типы ответов, которые сжимаются
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compress_level = compress_level
+        self.content_types = content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса"""
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "") if scope["type"] == "http" else ""
+        if "gzip" not in parse_accept_encoding(accept_encoding):
+            await self.app(scope, receive, send)
+            return
+
+        responder = _GZipResponder(send, self.minimum_size, self.compress_level, self.content_types)
+        await self.app(scope, receive, responder.send)
+
+
+class _GZipResponder:
+    """Сжатие одного ответа для CompressionMiddleware"""
+    def __init__(self, send: Send, minimum_size: int, compress_level: int, content_types: frozenset[str]) -> None:
+        self._send = send
+        self._minimum_size = minimum_size
+        self._compress_level = compress_level
+        self._content_types = content_types
+        self._start_message: Message = {}
+        self._buffer: list[bytes] = []
+        self._buffer_size = 0
+        self._compressor: Any = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Отправка сообщения ASGI с учетом сжатия"""
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            self._passthrough = not self._is_compressible(MutableHeaders(raw=message["headers"]))
+            if self._passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self._compressor is not None:
+            await self._send_compressed(body, more_body=more_body)
+            return
+
+        # До начала сжатия тело копится, пока не станет ясно, что оно не меньше minimum_size
+        self._buffer.append(body)
+        self._buffer_size += len(body)
+        if not more_body and (self._buffer_size < self._minimum_size or not self._buffer_size):
+            await self._send_uncompressed()
+        elif self._buffer_size >= self._minimum_size:
+            await self._start_compression(more_body=more_body)
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        """Можно ли сжимать ответ с такими заголовками"""
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        if content_type not in self._content_types or self._start_message["status"] in {204, 304}:
+            return False
+        headers.add_vary_header("Accept-Encoding")
+        return "content-encoding" not in headers
+
+    async def _send_uncompressed(self) -> None:
+        """Отправить накопленное тело без сжатия"""
+        await self._send(self._start_message)
+        await self._send({"type": "http.response.body", "body": b"".join(self._buffer), "more_body": False})
+
+    async def _start_compression(self, *, more_body: bool) -> None:
+        """Начать сжатие: отправить заголовки и накопленную часть тела"""
+        self._compressor = zlib.compressobj(self._compress_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        body = b"".join(self._buffer)
+        self._buffer.clear()
+        headers = MutableHeaders(raw=self._start_message["headers"])
+        headers["Content-Encoding"] = "gzip"
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            # Сильный ETag относится к несжатому телу: сжатое - другое представление, поэтому ETag ослабляется
+            # (If-None-Match сравнивается без учета W/, и 304 продолжает работать)
+            headers["ETag"] = f"W/{etag}"
+        if not more_body:
+            compressed = self._compressor.compress(body) + self._compressor.flush()
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self._start_message)
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+            return
+
+        # Итоговый размер потокового ответа заранее неизвестен
+        del headers["Content-Length"]
+        await self._send(self._start_message)
+        await self._send_compressed(body, more_body=True)
+
+    async def _send_compressed(self, body: bytes, *, more_body: bool) -> None:
+        """Сжать и сразу отправить часть тела потокового ответа"""
+        compressed = self._compressor.compress(body)
+        compressed += self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+class EarlyHintsMiddleware:
+    """Отправка 103 Early Hints со ссылками на критические ресурсы
+
+    Пока приложение готовит страницу (запросы в GitLab, рендеринг), браузер уже загружает стили.
+    Работает только на серверах, поддерживающих расширение ASGI `http.response.early_hint`
+    (https://asgi.readthedocs.io/en/latest/extensions.html#http-2-server-push), на остальных ничего не делает.
+    """
+    def __init__(self,
+                 app: ASGIApp,
+                 links: Iterable[str] = (),
+                 excluded_prefixes: tuple[str, ...] = ("/api", "/static"),
+                 ) -> None:
+        """Инициализация мидлвейра
+
+        Args:
+            app: ASGI приложение
+            links: значения заголовка Link для предзагрузки
+            excluded_prefixes: префиксы путей, для которых подсказки не отправляются (не HTML страницы)
+        """
+        self.app = app
+        self.links = [link.encode("latin-1") for link in links]
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса"""
+        if (
+            self.links
+            and scope["type"] == "http"
+            and scope["method"] == "GET"
+            and "http.response.early_hint" in scope.get("extensions", {})
+            and not scope["path"].startswith(self.excluded_prefixes)
+            and "text/html" in Headers(scope=scope).get("accept", "")
+        ):
+            await send({"type": "http.response.early_hint", "links": self.links})
+        await self.app(scope, receive, send)
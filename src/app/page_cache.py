@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class CachedPage(NamedTuple):
+    """Отрендеренная страница
+
+    body: HTML страницы
+    etag: сильный ETag страницы (в кавычках, готовый для заголовка)
+    """
+    body: bytes
+    etag: str
+
+
+def _reject_unserializable(value: object) -> Any:
+    """Запретить кэширование контекста, который нельзя однозначно сериализовать"""
+    raise TypeError(type(value).__name__)
+
+
+def make_page_cache_key(template_name: str, context: Mapping[str, Any]) -> str | None:
+    """Ключ кэша: имя шаблона + хэш контекста
+
+    Args:
+        template_name: имя шаблона
+        context: параметры шаблона (без Request)
+
+    Returns:
+        Ключ кэша или None, если контекст содержит значения, которые нельзя сериализовать в JSON
+        (такие страницы не кэшируются)
+    """
+    try:
+        serialized = json.dumps(context, sort_keys=True, default=_reject_unserializable, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    context_hash = hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+    return f"{template_name}:{context_hash}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком `If-None-Match` (слабое сравнение: `W/"abc"` совпадает с `"abc"`)
+
+    Args:
+        if_none_match: значение заголовка `If-None-Match`, список ETag через запятую
+        etag: ETag страницы
+
+    Returns:
+        True - клиент уже получил эту страницу
+    """
+    if not if_none_match:
+        return False
+    return any(tag.strip().removeprefix("W/") in {etag, "*"} for tag in if_none_match.split(","))
+
+
+class RenderedPageCache:
+    """LRU кэш отрендеренных страниц, ограниченный суммарным размером страниц в байтах"""
+    def __init__(self, max_bytes: int) -> None:
+        """Конструктор
+
+        Args:
+            max_bytes: максимальный суммарный размер страниц в кэше, 0 - кэш отключен
+        """
+        self._max_bytes = max_bytes
+        self._pages: OrderedDict[str, CachedPage] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Количество страниц в кэше"""
+        return len(self._pages)
+
+    @property
+    def size(self) -> int:
+        """Суммарный размер страниц в кэше в байтах"""
+        return self._size
+
+    def get(self, key: str) -> CachedPage | None:
+        """Получить страницу из кэша
+
+        Args:
+            key: ключ кэша
+
+        Returns:
+            Страница или None, если ее нет в кэше
+        """
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+        return page
+
+    def put(self, key: str, body: bytes) -> CachedPage:
+        """Положить страницу в кэш, вытеснив давно не использованные страницы при превышении размера
+
+        Args:
+            key: ключ кэша
+            body: HTML страницы
+
+        Returns:
+            Страница с вычисленным ETag
+        """
+        page = CachedPage(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+        if len(body) > self._max_bytes:
+            return page
+
+        previous = self._pages.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.body)
+        self._pages[key] = page
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self._size -= len(evicted.body)
+        return page
+
+    def clear(self) -> None:
+        """Очистить кэш"""
+        self._pages.clear()
+        self._size = 0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+
+class ProfileBusyError(Exception):
+    """Профилирование уже выполняется"""
+
+
+class ProfileResult(NamedTuple):
+    """Результат профилирования
+
+    seconds: длительность профилирования
+    interval: период выборки стеков в секундах
+    samples: количество выборок стека потока event loop
+    stacks: количество выборок по стекам (функции от корня к листу через `;`)
+    tasks: количество выборок по asyncio задачам (корутина задачи и место, где она ожидает)
+    """
+    seconds: float
+    interval: float
+    samples: int
+    stacks: Counter[str]
+    tasks: Counter[str]
+
+    def collapsed(self) -> str:
+        """Стеки в формате collapsed stacks (`flamegraph.pl`, speedscope): `a;b;c <количество>`"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _frame_name(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Стек кадра в одну строку: функции от корня к листу через `;`"""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def describe_task(task: asyncio.Task[object]) -> str:
+    """Корутина задачи и кадр, в котором она сейчас ожидает"""
+    stack = task.get_stack(limit=1)
+    coroutine = task.get_coro()
+    name = getattr(coroutine, "__qualname__", repr(coroutine))
+    return f"{name} @ {_frame_name(stack[0])}" if stack else name
+
+
+class SamplingProfiler:
+    """Статистический профилировщик потока event loop
+
+    Отдельный поток каждые `interval` секунд снимает стек потока event loop (`sys._current_frames`),
+    не останавливая его, поэтому профилировать можно рабочий процесс под нагрузкой. Параллельно в самом
+    event loop с периодом `task_interval` считаются asyncio задачи по месту ожидания.
+    Одновременно выполняется не больше одного профилирования.
+    """
+    def __init__(self, interval: float = 0.005, task_interval: float = 0.1) -> None:
+        """Конструктор
+
+        Args:
+            interval: период выборки стеков в секундах
+            task_interval: период выборки asyncio задач в секундах
+        """
+        self._interval = interval
+        self._task_interval = task_interval
+        self._lock = asyncio.Lock()
+
+    async def profile(self, seconds: float) -> ProfileResult:
+        """Профилировать поток текущего event loop
+
+        Args:
+            seconds: длительность профилирования
+
+        Returns:
+            Результат профилирования
+
+        Raises:
+            ProfileBusyError: профилирование уже выполняется
+        """
+        if self._lock.locked():
+            raise ProfileBusyError
+        async with self._lock:
+            thread_id = threading.get_ident()
+            (samples, stacks), tasks = await asyncio.gather(
+                asyncio.to_thread(self._sample_stacks, thread_id, seconds),
+                self._sample_tasks(seconds),
+            )
+        return ProfileResult(seconds=seconds, interval=self._interval, samples=samples, stacks=stacks, tasks=tasks)
+
+    def _sample_stacks(self, thread_id: int, seconds: float) -> tuple[int, Counter[str]]:
+        """Выборка стеков потока `thread_id` (выполняется в отдельном потоке)"""
+        stacks: Counter[str] = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)  # noqa: SLF001
+            if frame is not None:
+                stacks[collapse_stack(frame)] += 1
+                samples += 1
+            del frame
+            time.sleep(self._interval)
+        return samples, stacks
+
+    async def _sample_tasks(self, seconds: float) -> Counter[str]:
+        """Выборка asyncio задач текущего event loop"""
+        tasks: Counter[str] = Counter()
+        current_task = asyncio.current_task()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            tasks.update(describe_task(task) for task in asyncio.all_tasks() if task is not current_task)
+            await asyncio.sleep(self._task_interval)
+        return tasks
@@ -0,0 +1,200 @@
+import gzip
+import logging
+import mimetypes
+import os
+import stat
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src import config
+
+from .assets import IMMUTABLE_CACHE_CONTROL, AssetManifest
+
+logger = logging.getLogger("gitlab-wh.static")
+
+# Кодировки в порядке предпочтения: (значение Content-Encoding, расширение файла)
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".js", ".svg", ".html", ".json", ".txt", ".map", ".ico", ".xml"})
+
+
+def parse_accept_encoding(accept_encoding: str) -> set[str]:
+    """Получить множество кодировок, допустимых для клиента, из заголовка Accept-Encoding
+
+    Args:
+        accept_encoding: значение заголовка Accept-Encoding
+
+    Returns:
+        Кодировки с q > 0
+    """
+    encodings = set()
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        if encoding.strip():
+            encodings.add(encoding.strip().lower())
+    return encodings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Раздача статики с предварительно сжатыми копиями файлов
+
+    Если рядом с файлом лежат `.br`/`.gz` копии (см. `precompress`) и клиент допускает такую кодировку
+    в Accept-Encoding, отдается сжатая копия с `Content-Encoding`. Во время запроса ничего не сжимается.
+    Копии старше исходного файла не отдаются.
+
+    Если передан манифест, файлы также доступны по адресам с хэшем содержимого (см. `AssetManifest`).
+    Такие ответы кэшируются навсегда (`Cache-Control: immutable`) и получают сильный ETag по хэшу содержимого.
+    """
+    def __init__(self, *, manifest: AssetManifest | None = None, **kwargs: Any) -> None:
+        """Конструктор
+
+        Args:
+            manifest: манифест статики для адресов с хэшем содержимого
+            kwargs: параметры StaticFiles
+        """
+        super().__init__(**kwargs)
+        self._manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Ответ на запрос файла с учетом Accept-Encoding"""
+        request_headers = Headers(scope=scope)
+        accepted = parse_accept_encoding(request_headers.get("accept-encoding", ""))
+        asset = self._manifest.resolve(path) if self._manifest is not None else None
+        encodings = [
+            (encoding, suffix) for encoding, suffix in PRECOMPRESSED_ENCODINGS
+            if encoding in accepted or (encoding == "gzip" and "*" in accepted)
+        ]
+        if asset is not None:
+            path = asset.path
+            encodings.append(("identity", ""))
+
+        for encoding, suffix in encodings:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_variant, path, suffix)
+            if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                headers = {"Vary": "Accept-Encoding"}
+                if encoding != "identity":
+                    headers["Content-Encoding"] = encoding
+                if asset is not None:
+                    # Сильный ETag: у каждой кодировки свое представление
+                    headers["ETag"] = f'"{asset.digest}"' if encoding == "identity" else f'"{asset.digest}-{encoding}"'
+                    headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+                return self.file_response_with_headers(path, full_path, stat_result, headers, request_headers)
+
+        response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def lookup_variant(self, path: str, suffix: str) -> tuple[str, os.stat_result | None]:
+        """Найти файл или его сжатую копию
+
+        Копия, которая старше исходного файла, не используется: после изменения файла `precompress`
+        не перезапускали, и копия содержит прежнюю версию (а адрес с хэшем кэшируется навсегда).
+
+        Args:
+            path: путь несжатого файла
+            suffix: расширение сжатой копии, пустая строка - сам файл
+
+        Returns:
+            Полный путь и stat файла, stat - None, если файла нет или копия устарела
+        """
+        full_path, stat_result = self.lookup_path(path + suffix)
+        if suffix and stat_result is not None:
+            _, original_stat = self.lookup_path(path)
+            if original_stat is None or stat_result.st_mtime < original_stat.st_mtime:
+                logger.debug("Сжатая копия %s устарела, отдается исходный файл", full_path)
+                return full_path, None
+        return full_path, stat_result
+
+    def file_response_with_headers(self,
+                                   path: str,
+                                   full_path: str,
+                                   stat_result: os.stat_result,
+                                   headers: dict[str, str],
+                                   request_headers: Headers,
+                                   ) -> Response:
+        """Ответ файлом (в том числе сжатой копией) с дополнительными заголовками
+
+        Args:
+            path: путь запрошенного (несжатого) файла
+            full_path: полный путь до отдаваемого файла
+            stat_result: stat отдаваемого файла
+            headers: дополнительные заголовки ответа
+            request_headers: заголовки запроса
+
+        Returns:
+            Ответ файлом или 304
+        """
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=mimetypes.guess_type(path)[0] or "text/plain",
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _iter_compressible_files(directory: Path) -> Iterator[Path]:
+    """Файлы статики, для которых имеет смысл делать сжатые копии"""
+    for file_path in sorted(directory.rglob("*")):
+        if file_path.is_file() and file_path.suffix in COMPRESSIBLE_SUFFIXES:
+            yield file_path
+
+
+def precompress(directory: Path, min_size: int = 1024) -> int:
+    """Создать `.br` и `.gz` копии файлов статики (шаг сборки)
+
+    Сжатие максимальным уровнем выполняется один раз при сборке, а не на каждом запросе.
+    `.br` создаются только при установленном пакете `brotli`. Копия не создается, если она не меньше
+    исходного файла.
+
+    Args:
+        directory: директория статики
+        min_size: минимальный размер файла в байтах, меньшие файлы не сжимаются
+
+    Returns:
+        Количество созданных сжатых копий
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        logger.warning("Пакет brotli не установлен, будут созданы только .gz копии")
+
+    created = 0
+    for file_path in _iter_compressible_files(directory):
+        content = file_path.read_bytes()
+        if len(content) < min_size:
+            continue
+
+        variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content, quality=11)
+
+        for suffix, compressed in variants.items():
+            compressed_path = file_path.with_name(file_path.name + suffix)
+            if len(compressed) >= len(content):
+                compressed_path.unlink(missing_ok=True)
+                continue
+            compressed_path.write_bytes(compressed)
+            created += 1
+            logger.info("%s: %s -> %s байт", compressed_path.relative_to(directory), len(content), len(compressed))
+    return created
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    precompress(config.STATIC_FOLDER_PATH)
@@ -1,14 +1,49 @@
-from collections.abc import Mapping
+import logging
+from collections.abc import AsyncIterator, Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from fastapi import Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import BytecodeCache, FileSystemBytecodeCache, Template
 from starlette.background import BackgroundTask
+from starlette.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 
 from src import config
 from src.models.pages.alert import Alert
 
+from .assets import asset_manifest
+from .critical_css import load_critical_css
+from .memory import memory_span
+from .page_cache import RenderedPageCache, etag_matches, make_page_cache_key
+from .timing import timing_span
+
+logger = logging.getLogger("gitlab-wh.templates")
+
+
+def create_bytecode_cache(directory: str | Path) -> BytecodeCache | None:
+    """Создать кэш байткода шаблонов на диске
+
+    Скомпилированные шаблоны переживают перезапуск воркеров, поэтому после деплоя шаблоны не компилируются
+    заново, если их исходники не изменились (Jinja2 сверяет контрольную сумму исходника).
+
+    Args:
+        directory: директория кэша, пустая строка - без кэша
+
+    Returns:
+        Кэш байткода или None, если кэш отключен или директорию не удалось создать
+    """
+    if not directory:
+        return None
+    try:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    except OSError:
+        logger.warning("Не удалось создать директорию кэша шаблонов %s, кэш отключен", directory)
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
 
 class CommonTemplateResponseGenerator:
     """Модель для работы с Jinja2 шаблонами
@@ -24,7 +59,30 @@ class CommonTemplateResponseGenerator:
     учитывается относительно базовой папки templates. Эти параметры необязательны, и служат
     лишь для упрощения. Эквивалентно, можно указать полный путь сразу в `name` из `self.generate_response`.
     """
-    _templates = Jinja2Templates(directory=config.HTML_TEMPLATES_FOLDER_PATH)
+    _templates = Jinja2Templates(
+        directory=config.HTML_TEMPLATES_FOLDER_PATH,
+        bytecode_cache=create_bytecode_cache(config.TEMPLATES_BYTECODE_CACHE_PATH),
+        auto_reload=config.TEMPLATES_AUTO_RELOAD,
+    )
+    # Отдельное окружение для потокового рендеринга: async-шаблоны компилируются в другой код,
+    # поэтому и кэш байткода у них свой
+    _async_templates = Jinja2Templates(
+        directory=config.HTML_TEMPLATES_FOLDER_PATH,
+        bytecode_cache=create_bytecode_cache(
+            config.TEMPLATES_BYTECODE_CACHE_PATH and Path(config.TEMPLATES_BYTECODE_CACHE_PATH, "async"),
+        ),
+        auto_reload=config.TEMPLATES_AUTO_RELOAD,
+        enable_async=True,
+    )
+    _page_cache = RenderedPageCache(config.PAGE_CACHE_MAX_BYTES)
+    # Адреса статики с хэшем содержимого: {{ static_url("css/style.css") }}
+    _templates.env.globals["static_url"] = asset_manifest.url
+    # Критический CSS встраивается в <head> base.html.j2, остальные стили загружаются без блокировки отрисовки
+    _templates.env.globals["critical_css"] = load_critical_css() if config.TEMPLATES_INLINE_CRITICAL_CSS else None
+    # Глобальные переменные у окружений общие: страница выглядит одинаково при обычном и потоковом рендеринге
+    _async_templates.env.globals = _templates.env.globals
+    # Заголовок Link для страниц: браузер начинает загрузку стилей до получения <head>
+    preload_headers: Mapping[str, str] = MappingProxyType({"Link": ", ".join(asset_manifest.preload_links())})
 
     def __init__(self, request: Request, directory: str | Path = "") -> None:
         """Конструктор модели. Сохраняет Request и префикс пути для предзаполнения
@@ -37,6 +95,35 @@ class CommonTemplateResponseGenerator:
         self._directory = directory
         self._context: dict[str, Any] = {"request": request}
 
+    @classmethod
+    def precompile(cls) -> int:
+        """Скомпилировать все шаблоны из `config.HTML_TEMPLATES_FOLDER_PATH` заранее
+
+        Вызывается при старте приложения, чтобы первые запросы после деплоя не платили за компиляцию
+        шаблонов. Скомпилированные шаблоны остаются в кэше окружения Jinja2 и в кэше байткода на диске.
+
+        Returns:
+            Количество скомпилированных шаблонов
+        """
+        names = cls._templates.env.list_templates(filter_func=lambda name: name.endswith(".j2"))
+        for env in (cls._templates.env, cls._async_templates.env):
+            for name in names:
+                env.get_template(name)
+        return len(names)
+
+    @classmethod
+    def render(cls, name: str | Path, context: Mapping[str, Any]) -> str:
+        """Отрендерить шаблон без Request (для страниц, которые готовятся заранее)
+
+        Args:
+            name: полный путь шаблона относительно `config.HTML_TEMPLATES_FOLDER_PATH`
+            context: параметры для подставления в шаблон
+
+        Returns:
+            HTML страницы
+        """
+        return cls._templates.get_template(str(name)).render(context)
+
     def generate_response(self,
                           name: str,
                           context: Mapping[str, Any] | None = None,
@@ -45,9 +132,17 @@ class CommonTemplateResponseGenerator:
                           headers: Mapping[str, str] | None = None,
                           media_type: str | None = None,
                           background: BackgroundTask | None = None,
+                          *,
+                          cache: bool = False,
+                          preload: bool = True,
                           ) -> Response:
         """Сгенерировать Response по шаблону Jinja2
 
+        Если `cache=True`, готовая страница кэшируется по имени шаблона и хэшу контекста (без Request),
+        и повторные запросы с тем же контекстом не рендерятся Jinja2 заново. Ответ получает ETag, и при
+        совпадении с `If-None-Match` возвращается 304 без тела. Кэшировать можно только страницы, которые
+        не зависят от Request (например, не используют `url_for`) и имеют небольшое число вариантов контекста.
+
         Args:
             name (str): имя файла шаблона
             context (Mapping[str, Any] | None, optional): параметры для подставления в шаблон
@@ -56,11 +151,74 @@ class CommonTemplateResponseGenerator:
             headers (Mapping[str, str] | None, optional): Хедеры ответа
             media_type (str | None, optional): media_type ответа
             background (BackgroundTask | None, optional): BackgroundTask ответа
+            cache (bool, optional): кэшировать ли отрендеренную страницу
+            preload (bool, optional): добавить заголовок Link для предзагрузки стилей
+                (`False` для HTML фрагментов без `<head>`)
 
         Returns:
             Response: фактически, HTMLResponse, готовая страница
         """
         template_name = Path(self._directory, name)
+        if preload:
+            headers = {**self.preload_headers, **(headers or {})}
+
+        if context:
+            self._context.update(context)
+
+        if alert:
+            self._context.update({"alert": alert})
+
+        if cache:
+            cache_key = make_page_cache_key(str(template_name), self._get_cacheable_context())
+            if cache_key is not None:
+                return self._generate_cached_response(
+                    cache_key, str(template_name), status_code, headers, media_type, background,
+                )
+
+        with timing_span("render", str(template_name)), memory_span("render", str(template_name)):
+            return self._templates.TemplateResponse(
+                name=str(template_name),
+                context=self._context,
+                status_code=status_code,
+                headers=headers,
+                media_type=media_type,
+                background=background,
+            )
+
+    def generate_streaming_response(self,
+                                    name: str,
+                                    context: Mapping[str, Any] | None = None,
+                                    alert: Alert | None = None,
+                                    status_code: int = 200,
+                                    headers: Mapping[str, str] | None = None,
+                                    background: BackgroundTask | None = None,
+                                    *,
+                                    preload: bool = True,
+                                    ) -> StreamingResponse:
+        """Сгенерировать потоковый Response по шаблону Jinja2
+
+        Для больших страниц (списки из тысяч строк): HTML отправляется частями по мере рендеринга
+        (`Template.generate_async`), а не собирается целиком в памяти. `<head>` отправляется сразу,
+        как только отрендерен, чтобы браузер начал загружать стили, пока рендерятся строки;
+        остальное - частями не меньше `config.TEMPLATES_STREAM_CHUNK_SIZE`.
+        В контексте можно передавать асинхронные итераторы: шаблон будет перебирать их через `{% for %}`
+        по мере поступления данных.
+
+        Args:
+            name (str): имя файла шаблона
+            context (Mapping[str, Any] | None, optional): параметры для подставления в шаблон
+            alert (Alert, optional): уведомление для пользователя
+            status_code (int, optional): Статус код ответа
+            headers (Mapping[str, str] | None, optional): Хедеры ответа
+            background (BackgroundTask | None, optional): BackgroundTask ответа
+            preload (bool, optional): добавить заголовок Link для предзагрузки стилей
+
+        Returns:
+            StreamingResponse: HTML страница, отправляемая частями
+        """
+        template_name = Path(self._directory, name)
+        if preload:
+            headers = {**self.preload_headers, **(headers or {})}
 
         if context:
             self._context.update(context)
@@ -68,11 +226,66 @@ class CommonTemplateResponseGenerator:
         if alert:
             self._context.update({"alert": alert})
 
-        return self._templates.TemplateResponse(
-            name=str(template_name),
-            context=self._context,
+        template = self._async_templates.get_template(str(template_name))
+        return StreamingResponse(
+            self._render_chunks(template, str(template_name)),
             status_code=status_code,
             headers=headers,
+            media_type="text/html",
+            background=background,
+        )
+
+    async def _render_chunks(self, template: Template, template_name: str) -> AsyncIterator[str]:
+        """Рендерить шаблон частями: `<head>` сразу, дальше - блоками по `config.TEMPLATES_STREAM_CHUNK_SIZE`
+
+        Участок `render` остается открытым, пока рендерится последняя часть: в Server-Timing он не попадает
+        (заголовки уже отправлены), но учитывается в дереве участков запроса и в учете памяти.
+        """
+        with timing_span("render", template_name), memory_span("render", template_name):
+            buffer: list[str] = []
+            buffer_size = 0
+            head_sent = False
+            async for chunk in template.generate_async(self._context):
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+                if buffer_size >= config.TEMPLATES_STREAM_CHUNK_SIZE or (not head_sent and "</head>" in chunk):
+                    head_sent = True
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffer_size = 0
+            if buffer:
+                yield "".join(buffer)
+
+    def _get_cacheable_context(self) -> dict[str, Any]:
+        """Контекст шаблона без Request, от которого не должна зависеть кэшируемая страница"""
+        return {key: value for key, value in self._context.items() if key != "request"}
+
+    def _generate_cached_response(self,
+                                  cache_key: str,
+                                  template_name: str,
+                                  status_code: int,
+                                  headers: Mapping[str, str] | None,
+                                  media_type: str | None,
+                                  background: BackgroundTask | None,
+                                  ) -> Response:
+        """Сгенерировать Response из кэша отрендеренных страниц (отрендерить при промахе)"""
+        page = self._page_cache.get(cache_key)
+        if page is None:
+            with timing_span("render", template_name), memory_span("render", template_name):
+                body = self._templates.get_template(template_name).render(self._context)
+            page = self._page_cache.put(cache_key, body.encode())
+
+        # Слабый ETag: CompressionMiddleware отдает ту же страницу сжатой, и ответ 304 (который не сжимается)
+        # должен содержать тот же ETag, что и ответ 200 с телом
+        response_headers = {**(headers or {}), "ETag": f"W/{page.etag}", "Cache-Control": "no-cache"}
+        request: Request = self._context["request"]
+        if status_code == HTTP_200_OK and etag_matches(request.headers.get("if-none-match"), page.etag):
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=response_headers, background=background)
+
+        return HTMLResponse(
+            content=page.body,
+            status_code=status_code,
+            headers=response_headers,
             media_type=media_type,
             background=background,
         )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from src.repository.http_requests.base import HTTPCall
+
+_request_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+_span_depth: ContextVar[int] = ContextVar("span_depth", default=0)
+
+
+class Span(NamedTuple):
+    """Участок обработки запроса
+
+    name: имя метрики Server-Timing (gitlab, json, render, ...)
+    description: подробности (адрес запроса, имя шаблона)
+    start: начало относительно начала обработки запроса в мс
+    duration: длительность в мс
+    depth: вложенность (для дерева участков)
+    """
+    name: str
+    description: str
+    start: float
+    duration: float
+    depth: int
+
+
+class RequestTiming:
+    """Участки обработки одного запроса: запросы в GitLab, декодирование JSON, рендеринг шаблонов"""
+    def __init__(self) -> None:
+        """Конструктор"""
+        self.start_time = time.perf_counter()
+        self.spans: list[Span] = []
+
+    def add(self, name: str, start_time: float, end_time: float, description: str = "", depth: int = 0) -> None:
+        """Добавить участок
+
+        Args:
+            name: имя метрики Server-Timing
+            start_time: начало участка (`time.perf_counter`)
+            end_time: конец участка (`time.perf_counter`)
+            description: подробности
+            depth: вложенность
+        """
+        self.spans.append(Span(
+            name=name,
+            description=description,
+            start=(start_time - self.start_time) * 1_000,
+            duration=(end_time - start_time) * 1_000,
+            depth=depth,
+        ))
+
+    def server_timing(self, total_time: float | None = None) -> str:
+        """Значение заголовка Server-Timing: суммарная длительность и количество участков по имени
+
+        Args:
+            total_time: конец обработки запроса (`time.perf_counter`), None - без метрики total
+
+        Returns:
+            Значение вида `gitlab;dur=12.5;desc="3", render;dur=4.1;desc="1", total;dur=20.3`
+        """
+        durations: dict[str, float] = {}
+        counts: dict[str, int] = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0) + span.duration
+            counts[span.name] = counts.get(span.name, 0) + 1
+        metrics = [f'{name};dur={duration:.1f};desc="{counts[name]}"' for name, duration in durations.items()]
+        if total_time is not None:
+            metrics.append(f"total;dur={(total_time - self.start_time) * 1_000:.1f}")
+        return ", ".join(metrics)
+
+    def format_tree(self) -> str:
+        """Дерево участков в порядке начала, для отладочного лога"""
+        return "\n".join(
+            f"{'  ' * span.depth}{span.start:8.1f} мс +{span.duration:.1f} мс {span.name} {span.description}".rstrip()
+            for span in sorted(self.spans, key=lambda span: span.start)
+        )
+
+
+def start_request_timing() -> tuple[RequestTiming, Token[RequestTiming | None]]:
+    """Начать учет участков для текущего запроса (контекста)
+
+    Returns:
+        Учет участков и токен для `stop_request_timing`
+    """
+    timing = RequestTiming()
+    return timing, _request_timing.set(timing)
+
+
+def stop_request_timing(token: Token[RequestTiming | None]) -> None:
+    """Закончить учет участков для текущего запроса"""
+    _request_timing.reset(token)
+
+
+def get_request_timing() -> RequestTiming | None:
+    """Учет участков текущего запроса или None вне запроса"""
+    return _request_timing.get()
+
+
+@contextmanager
+def timing_span(name: str, description: str = "") -> Iterator[None]:
+    """Записать участок обработки текущего запроса (ничего не делает вне запроса)
+
+    Args:
+        name: имя метрики Server-Timing
+        description: подробности
+    """
+    timing = _request_timing.get()
+    if timing is None:
+        yield
+        return
+
+    depth = _span_depth.get()
+    token = _span_depth.set(depth + 1)
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, start_time, time.perf_counter(), description, depth)
+        # Участок в потоковом ответе может закрываться в другом контексте: если клиент отключился,
+        # брошенный async-генератор закрывает event loop в отдельной задаче
+        with suppress(ValueError):
+            _span_depth.reset(token)
+
+
+def observe_http_call(call: HTTPCall) -> None:
+    """Записать запрос BaseHTTP и декодирование его JSON в участки текущего запроса (наблюдатель BaseHTTP)"""
+    timing = _request_timing.get()
+    if timing is None:
+        return
+
+    end_time = time.perf_counter()
+    decode_start_time = end_time - call.decode_duration
+    depth = _span_depth.get()
+    timing.add("gitlab", end_time - call.duration, decode_start_time, f"{call.method} {call.url}", depth)
+    timing.add("json", decode_start_time, end_time, call.url, depth + 1)
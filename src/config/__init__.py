@@ -1,8 +1,94 @@
+import os
 from pathlib import Path
+from typing import Literal
 
 CURRENT_PATH = Path(__file__).absolute().parent.parent
 STATIC_FOLDER_PATH = Path(CURRENT_PATH, "static")
 HTML_TEMPLATES_FOLDER_PATH = Path(CURRENT_PATH, "templates")
 
-# TODO вынести в ENV или args
-SHOW_TRACEBACK = True
+# Jinja2: кэш байткода шаблонов на диске (пустая строка - без кэша) и компиляция всех шаблонов при старте
+TEMPLATES_BYTECODE_CACHE_PATH = os.environ.get("GITLAB_WH_TEMPLATES_BYTECODE_CACHE",
+                                               str(Path(CURRENT_PATH.parent, ".jinja_cache")))
+TEMPLATES_PRECOMPILE = os.environ.get("GITLAB_WH_TEMPLATES_PRECOMPILE", "1") == "1"
+TEMPLATES_AUTO_RELOAD = os.environ.get("GITLAB_WH_TEMPLATES_AUTO_RELOAD", "1") == "1"
+TEMPLATES_STREAM_CHUNK_SIZE = 16 * 1024  # символы, размер части при потоковом рендеринге
+# Встраивать критический CSS (см. `python -m src.app.critical_css`) в <head>, а полные стили загружать без блокировки
+TEMPLATES_INLINE_CRITICAL_CSS = os.environ.get("GITLAB_WH_TEMPLATES_INLINE_CRITICAL_CSS", "0") == "1"
+CRITICAL_CSS_PATH = Path(STATIC_FOLDER_PATH, "css", "critical.css")
+# Кэш отрендеренных страниц (главная, вход, ошибки): максимальный суммарный размер, 0 - кэш отключен
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("GITLAB_WH_PAGE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Сжатие динамических ответов (HTML, JSON): минимальный размер тела в байтах и уровень gzip (1-9)
+COMPRESSION_MIN_SIZE = int(os.environ.get("GITLAB_WH_COMPRESSION_MIN_SIZE", "500"))
+COMPRESSION_LEVEL = int(os.environ.get("GITLAB_WH_COMPRESSION_LEVEL", "6"))
+COMPRESSION_CONTENT_TYPES = frozenset({"text/html", "application/json"})
+
+# Логи в JSON (одна запись - одна строка) вместо цветного текста
+LOG_JSON = os.environ.get("GITLAB_WH_LOG_JSON", "0") == "1"
+# Access log по префиксам пути: (доля записываемых запросов от 0 до 1, максимум записей в секунду, 0 - без ограничения).
+# Ответы с ошибкой сервера (5xx) записываются всегда
+ACCESS_LOG_RULES: dict[str, tuple[float, float]] = {
+    "/static/": (0.1, 0),
+    "/api/service/ping": (1.0, 1),
+}
+
+# Заголовок Server-Timing (время запросов в GitLab, декодирования JSON и рендеринга шаблонов),
+# отправляется только запросам с верным X-Service-Token
+SERVER_TIMING = os.environ.get("GITLAB_WH_SERVER_TIMING", "1") == "1"
+SERVER_TIMING_DEBUG = os.environ.get("GITLAB_WH_SERVER_TIMING_DEBUG", "0") == "1"  # дерево участков в лог
+
+# Токен защищенных сервисных методов (заголовок X-Service-Token), пустой - методы отключены
+SERVICE_TOKEN = os.environ.get("GITLAB_WH_SERVICE_TOKEN", "")
+# Профилирование потока event loop (/api/service/profile)
+PROFILE_INTERVAL = 0.005  # секунды между выборками стека
+PROFILE_MAX_SECONDS = 60
+
+# Мониторинг event loop: период измерения lag и порог блокировки, после которого она логируется со стеком
+LOOP_MONITOR_INTERVAL = 0.1  # секунды
+LOOP_SLOW_CALLBACK_THRESHOLD = float(os.environ.get("GITLAB_WH_LOOP_SLOW_CALLBACK_THRESHOLD", "0.1"))  # секунды
+
+# Учет памяти через tracemalloc (замедляет аллокации, включается для поиска утечек и OOM):
+# пики постраничных запросов в GitLab и рендеринга шаблонов, снимки мест аллокаций в /api/service/memory
+MEMORY_TRACING = os.environ.get("GITLAB_WH_MEMORY_TRACING", "0") == "1"
+MEMORY_TRACING_FRAMES = int(os.environ.get("GITLAB_WH_MEMORY_TRACING_FRAMES", "1"))
+MEMORY_OPERATION_BUDGET = int(os.environ.get("GITLAB_WH_MEMORY_OPERATION_BUDGET", "0"))  # байты, 0 - без предупреждений
+
+# Traceback на страницах ошибок: только для отладки, в проде traceback не собирается
+SHOW_TRACEBACK = os.environ.get("GITLAB_WH_SHOW_TRACEBACK", "0") == "1"
+
+# GitLab, с которым работает приложение (пустой URL - страницы с данными GitLab недоступны)
+GITLAB_URL = os.environ.get("GITLAB_WH_GITLAB_URL", "")
+GITLAB_TOKEN = os.environ.get("GITLAB_WH_GITLAB_TOKEN", "")
+GITLAB_PAGE_SIZE = 20  # записей на странице списков (проекты, группы, пользователи, токены)
+GITLAB_MAX_PAGE_SIZE = 100  # ограничение GitLab API
+GITLAB_HEALTH_TTL = 10.0  # секунды, результат проверки доступности GitLab общий для всех запросов
+GITLAB_HEALTH_TIMEOUT = 5.0  # секунды
+
+# Учет запросов в GitLab по токенам и задачам (метка `gitlab_job`): скользящие окна и лимиты фоновых задач
+GITLAB_BUDGET_WINDOWS = (60.0, 3600.0)  # секунды
+GITLAB_BUDGET_LIMITS = {"dashboard": 300}  # запросов в минуту по меткам задач, интерактивные запросы не ограничены
+GITLAB_BUDGET_RATE_LIMIT_RESERVE = 0.1  # доля лимита GitLab (RateLimit-*), которую фоновые задачи не расходуют
+
+# Обзор инстанса на главной странице: снимок пересобирается в фоне
+DASHBOARD_REFRESH_INTERVAL = float(os.environ.get("GITLAB_WH_DASHBOARD_REFRESH_INTERVAL", "300"))  # секунды
+DASHBOARD_FULL_REFRESH_INTERVAL = float(os.environ.get("GITLAB_WH_DASHBOARD_FULL_REFRESH_INTERVAL", "3600"))  # секунды
+DASHBOARD_INACTIVE_DAYS = 90  # пользователь без активности дольше - неактивный
+DASHBOARD_TOKENS_EXPIRING_DAYS = 14  # токены, которые истекают раньше, попадают в обзор
+DASHBOARD_LIST_LIMIT = 10  # записей в списках обзора
+
+# Вебхуки GitLab
+WEBHOOK_SECRETS_FILE_PATH = Path(os.environ.get("GITLAB_WH_WEBHOOK_SECRETS_FILE",
+                                                Path(CURRENT_PATH.parent, "webhook_secrets.json")))
+WEBHOOK_SECRETS_RELOAD_INTERVAL = 5.0  # секунды
+WEBHOOK_RULES_FILE_PATH = Path(os.environ.get("GITLAB_WH_WEBHOOK_RULES_FILE",
+                                              Path(CURRENT_PATH.parent, "webhook_rules.json")))
+WEBHOOK_COALESCE_KEY: Literal["project", "ref", "merge_request"] = "ref"
+WEBHOOK_COALESCE_WINDOW = 2.0  # секунды, 0 - не объединять события
+WEBHOOK_COALESCE_MAX_BATCH = 50
+WEBHOOK_WORKERS = 4
+WEBHOOK_QUEUE_MAX_DEPTH = 10_000
+WEBHOOK_QUEUE_LOW_PRIORITY_WATERMARK = 5_000  # события CI (pipeline, job, ...)
+WEBHOOK_QUEUE_NORMAL_PRIORITY_WATERMARK = 8_000  # push, merge_request, ...
+WEBHOOK_MEMORY_SOFT_LIMIT = int(os.environ.get("GITLAB_WH_WEBHOOK_MEMORY_SOFT_LIMIT", "0"))  # байты, 0 - без лимита
+WEBHOOK_MEMORY_HARD_LIMIT = int(os.environ.get("GITLAB_WH_WEBHOOK_MEMORY_HARD_LIMIT", "0"))  # байты, 0 - без лимита
+WEBHOOK_RETRY_AFTER = 30  # секунды
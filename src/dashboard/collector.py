@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from src.app.budget import gitlab_job
+
+from .snapshot import DashboardSnapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from src.app.budget import GitLabBudget
+    from src.repository.http_requests.gitlab import GitLabHTTPv4
+    from src.types.access_token.personal import PersonalAccessToken
+    from src.types.project import Project
+    from src.types.user import ListedUserByAdmin
+
+logger = logging.getLogger("gitlab-wh.dashboard")
+
+JOB = "dashboard"  # метка задачи для учета запросов в GitLab
+
+
+class DashboardCollector:
+    """Фоновый сборщик снимков обзора инстанса GitLab
+
+    Главная страница рендерится из последнего снимка в памяти и не обращается в GitLab.
+    Снимок пересобирается в фоне:
+        - каждые `refresh_interval` секунд - дешевая часть: количества (один запрос с per_page=1 на сущность),
+          последние активные репозитории (одна страница) и токены, которые скоро истекут (GitLab фильтрует сам);
+        - раз в `full_refresh_interval` секунд - полный обход пользователей для поиска неактивных
+          (GitLab не фильтрует пользователей по дате активности). Между полными обходами
+          используется предыдущий результат.
+    Запросы выполняются от имени задачи `dashboard` (`gitlab_job`): если задача превысила бюджет запросов
+    в GitLab, пересборка откладывается.
+    """
+    def __init__(self,
+                 get_gitlab_http: Callable[[], GitLabHTTPv4 | None],
+                 *,
+                 refresh_interval: float = 300.0,
+                 full_refresh_interval: float = 3600.0,
+                 inactive_days: int = 90,
+                 expiring_days: int = 14,
+                 list_limit: int = 10,
+                 budget: GitLabBudget | None = None,
+                 identity: str = "",
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            get_gitlab_http: функция получения клиента GitLab API (None - GitLab не настроен)
+            refresh_interval: период пересборки снимка в секундах
+            full_refresh_interval: период полного обхода пользователей в секундах
+            inactive_days: количество дней без активности, после которого пользователь считается неактивным
+            expiring_days: за сколько дней до истечения токен попадает в список
+            list_limit: количество записей в списках снимка
+            budget: учет запросов в GitLab, None - без ограничений
+            identity: отпечаток токена, от имени которого выполняются запросы (для `budget`)
+        """
+        self._get_gitlab_http = get_gitlab_http
+        self._refresh_interval = refresh_interval
+        self._full_refresh_interval = full_refresh_interval
+        self._inactive_days = inactive_days
+        self._expiring_days = expiring_days
+        self._list_limit = list_limit
+        self._budget = budget
+        self._identity = identity
+        self._snapshot: DashboardSnapshot | None = None
+        self._users_refreshed_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def snapshot(self) -> DashboardSnapshot | None:
+        """Последний собранный снимок или None, если снимок еще не собран"""
+        return self._snapshot
+
+    async def refresh(self, *, full: bool = False) -> DashboardSnapshot | None:
+        """Пересобрать снимок
+
+        Полный обход пользователей - самая дорогая часть: если после дешевой части задача `dashboard`
+        превысила бюджет запросов, обход откладывается до следующей пересборки.
+
+        Args:
+            full: выполнить полный обход пользователей независимо от `full_refresh_interval` и бюджета
+
+        Returns:
+            Новый снимок или None, если GitLab не настроен
+        """
+        gitlab_http = self._get_gitlab_http()
+        if gitlab_http is None:
+            return None
+
+        start_time = time.perf_counter()
+        today = datetime.now(UTC).date()
+        groups_page, projects_page, active_users_count, tokens = await asyncio.gather(
+            gitlab_http.list_groups_page(per_page=1),
+            gitlab_http.list_projects_page(per_page=self._list_limit, order_by="last_activity_at"),
+            gitlab_http.count_users(active=True),
+            gitlab_http.list_personal_access_tokens(
+                state="active", expires_before=today + timedelta(days=self._expiring_days),
+            ),
+        )
+        expiring_tokens = sorted(tokens, key=lambda token: str(token["expires_at"]))
+
+        previous = self._snapshot
+        inactive_users = previous.inactive_users if previous else ()
+        inactive_users_count = previous.inactive_users_count if previous else None
+        users_updated_at = previous.users_updated_at if previous else None
+        if full or (self._is_full_refresh_due() and not self._is_over_budget()):
+            users = await gitlab_http.list_users(active=True)
+            inactive = self._get_inactive_users(users, today)
+            inactive_users = tuple(self._user_row(user) for user in inactive[:self._list_limit])
+            inactive_users_count = len(inactive)
+            users_updated_at = datetime.now(UTC)
+            self._users_refreshed_at = time.monotonic()
+
+        self._snapshot = DashboardSnapshot(
+            updated_at=datetime.now(UTC),
+            duration=time.perf_counter() - start_time,
+            groups_count=groups_page.total,
+            projects_count=projects_page.total,
+            active_users_count=active_users_count,
+            recent_projects=tuple(self._project_row(project) for project in projects_page.items),
+            expiring_tokens=tuple(self._token_row(token) for token in expiring_tokens[:self._list_limit]),
+            expiring_tokens_count=len(expiring_tokens),
+            inactive_users=inactive_users,
+            inactive_users_count=inactive_users_count,
+            users_updated_at=users_updated_at,
+        )
+        logger.info("Снимок обзора собран за %.2f с", self._snapshot.duration)
+        return self._snapshot
+
+    def start(self) -> None:
+        """Запустить периодическую пересборку снимка. Должен вызываться из работающего event loop"""
+        if self._task is None and self._get_gitlab_http() is not None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Остановить периодическую пересборку снимка"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        """Периодическая пересборка снимка"""
+        while True:
+            retry_after = self._budget.retry_after(JOB, self._identity) if self._budget is not None else 0.0
+            if retry_after > 0:
+                logger.warning("Бюджет запросов в GitLab исчерпан, пересборка снимка отложена на %.0f с", retry_after)
+                await asyncio.sleep(retry_after)
+                continue
+            try:
+                with gitlab_job(JOB):
+                    await self.refresh()
+            except Exception:
+                logger.exception("Не удалось собрать снимок обзора")
+            await asyncio.sleep(self._refresh_interval)
+
+    def _is_over_budget(self) -> bool:
+        """Превысила ли задача `dashboard` бюджет запросов в GitLab"""
+        retry_after = self._budget.retry_after(JOB, self._identity) if self._budget is not None else 0.0
+        if retry_after > 0:
+            logger.warning("Бюджет запросов в GitLab исчерпан, полный обход пользователей отложен")
+        return retry_after > 0
+
+    def _is_full_refresh_due(self) -> bool:
+        """Пора ли выполнить полный обход пользователей"""
+        return (
+            self._users_refreshed_at is None
+            or time.monotonic() - self._users_refreshed_at >= self._full_refresh_interval
+        )
+
+    def _get_inactive_users(self, users: list[ListedUserByAdmin], today: date) -> list[ListedUserByAdmin]:
+        """Неактивные пользователи: сначала те, кто дольше всех без активности (или никогда не был активен)"""
+        threshold = str(today - timedelta(days=self._inactive_days))
+        inactive = [
+            user for user in users
+            if not user.get("bot") and (not user.get("last_activity_on") or str(user["last_activity_on"]) < threshold)
+        ]
+        return sorted(inactive, key=lambda user: str(user.get("last_activity_on") or ""))
+
+    @staticmethod
+    def _project_row(project: Project) -> dict[str, Any]:
+        return {
+            "id": project["id"],
+            "name_with_namespace": project.get("name_with_namespace"),
+            "web_url": project.get("web_url"),
+            "last_activity_at": project.get("last_activity_at"),
+        }
+
+    @staticmethod
+    def _token_row(token: PersonalAccessToken) -> dict[str, Any]:
+        return {"name": token["name"], "user_id": token["user_id"], "expires_at": str(token["expires_at"])}
+
+    @staticmethod
+    def _user_row(user: ListedUserByAdmin) -> dict[str, Any]:
+        return {
+            "username": user["username"],
+            "name": user["name"],
+            "web_url": user["web_url"],
+            "last_activity_on": user.get("last_activity_on") and str(user["last_activity_on"]),
+        }
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class DashboardSnapshot:
+    """Снимок обзора инстанса GitLab для главной страницы
+
+    Снимок неизменяем: сборщик заменяет его целиком, поэтому страница всегда видит согласованные данные.
+
+    Args:
+        updated_at: время сборки снимка (UTC)
+        duration: длительность сборки снимка в секундах
+        groups_count: количество групп (None - GitLab не вернул количество)
+        projects_count: количество репозиториев
+        active_users_count: количество активных пользователей
+        recent_projects: последние активные репозитории
+        expiring_tokens: Personal Access Token, которые скоро истекут (первые по дате истечения)
+        expiring_tokens_count: количество Personal Access Token, которые скоро истекут
+        inactive_users: неактивные пользователи (дольше всех без активности)
+        inactive_users_count: количество неактивных пользователей (None - еще не собрано)
+        users_updated_at: время последнего полного обхода пользователей (UTC)
+    """
+    updated_at: datetime
+    duration: float
+    groups_count: int | None
+    projects_count: int | None
+    active_users_count: int | None
+    recent_projects: tuple[dict[str, Any], ...]
+    expiring_tokens: tuple[dict[str, Any], ...]
+    expiring_tokens_count: int
+    inactive_users: tuple[dict[str, Any], ...] = ()
+    inactive_users_count: int | None = None
+    users_updated_at: datetime | None = None
+
+    def to_context(self) -> dict[str, Any]:
+        """Снимок в виде контекста шаблона (только JSON-совместимые значения, страница кэшируется)"""
+        context = dataclasses.asdict(self)
+        for key, value in context.items():
+            if isinstance(value, datetime):
+                context[key] = value.strftime("%Y-%m-%d %H:%M:%S UTC")
+            elif isinstance(value, tuple):
+                context[key] = list(value)
+        return context
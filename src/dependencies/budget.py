@@ -0,0 +1,13 @@
+from src import config
+from src.app.budget import GitLabBudget
+
+gitlab_budget = GitLabBudget(
+    config.GITLAB_BUDGET_LIMITS,
+    windows=config.GITLAB_BUDGET_WINDOWS,
+    rate_limit_reserve=config.GITLAB_BUDGET_RATE_LIMIT_RESERVE,
+)
+
+
+def get_gitlab_budget() -> GitLabBudget:
+    """Получить учет запросов в GitLab по токенам и задачам"""
+    return gitlab_budget
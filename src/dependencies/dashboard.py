@@ -0,0 +1,21 @@
+from src import config
+from src.dashboard.collector import DashboardCollector
+
+from .budget import gitlab_budget
+from .gitlab import gitlab_connection
+
+dashboard_collector = DashboardCollector(
+    lambda: gitlab_connection.gitlab_http,
+    refresh_interval=config.DASHBOARD_REFRESH_INTERVAL,
+    full_refresh_interval=config.DASHBOARD_FULL_REFRESH_INTERVAL,
+    inactive_days=config.DASHBOARD_INACTIVE_DAYS,
+    expiring_days=config.DASHBOARD_TOKENS_EXPIRING_DAYS,
+    list_limit=config.DASHBOARD_LIST_LIMIT,
+    budget=gitlab_budget,
+    identity=gitlab_connection.identity,
+)
+
+
+def get_dashboard_collector() -> DashboardCollector:
+    """Получить сборщик снимков обзора инстанса"""
+    return dashboard_collector
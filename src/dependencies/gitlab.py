@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from aiohttp import ClientError, ClientSession
+from fastapi import HTTPException
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from src import config
+from src.app.budget import token_fingerprint
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
+logger = logging.getLogger("gitlab-wh.gitlab")
+
+
+class GitLabConnection:
+    """Общая сессия aiohttp для запросов в GitLab
+
+    Сессия (и ее пул соединений) создается один раз при старте приложения и переиспользуется всеми запросами.
+    """
+    def __init__(self, url: str, token: str) -> None:
+        """Конструктор
+
+        Args:
+            url: адрес GitLab, пустая строка - GitLab не настроен
+            token: Personal Access Token для запросов в GitLab API
+        """
+        self._url = url
+        self._token = token
+        self._session: ClientSession | None = None
+
+    @property
+    def identity(self) -> str:
+        """Отпечаток токена для учета запросов (`GitLabBudget`)"""
+        return token_fingerprint(self._token)
+
+    @property
+    def gitlab_http(self) -> GitLabHTTPv4 | None:
+        """Клиент GitLab API или None, если сессия не открыта"""
+        if self._session is None:
+            return None
+        return GitLabHTTPv4(self._session, identity=self.identity)
+
+    def start(self) -> None:
+        """Открыть сессию. Должен вызываться из работающего event loop"""
+        if self._url and self._session is None:
+            self._session = ClientSession(self._url, headers={"PRIVATE-TOKEN": self._token})
+
+    async def close(self) -> None:
+        """Закрыть сессию"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class GitLabHealth(NamedTuple):
+    """Результат проверки доступности GitLab
+
+    available: GitLab доступен
+    checked_at: время проверки (Unix time)
+    duration: длительность проверки в секундах
+    """
+    available: bool
+    checked_at: float
+    duration: float
+
+
+class GitLabHealthProbe:
+    """Проверка доступности GitLab с кэшированием результата
+
+    Результат переиспользуется всеми вызывающими в течение `ttl` секунд, а одновременные вызовы
+    при устаревшем результате ждут одну общую проверку, поэтому частые health check'и не нагружают GitLab.
+    """
+    def __init__(self,
+                 get_gitlab_http: Callable[[], GitLabHTTPv4 | None],
+                 ttl: float = 10.0,
+                 timeout: float = 5.0,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            get_gitlab_http: функция получения клиента GitLab API (None - GitLab не настроен)
+            ttl: время жизни результата проверки в секундах
+            timeout: ограничение времени одной проверки в секундах
+        """
+        self._get_gitlab_http = get_gitlab_http
+        self._ttl = ttl
+        self._timeout = timeout
+        self._health: GitLabHealth | None = None
+        self._expires_at = 0.0
+        self._pending: asyncio.Future[GitLabHealth] | None = None
+
+    async def check(self) -> GitLabHealth | None:
+        """Проверить доступность GitLab (из кэша, если результат не устарел)
+
+        Returns:
+            Результат проверки или None, если GitLab не настроен
+        """
+        gitlab_http = self._get_gitlab_http()
+        if gitlab_http is None:
+            return None
+        if self._health is not None and time.monotonic() < self._expires_at:
+            return self._health
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._probe(gitlab_http))
+            self._pending.add_done_callback(self._on_probe_done)
+        return await asyncio.shield(self._pending)
+
+    async def _probe(self, gitlab_http: GitLabHTTPv4) -> GitLabHealth:
+        """Выполнить проверку доступности GitLab"""
+        start_time = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._timeout):
+                available = await gitlab_http.check()
+        except (ClientError, TimeoutError, ValueError) as exc:
+            # ValueError - ответ не разбирается как JSON (например, страница прокси вместо API)
+            logger.warning("GitLab недоступен: %r", exc)
+            available = False
+        return GitLabHealth(available=available, checked_at=time.time(), duration=time.perf_counter() - start_time)
+
+    def _on_probe_done(self, future: asyncio.Future[GitLabHealth]) -> None:
+        """Сохранить результат проверки в кэш"""
+        self._pending = None
+        if not future.cancelled() and future.exception() is None:
+            self._health = future.result()
+            self._expires_at = time.monotonic() + self._ttl
+
+
+gitlab_connection = GitLabConnection(config.GITLAB_URL, config.GITLAB_TOKEN)
+gitlab_health_probe = GitLabHealthProbe(
+    lambda: gitlab_connection.gitlab_http,
+    ttl=config.GITLAB_HEALTH_TTL,
+    timeout=config.GITLAB_HEALTH_TIMEOUT,
+)
+
+
+def get_gitlab_http() -> GitLabHTTPv4:
+    """Получить клиент GitLab API
+
+    Raises:
+        HTTPException: 503, если GitLab не настроен
+    """
+    gitlab_http = gitlab_connection.gitlab_http
+    if gitlab_http is None:
+        raise HTTPException(HTTP_503_SERVICE_UNAVAILABLE, "GitLab не настроен")
+    return gitlab_http
+
+
+def get_gitlab_health_probe() -> GitLabHealthProbe:
+    """Получить проверку доступности GitLab"""
+    return gitlab_health_probe
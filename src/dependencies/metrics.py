@@ -0,0 +1,8 @@
+from src.app.metrics import AppMetrics
+
+app_metrics = AppMetrics()
+
+
+def get_app_metrics() -> AppMetrics:
+    """Получить метрики приложения"""
+    return app_metrics
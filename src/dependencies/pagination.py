@@ -0,0 +1,26 @@
+from typing import NamedTuple
+
+from fastapi import Query
+
+from src import config
+
+
+class ListParams(NamedTuple):
+    """Параметры постраничного списка
+
+    page: номер страницы (с 1)
+    per_page: количество записей на странице
+    search: строка поиска
+    """
+    page: int
+    per_page: int
+    search: str | None
+
+
+def get_list_params(page: int = Query(1, ge=1, description="Номер страницы"),
+                    per_page: int = Query(config.GITLAB_PAGE_SIZE, ge=1, le=config.GITLAB_MAX_PAGE_SIZE,
+                                          description="Количество записей на странице"),
+                    search: str | None = Query(None, max_length=100, description="Строка поиска"),
+                    ) -> ListParams:
+    """Получить параметры постраничного списка из Query параметров"""
+    return ListParams(page=page, per_page=per_page, search=search or None)
@@ -0,0 +1,43 @@
+import hmac
+from typing import Annotated
+
+from fastapi import Header, HTTPException
+from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
+
+from src import config
+from src.app.loop_monitor import LoopMonitor
+from src.app.profiler import SamplingProfiler
+
+from .metrics import app_metrics
+
+sampling_profiler = SamplingProfiler(interval=config.PROFILE_INTERVAL)
+
+
+loop_monitor = LoopMonitor(
+    app_metrics,
+    interval=config.LOOP_MONITOR_INTERVAL,
+    slow_threshold=config.LOOP_SLOW_CALLBACK_THRESHOLD,
+)
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Получить мониторинг отзывчивости event loop"""
+    return loop_monitor
+
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """Получить профилировщик потока event loop"""
+    return sampling_profiler
+
+
+def verify_service_token(x_service_token: Annotated[str | None, Header()] = None) -> None:
+    """Проверить заголовок `X-Service-Token` для защищенных сервисных методов
+
+    Raises:
+        HTTPException: 403, если токен не настроен (методы отключены), 401 - если токен неверный
+    """
+    if not config.SERVICE_TOKEN:
+        raise HTTPException(HTTP_403_FORBIDDEN, "Сервисный токен не настроен")
+    # compare_digest принимает str только из ASCII символов, заголовок может содержать любые байты
+    if x_service_token is None or not hmac.compare_digest(x_service_token.encode(), config.SERVICE_TOKEN.encode()):
+        raise HTTPException(HTTP_401_UNAUTHORIZED, "Invalid X-Service-Token")
@@ -0,0 +1,42 @@
+from src import config
+from src.webhooks.admission import AdmissionController, Priority
+from src.webhooks.dispatcher import WebhookDispatcher, default_actions
+from src.webhooks.processing import WebhookProcessor
+from src.webhooks.rules import WebhookRuleEngine
+from src.webhooks.secrets import WebhookSecretRegistry
+
+webhook_secret_registry = WebhookSecretRegistry(
+    file_path=config.WEBHOOK_SECRETS_FILE_PATH,
+    reload_interval=config.WEBHOOK_SECRETS_RELOAD_INTERVAL,
+)
+
+webhook_processor = WebhookProcessor(
+    dispatcher=WebhookDispatcher(
+        rule_engine=WebhookRuleEngine.from_file(config.WEBHOOK_RULES_FILE_PATH),
+        actions=default_actions,
+    ),
+    coalesce_key=config.WEBHOOK_COALESCE_KEY,
+    coalesce_window=config.WEBHOOK_COALESCE_WINDOW,
+    coalesce_max_batch=config.WEBHOOK_COALESCE_MAX_BATCH,
+    admission=AdmissionController(
+        max_depth=config.WEBHOOK_QUEUE_MAX_DEPTH,
+        watermarks={
+            Priority.LOW: config.WEBHOOK_QUEUE_LOW_PRIORITY_WATERMARK,
+            Priority.NORMAL: config.WEBHOOK_QUEUE_NORMAL_PRIORITY_WATERMARK,
+        },
+        memory_soft_limit=config.WEBHOOK_MEMORY_SOFT_LIMIT,
+        memory_hard_limit=config.WEBHOOK_MEMORY_HARD_LIMIT,
+        retry_after=config.WEBHOOK_RETRY_AFTER,
+    ),
+    workers=config.WEBHOOK_WORKERS,
+)
+
+
+def get_webhook_secret_registry() -> WebhookSecretRegistry:
+    """Получить реестр секретов вебхуков, общий для всего воркера"""
+    return webhook_secret_registry
+
+
+def get_webhook_processor() -> WebhookProcessor:
+    """Получить конвейер обработки событий вебхуков, общий для всего воркера"""
+    return webhook_processor
@@ -1,22 +1,34 @@
-import logging
+import atexit
+from functools import partial
 
-import colorlog
 from fastapi import FastAPI
 
 from . import config
 from .app import GitLabWH
+from .app.assets import asset_manifest
+from .app.lifespan import lifespan
+from .app.log import setup_logging
+from .app.memory import memory_span, start_memory_tracing
+from .app.timing import observe_http_call
+from .dependencies.budget import gitlab_budget
+from .dependencies.metrics import app_metrics
+from .repository.http_requests.base import BaseHTTP
 from .routers import main_router
 
-handler = logging.StreamHandler()
-handler.setFormatter(
-    colorlog.ColoredFormatter(
-        fmt="%(asctime)s - %(purple)s%(name)s%(reset)s - %(log_color)s%(levelname)s%(reset)s - %(message)s",
-    ),
-)
-logging.basicConfig(level=logging.INFO, handlers=[handler])
+log_listener = setup_logging(json_format=config.LOG_JSON)
+atexit.register(log_listener.stop)
+BaseHTTP.add_observer(app_metrics.observe_http_call)
+BaseHTTP.add_observer(observe_http_call)
+BaseHTTP.add_observer(gitlab_budget.observe_http_call)
+BaseHTTP.add_pagination_tracker(partial(memory_span, "pagination"))
+if config.MEMORY_TRACING:
+    start_memory_tracing(config.MEMORY_TRACING_FRAMES, config.MEMORY_OPERATION_BUDGET)
 
 gitlab_wh = GitLabWH(
     app_type=FastAPI,
     main_router=main_router,
     static_folder_path=config.STATIC_FOLDER_PATH,
+    lifespan=lifespan,
+    asset_manifest=asset_manifest,
+    metrics=app_metrics,
 )
@@ -0,0 +1,29 @@
+from typing import NamedTuple
+
+
+class BrowserColumn(NamedTuple):
+    """Колонка таблицы на странице списка записей GitLab
+
+    title: Заголовок колонки
+    key: Ключ записи GitLab, значение которого выводится в колонке
+    link: Шаблон ссылки для значения (`str.format_map` по полям записи), например `/groups/{id}/members`
+
+    Шаблон: /src/templates/pages/browser/rows.html.j2
+    """
+    title: str
+    key: str
+    link: str | None = None
+
+
+class BrowserPage(NamedTuple):
+    """Параметры страницы списка записей GitLab (проекты, группы, пользователи, токены)
+
+    title: Заголовок страницы
+    columns: Колонки таблицы
+    search_placeholder: Подсказка в поле поиска
+
+    Шаблон: /src/templates/pages/browser/list.html.j2
+    """
+    title: str
+    columns: tuple[BrowserColumn, ...]
+    search_placeholder: str = "Поиск"
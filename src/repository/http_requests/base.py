@@ -1,17 +1,68 @@
 from __future__ import annotations
 
+import re
+import time
 from abc import ABC, abstractmethod
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, NamedTuple, TypeVar
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
+    from contextlib import AbstractContextManager
 
-    from aiohttp import ClientSession
+    from aiohttp import ClientResponse, ClientSession
 
 
 T = TypeVar("T")
 
+_ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def get_endpoint_template(url: str) -> str:
+    """Шаблон адреса без идентификаторов: `/api/v4/groups/5/members` -> `/api/v4/groups/{id}/members`"""
+    return _ID_SEGMENT_RE.sub("/{id}", url)
+
+
+def _get_int_header(headers: Mapping[str, str], name: str) -> int | None:
+    """Целочисленный заголовок ответа или None, если его нет"""
+    value = headers.get(name)
+    return int(value) if value and value.isdigit() else None
+
+
+class HTTPCall(NamedTuple):
+    """Исходящий HTTP запрос BaseHTTP (передается наблюдателям `BaseHTTP.observers`)
+
+    Args:
+        method: HTTP метод
+        url: URL-адрес запроса
+        status_code: статус код HTTP ответа
+        duration: длительность запроса в секундах (включая чтение и декодирование тела)
+        decode_duration: длительность декодирования JSON в секундах
+        size: размер тела ответа в байтах
+        page: номер страницы для постраничных запросов, None - запрос не постраничный
+        identity: идентификатор учетных данных клиента (например, отпечаток токена), пустая строка - неизвестен
+        rate_limit: лимит запросов учетных данных (заголовок `RateLimit-Limit`), None - не передан
+        rate_limit_remaining: остаток лимита запросов (заголовок `RateLimit-Remaining`), None - не передан
+        rate_limit_reset: время восстановления лимита (заголовок `RateLimit-Reset`, Unix time), None - не передано
+    """
+    method: str
+    url: str
+    status_code: int
+    duration: float
+    decode_duration: float
+    size: int
+    page: int | None = None
+    identity: str = ""
+    rate_limit: int | None = None
+    rate_limit_remaining: int | None = None
+    rate_limit_reset: int | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """Шаблон адреса запроса (без идентификаторов)"""
+        return get_endpoint_template(self.url)
+
 
 @dataclass
 class ResponseModel(Generic[T]):
@@ -27,11 +78,118 @@ class ResponseModel(Generic[T]):
     headers: Mapping[str, str]
 
 
+@dataclass
+class PageModel(Generic[T]):
+    """Одна страница списка записей
+
+    Args:
+        items: записи страницы
+        page: номер страницы (с 1)
+        per_page: максимальное количество записей на странице
+        next_page: номер следующей страницы, None - страница последняя
+        total: общее количество записей, None - неизвестно (например, GitLab не считает его для больших списков)
+    """
+    items: list[T]
+    page: int
+    per_page: int
+    next_page: int | None
+    total: int | None = None
+
+
 class BaseHTTP(ABC):
-    """Базовый класс для реализации HTTP запросов"""
-    def __init__(self, session: ClientSession) -> None:
-        """Конструктор"""
+    """Базовый класс для реализации HTTP запросов
+
+    Каждый запрос передается наблюдателям из `observers` (метрики, трассировка). Наблюдатели вызываются
+    синхронно в event loop, поэтому должны быть быстрыми и не бросать исключений.
+    Каждый постраничный запрос выполняется внутри контекстных менеджеров из `pagination_trackers` (учет памяти),
+    которые получают URL-адрес запроса.
+    """
+    observers: ClassVar[list[Callable[[HTTPCall], None]]] = []
+    pagination_trackers: ClassVar[list[Callable[[str], AbstractContextManager[object]]]] = []
+
+    def __init__(self, session: ClientSession, identity: str = "") -> None:
+        """Конструктор
+
+        Args:
+            session: сессия aiohttp
+            identity: идентификатор учетных данных сессии для учета запросов (не сам токен)
+        """
         self._session = session
+        self._identity = identity
+
+    @classmethod
+    def add_observer(cls, observer: Callable[[HTTPCall], None]) -> None:
+        """Добавить наблюдателя исходящих запросов
+
+        Args:
+            observer: функция, которая получает каждый выполненный запрос
+        """
+        if observer not in cls.observers:
+            cls.observers.append(observer)
+
+    @classmethod
+    def remove_observer(cls, observer: Callable[[HTTPCall], None]) -> None:
+        """Удалить наблюдателя исходящих запросов"""
+        if observer in cls.observers:
+            cls.observers.remove(observer)
+
+    @classmethod
+    def add_pagination_tracker(cls, tracker: Callable[[str], AbstractContextManager[object]]) -> None:
+        """Добавить обертку постраничных запросов
+
+        Args:
+            tracker: функция, которая по URL-адресу запроса возвращает контекстный менеджер
+        """
+        if tracker not in cls.pagination_trackers:
+            cls.pagination_trackers.append(tracker)
+
+    @classmethod
+    def remove_pagination_tracker(cls, tracker: Callable[[str], AbstractContextManager[object]]) -> None:
+        """Удалить обертку постраничных запросов"""
+        if tracker in cls.pagination_trackers:
+            cls.pagination_trackers.remove(tracker)
+
+    async def _read_response(self,
+                             method: str,
+                             url: str,
+                             params: Mapping[str, Any] | None,
+                             response: ClientResponse,
+                             start_time: float,
+                             ) -> ResponseModel[Any]:
+        """Прочитать тело ответа и сообщить о запросе наблюдателям
+
+        Args:
+            method: HTTP метод
+            url: URL-адрес запроса
+            params: Query параметры запроса
+            response: ответ aiohttp
+            start_time: время начала запроса (`time.perf_counter`)
+
+        Returns:
+            Результат запроса
+        """
+        body = await response.read()
+        decode_start_time = time.perf_counter()
+        data = await response.json()
+        end_time = time.perf_counter()
+        if self.observers:
+            page = params.get("page") if params else None
+            call = HTTPCall(
+                method=method,
+                url=url,
+                status_code=response.status,
+                duration=end_time - start_time,
+                decode_duration=end_time - decode_start_time,
+                size=len(body),
+                page=int(page) if page is not None else None,
+                identity=self._identity,
+                rate_limit=_get_int_header(response.headers, "RateLimit-Limit"),
+                rate_limit_remaining=_get_int_header(response.headers, "RateLimit-Remaining"),
+                rate_limit_reset=_get_int_header(response.headers, "RateLimit-Reset"),
+            )
+            for observer in self.observers:
+                observer(call)
+        return ResponseModel(data=data, status_code=response.status, headers=response.headers)
 
     @abstractmethod
     async def _by_pagination(self,
@@ -66,12 +224,9 @@ class BaseHTTP(ABC):
         Returns:
             Результат GET запроса
         """
+        start_time = time.perf_counter()
         async with self._session.get(url, params=params, headers=headers) as response:
-            return ResponseModel(
-                data=await response.json(),
-                status_code=response.status,
-                headers=response.headers,
-            )
+            return await self._read_response("GET", url, params, response, start_time)
 
     async def _get(self,
                    url: str,
@@ -93,7 +248,12 @@ class BaseHTTP(ABC):
         """
         params = params and {key: value for key, value in params.items() if value is not None}
         if by_pagination:
-            return await self._by_pagination(url, params, headers)
+            if not self.pagination_trackers:
+                return await self._by_pagination(url, params, headers)
+            with ExitStack() as stack:
+                for tracker in self.pagination_trackers:
+                    stack.enter_context(tracker(url))
+                return await self._by_pagination(url, params, headers)
         return await self._get_one(url, params, headers)
 
     async def _post(self,
@@ -111,12 +271,9 @@ class BaseHTTP(ABC):
         Returns:
             Результат POST запроса
         """
+        start_time = time.perf_counter()
         async with self._session.post(url, json=data, headers=headers) as response:
-            return ResponseModel(
-                data=await response.json(),
-                status_code=response.status,
-                headers=response.headers,
-            )
+            return await self._read_response("POST", url, None, response, start_time)
 
     async def _put(self,
                    url: str,
@@ -133,12 +290,9 @@ class BaseHTTP(ABC):
         Returns:
             Результат PUT запроса
         """
+        start_time = time.perf_counter()
         async with self._session.put(url, json=data, headers=headers) as response:
-            return ResponseModel(
-                data=await response.json(),
-                status_code=response.status,
-                headers=response.headers,
-            )
+            return await self._read_response("PUT", url, None, response, start_time)
 
     async def _patch(self,
                      url: str,
@@ -155,12 +309,9 @@ class BaseHTTP(ABC):
         Returns:
             Результат PATCH запроса
         """
+        start_time = time.perf_counter()
         async with self._session.patch(url, json=data, headers=headers) as response:
-            return ResponseModel(
-                data=await response.json(),
-                status_code=response.status,
-                headers=response.headers,
-            )
+            return await self._read_response("PATCH", url, None, response, start_time)
 
     async def _delete(self,
                       url: str,
@@ -177,9 +328,6 @@ class BaseHTTP(ABC):
         Returns:
             Результат DELETE запроса
         """
+        start_time = time.perf_counter()
         async with self._session.delete(url, params=params, headers=headers) as response:
-            return ResponseModel(
-                data=await response.json(),
-                status_code=response.status,
-                headers=response.headers,
-            )
+            return await self._read_response("DELETE", url, params, response, start_time)
@@ -1,3 +1,4 @@
+import json
 from types import TracebackType
 from typing import Any, Generic, TypeVar
 
@@ -35,6 +36,10 @@ class FakeResponse(Generic[T]):
                         ) -> None:
         """Mock реализация __aexit__"""
 
+    async def read(self) -> bytes:
+        """Mock реализация await *.read"""
+        return json.dumps(self.data).encode()
+
     async def json(self) -> T | None:
         """Mock реализация await *.json"""
         return self.data
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 from datetime import date, timedelta
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
-from .base import BaseHTTP, ResponseModel
+from .base import BaseHTTP, PageModel, ResponseModel
 
 if TYPE_CHECKING:
     from src.types import Sort, State
@@ -22,7 +23,9 @@ if TYPE_CHECKING:
         GetCurrentUserByAdmin,
         GetUser,
         GetUserByAdmin,
+        ListedUserByAdmin,
         MemberUser,
+        UsersOrderBy,
     )
 
 
@@ -30,6 +33,10 @@ class GitLabError(Exception):
     """Базовый exception для GitLabHTTP"""
 
 
+class GitLabNotFoundError(GitLabError):
+    """GitLab ответил 404: запрошенного объекта нет или к нему нет доступа"""
+
+
 class GitLabHTTPv4(BaseHTTP):
     """Запросы в GitLab API"""
     URL_ADD_USER_TO_GROUP = "/api/v4/groups/{group_id}/members"
@@ -53,7 +60,7 @@ class GitLabHTTPv4(BaseHTTP):
                                  headers: dict[str, Any] | None = None,
                                  *,
                                  page: int,
-                                 ) -> list[dict[str, Any]]:
+                                 ) -> ResponseModel[list[dict[str, Any]]]:
         """GET запрос для пагинации с использованием offset'ов
 
         GitLab offset-based pagination - https://docs.gitlab.com/ee/api/rest/index.html#offset-based-pagination
@@ -65,12 +72,14 @@ class GitLabHTTPv4(BaseHTTP):
             page: номер следующей возвращаемой страницы
 
         Returns:
-            Тело ответа на один GET запрос
+            Результат одного GET запроса
         """
-        params["page"] = page
-        async with self._session.get(url, params=params, headers=headers) as response:
-            res: list[dict[str, Any]] = await response.json()
-            return res
+        return await self._get_one(url, {**params, "page": page}, headers)
+
+    @staticmethod
+    def _is_page(response: ResponseModel[Any]) -> bool:
+        """Успешный ответ со страницей записей (а не тело ошибки)"""
+        return response.status_code == HTTPStatus.OK and isinstance(response.data, list)
 
     async def _by_pagination(self,
                              url: str,
@@ -89,31 +98,98 @@ class GitLabHTTPv4(BaseHTTP):
         Returns:
             Агрегированный результат множества GET запросов (агрегация пагинаций),
             где статус код и заголовки будут от самого 1-го запроса в пачке
+
+        Raises:
+            GitLabError: хотя бы одна страница не получена (не 200 или тело ответа не список)
         """
         params = params or {}
         params["per_page"] = 100
         params["page"] = 1
 
         first_response = await self._get_one(url, params, headers)
+        if not self._is_page(first_response):
+            raise GitLabError(first_response.data)
+
+        total_pages = first_response.headers.get("X-Total-Pages")
+        if total_pages is not None:
+            responses = await asyncio.gather(*(
+                self._offset_pagination(url, params, headers, page=page) for page in range(2, int(total_pages) + 1)
+            ))
+            # Тело ошибки (dict) нельзя склеивать со страницами: chain вставил бы в результат его ключи
+            failed_response = next((response for response in responses if not self._is_page(response)), None)
+            if failed_response is not None:
+                raise GitLabError(failed_response.data)
+        else:
+            # Для списков больше 10 000 записей GitLab не возвращает X-Total-Pages: страницы запрашиваются
+            # последовательно по X-Next-Page
+            responses = []
+            next_page = first_response.headers.get("X-Next-Page")
+            while next_page:
+                response = await self._get_one(url, {**params, "page": int(next_page)}, headers)
+                if not self._is_page(response):
+                    raise GitLabError(response.data)
+                responses.append(response)
+                next_page = response.headers.get("X-Next-Page")
 
-        total_pages = first_response.headers["X-Total-Pages"]
-        tasks = [self._offset_pagination(url, params, headers, page=page) for page in range(2, int(total_pages) + 1)]
-        results = await asyncio.gather(*tasks)
         return ResponseModel(
-            data=sum(results, first_response.data),
+            data=list(itertools.chain(first_response.data, *(response.data for response in responses))),
             status_code=first_response.status_code,
             headers=first_response.headers,
         )
 
+    async def _get_page(self,
+                        url: str,
+                        params: dict[str, Any] | None = None,
+                        headers: dict[str, Any] | None = None,
+                        *,
+                        page: int,
+                        per_page: int,
+                        ) -> PageModel[Any]:
+        """Получение одной страницы записей (один GET запрос)
+
+        GitLab offset-based pagination - https://docs.gitlab.com/ee/api/rest/index.html#offset-based-pagination
+
+        Args:
+            url: URL-адрес для GET запроса
+            params: словарь ключей и их значений для GET запроса
+            headers: заголовки для GET запроса
+            page: номер страницы (с 1)
+            per_page: количество записей на странице (GitLab ограничивает его 100)
+
+        Returns:
+            Страница записей
+
+        Raises:
+            GitLabNotFoundError: GitLab ответил 404
+            GitLabError: GitLab ответил другой ошибкой
+        """
+        params = {**(params or {}), "page": page, "per_page": per_page}
+        response: ResponseModel[list[Any]] = await self._get(url, params, headers)
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            raise GitLabNotFoundError(response.data)
+        if response.status_code != HTTPStatus.OK:
+            raise GitLabError(response.data)
+
+        next_page = response.headers.get("X-Next-Page")
+        total = response.headers.get("X-Total")
+        return PageModel(
+            items=response.data,
+            page=page,
+            per_page=per_page,
+            next_page=int(next_page) if next_page else None,
+            total=int(total) if total else None,
+        )
+
     async def check(self) -> bool:
         """Проверка доступности GitLab API
 
         List all projects - https://docs.gitlab.com/ee/api/projects.html#list-all-projects
+        Запрашивается один репозиторий в сокращенном виде (`simple`), чтобы не нагружать GitLab
 
         Returns:
             True - GitLab доступен, False - GitLab недоступен
         """
-        response = await self._get(self.URL_PING)
+        response = await self._get(self.URL_PING, {"per_page": 1, "simple": "true"})
         return response.status_code == HTTPStatus.OK and isinstance(response.data, list)
 
     async def add_user_to_group(self,
@@ -386,6 +462,7 @@ class GitLabHTTPv4(BaseHTTP):
                                           search: str | None = None,
                                           revoked: bool | None = None,
                                           state: State | None = None,
+                                          expires_before: date | None = None,
                                           ) -> list[PersonalAccessToken]:
         """Получения списка всех Personal Access Token для пользователя
 
@@ -396,6 +473,7 @@ class GitLabHTTPv4(BaseHTTP):
             search: поле для фильтрации токена доступа (судя по всему фильтр используется по имени токена)
             revoked: True - найти только отозванные токены, False - найти все действующие токены
             state: состояние токена (активен или неактивен)
+            expires_before: найти только токены, которые истекают раньше этой даты
 
         Returns:
             Список объектов Personal Access Token для пользователя
@@ -404,6 +482,7 @@ class GitLabHTTPv4(BaseHTTP):
             "search": search,
             "revoked": revoked,
             "state": state,
+            "expires_before": expires_before and str(expires_before),
         }
         response: ResponseModel[list[PersonalAccessToken]] = await self._get(self.URL_ALL_PERSONAL_ACCESS_TOKEN,
                                                                              params,
@@ -463,6 +542,55 @@ class GitLabHTTPv4(BaseHTTP):
             }
         raise GitLabError(response.data)
 
+    async def list_users(self,
+                         *,
+                         active: bool = False,
+                         without_project_bots: bool = True,
+                         order_by: UsersOrderBy = "id",
+                         sort: Sort = "asc",
+                         ) -> list[ListedUserByAdmin]:
+        """Получение списка всех пользователей (для администратора)
+
+        List users - https://docs.gitlab.com/ee/api/users.html#for-administrators
+
+        Args:
+            active: True - только активные пользователи
+            without_project_bots: True - без ботов репозиториев и групп (Project/Group Access Token)
+            order_by: признак, по которому будут отсортированы пользователи
+            sort: сортировка по полю order_by должна быть asc или desc
+
+        Returns:
+            Список объектов пользователя
+        """
+        params = {
+            "active": "true" if active else None,
+            "without_project_bots": "true" if without_project_bots else None,
+            "order_by": order_by,
+            "sort": sort,
+        }
+        response: ResponseModel[list[ListedUserByAdmin]] = await self._get(self.URL_USERS, params,
+                                                                           by_pagination=True)
+        if response.status_code == HTTPStatus.OK:
+            return response.data
+        raise GitLabError(response.data)
+
+    async def count_users(self, *, active: bool = False, without_project_bots: bool = True) -> int | None:
+        """Получение количества пользователей (один запрос с per_page=1, по заголовку X-Total)
+
+        Args:
+            active: True - только активные пользователи
+            without_project_bots: True - без ботов репозиториев и групп
+
+        Returns:
+            Количество пользователей или None, если GitLab его не вернул (больше 10 000 записей)
+        """
+        params = {
+            "active": "true" if active else None,
+            "without_project_bots": "true" if without_project_bots else None,
+        }
+        page = await self._get_page(self.URL_USERS, params, page=1, per_page=1)
+        return page.total
+
     async def list_groups(self,
                           *,
                           search: str | None = None,
@@ -516,6 +644,137 @@ class GitLabHTTPv4(BaseHTTP):
             return response.data
         raise GitLabError(response.data)
 
+    async def list_groups_page(self,
+                               *,
+                               page: int = 1,
+                               per_page: int = 20,
+                               search: str | None = None,
+                               order_by: GroupsOrderBy = "name",
+                               sort: Sort = "asc",
+                               min_access_level: AccessLevel = 10,
+                               ) -> PageModel[Group]:
+        """Получение одной страницы доступных групп
+
+        List groups - https://docs.gitlab.com/ee/api/groups.html#list-groups
+
+        Args:
+            page: номер страницы (с 1)
+            per_page: количество групп на странице
+            search: поле для фильтрации групп (судя по всему фильтр используется по имени групп)
+            order_by: признак, по которому будут отсортированы группы
+            sort: сортировка по полю order_by должна быть asc или desc
+            min_access_level: уровень доступа
+
+        Returns:
+            Страница объектов группы
+        """
+        params = {
+            "search": search,
+            "order_by": order_by,
+            "sort": sort,
+            "min_access_level": min_access_level,
+        }
+        return await self._get_page(self.URL_GROUPS, params, page=page, per_page=per_page)
+
+    async def list_projects_page(self,
+                                 *,
+                                 page: int = 1,
+                                 per_page: int = 20,
+                                 search: str | None = None,
+                                 order_by: ProjectsOrderBy = "created_at",
+                                 sort: Sort = "desc",
+                                 ) -> PageModel[Project]:
+        """Получение одной страницы доступных репозиториев
+
+        List all projects - https://docs.gitlab.com/ee/api/projects.html#list-all-projects
+
+        Args:
+            page: номер страницы (с 1)
+            per_page: количество репозиториев на странице
+            search: поле для фильтрации репозиториев по имени
+            order_by: признак, по которому будут отсортированы репозитории
+            sort: сортировка по полю order_by должна быть asc или desc
+
+        Returns:
+            Страница объектов репозитория
+        """
+        params = {"search": search, "order_by": order_by, "sort": sort, "simple": "true"}
+        return await self._get_page(self.URL_PROJECTS, params, page=page, per_page=per_page)
+
+    async def list_group_members_page(self,
+                                      group_id: int,
+                                      *,
+                                      page: int = 1,
+                                      per_page: int = 20,
+                                      query: str | None = None,
+                                      ) -> PageModel[MemberUser]:
+        """Получение одной страницы членов группы
+
+        List all members of a group or project -
+            https://docs.gitlab.com/ee/api/members.html#list-all-members-of-a-group-or-project
+
+        Args:
+            group_id: идентификатор группы
+            page: номер страницы (с 1)
+            per_page: количество пользователей на странице
+            query: фильтр пользователей по name, email, username
+
+        Returns:
+            Страница членов группы
+        """
+        url = self.URL_GROUP_MEMBERS.format(group_id=group_id)
+        return await self._get_page(url, {"query": query}, page=page, per_page=per_page)
+
+    async def list_project_members_page(self,
+                                        project_id: int,
+                                        *,
+                                        page: int = 1,
+                                        per_page: int = 20,
+                                        query: str | None = None,
+                                        ) -> PageModel[MemberUser]:
+        """Получение одной страницы членов репозитория
+
+        List all members of a group or project -
+            https://docs.gitlab.com/ee/api/members.html#list-all-members-of-a-group-or-project
+
+        Args:
+            project_id: идентификатор репозитория
+            page: номер страницы (с 1)
+            per_page: количество пользователей на странице
+            query: фильтр пользователей по name, email, username
+
+        Returns:
+            Страница членов репозитория
+        """
+        url = self.URL_PROJECT_MEMBERS.format(project_id=project_id)
+        return await self._get_page(url, {"query": query}, page=page, per_page=per_page)
+
+    async def list_personal_access_tokens_page(self,
+                                               *,
+                                               page: int = 1,
+                                               per_page: int = 20,
+                                               search: str | None = None,
+                                               revoked: bool | None = None,
+                                               state: State | None = None,
+                                               ) -> PageModel[PersonalAccessToken]:
+        """Получение одной страницы Personal Access Token
+
+        List personal access tokens -
+            https://docs.gitlab.com/ee/api/personal_access_tokens.html#list-personal-access-tokens
+
+        Args:
+            page: номер страницы (с 1)
+            per_page: количество токенов на странице
+            search: поле для фильтрации токена доступа (судя по всему фильтр используется по имени токена)
+            revoked: True - найти только отозванные токены, False - найти все действующие токены
+            state: состояние токена (активен или неактивен)
+
+        Returns:
+            Страница объектов Personal Access Token
+        """
+        params = {"search": search, "revoked": None if revoked is None else str(revoked).lower(), "state": state}
+        return await self._get_page(self.URL_ALL_PERSONAL_ACCESS_TOKEN, params, page=page, per_page=per_page)
+
     async def list_group_members(self,
                                  group_id: int,
                                  *,
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
 from .service import service_router
+from .webhooks import webhooks_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(service_router)
+api_router.include_router(webhooks_router)
@@ -1,5 +1,18 @@
-from fastapi import APIRouter
-from fastapi.responses import PlainTextResponse
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from src import config
+from src.app.budget import GitLabBudget
+from src.app.loop_monitor import LoopMonitor
+from src.app.memory import MemoryTracingDisabledError, memory_stats, top_allocations
+from src.app.metrics import CONTENT_TYPE, AppMetrics
+from src.app.profiler import ProfileBusyError, SamplingProfiler
+from src.dependencies.budget import get_gitlab_budget
+from src.dependencies.gitlab import GitLabHealthProbe, get_gitlab_health_probe
+from src.dependencies.metrics import get_app_metrics
+from src.dependencies.service import get_loop_monitor, get_sampling_profiler, verify_service_token
 
 service_router = APIRouter(prefix="/service", tags=["api.service"])
 
@@ -11,3 +24,103 @@ async def ping() -> PlainTextResponse:
     Должен отвечать `pong` при доступности и работоспособности приложения
     """
     return PlainTextResponse("pong")
+
+
+@service_router.get("/ping/deep", summary="Проверка доступности API и GitLab")
+async def ping_deep(probe: Annotated[GitLabHealthProbe, Depends(get_gitlab_health_probe)]) -> JSONResponse:
+    """Метод проверки доступности приложения и GitLab
+
+    Результат проверки GitLab кэшируется на `config.GITLAB_HEALTH_TTL` секунд и общий для всех запросов.
+    Отвечает 503, если GitLab настроен, но недоступен
+    """
+    health = await probe.check()
+    if health is None:
+        return JSONResponse({"status": "pong", "gitlab": None})
+    return JSONResponse(
+        {
+            "status": "pong" if health.available else "gitlab unavailable",
+            "gitlab": {
+                "available": health.available,
+                "checked_at": health.checked_at,
+                "duration_ms": round(health.duration * 1_000, 1),
+            },
+        },
+        status_code=status.HTTP_200_OK if health.available else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@service_router.get("/metrics", summary="Метрики приложения (Prometheus)")
+async def metrics(app_metrics: Annotated[AppMetrics, Depends(get_app_metrics)]) -> PlainTextResponse:
+    """Метрики приложения в текстовом формате Prometheus
+
+    Гистограммы длительности входящих запросов (по шаблону маршрута) и исходящих запросов в GitLab
+    """
+    return PlainTextResponse(app_metrics.render(), media_type=CONTENT_TYPE)
+
+
+@service_router.get("/budget",
+                    summary="Использование GitLab API по токенам и задачам",
+                    dependencies=[Depends(verify_service_token)])
+async def budget_usage(budget: Annotated[GitLabBudget, Depends(get_gitlab_budget)]) -> JSONResponse:
+    """Запросы и байты в скользящих окнах, остаток лимита GitLab и задержка фоновых задач по токенам и задачам
+
+    Требует заголовок `X-Service-Token`. Токены представлены отпечатками
+    """
+    return JSONResponse(budget.usage())
+
+
+@service_router.get("/loop",
+                    summary="Отзывчивость event loop",
+                    dependencies=[Depends(verify_service_token)])
+async def loop_stats(loop_monitor: Annotated[LoopMonitor, Depends(get_loop_monitor)]) -> JSONResponse:
+    """Lag event loop и долгие блокировки (со стеком последней) рабочего процесса
+
+    Требует заголовок `X-Service-Token`
+    """
+    return JSONResponse(loop_monitor.stats())
+
+
+@service_router.get("/memory",
+                    summary="Память процесса и пики операций",
+                    dependencies=[Depends(verify_service_token)])
+async def memory(limit: Annotated[int, Query(gt=0, le=100)] = 20,
+                 key_type: Annotated[Literal["lineno", "filename", "traceback"], Query(alias="key")] = "lineno",
+                 ) -> JSONResponse:
+    """Пики памяти постраничных запросов в GitLab и рендеринга шаблонов и снимок мест аллокаций (tracemalloc)
+
+    Требует заголовок `X-Service-Token`. Отвечает 409, если учет памяти не включен (`GITLAB_WH_MEMORY_TRACING=1`).
+    `limit` - количество мест аллокаций в снимке, `key` - группировка мест: строка, файл или стек
+    """
+    try:
+        top = top_allocations(limit, key_type)
+    except MemoryTracingDisabledError as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Учет памяти не включен") from exc
+    return JSONResponse({**memory_stats(), "top": top})
+
+
+@service_router.get("/profile",
+                    summary="Профилирование потока event loop",
+                    dependencies=[Depends(verify_service_token)])
+async def profile(profiler: Annotated[SamplingProfiler, Depends(get_sampling_profiler)],
+                  seconds: Annotated[float, Query(gt=0, le=config.PROFILE_MAX_SECONDS)] = 10,
+                  response_format: Annotated[Literal["json", "collapsed"], Query(alias="format")] = "json",
+                  ) -> Response:
+    """Статистическое профилирование потока event loop рабочего процесса в течение `seconds` секунд
+
+    Требует заголовок `X-Service-Token`. `format=collapsed` - только стеки в формате collapsed stacks
+    (для `flamegraph.pl` или speedscope), `format=json` - стеки и выборка asyncio задач по месту ожидания
+    """
+    try:
+        result = await profiler.profile(seconds)
+    except ProfileBusyError as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Профилирование уже выполняется") from exc
+
+    if response_format == "collapsed":
+        return PlainTextResponse(result.collapsed())
+    return JSONResponse({
+        "seconds": result.seconds,
+        "interval": result.interval,
+        "samples": result.samples,
+        "stacks": result.collapsed(),
+        "tasks": [{"task": task, "samples": count} for task, count in result.tasks.most_common()],
+    })
@@ -0,0 +1,60 @@
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from src.dependencies.webhooks import get_webhook_processor, get_webhook_secret_registry
+from src.webhooks.admission import AdmissionDecision
+from src.webhooks.events import WebhookEvent
+from src.webhooks.processing import WebhookProcessor
+from src.webhooks.secrets import WebhookSecretRegistry
+
+webhooks_router = APIRouter(prefix="/webhooks", tags=["api.webhooks"])
+
+SecretRegistryDep = Annotated[WebhookSecretRegistry, Depends(get_webhook_secret_registry)]
+ProcessorDep = Annotated[WebhookProcessor, Depends(get_webhook_processor)]
+
+
+@webhooks_router.post("/{hook_key}", status_code=status.HTTP_202_ACCEPTED, summary="Прием вебхука GitLab")
+async def receive_webhook(hook_key: str,
+                          request: Request,
+                          secret_registry: SecretRegistryDep,
+                          processor: ProcessorDep,
+                          x_gitlab_token: Annotated[str | None, Header()] = None,
+                          ) -> JSONResponse:
+    """Прием вебхука GitLab
+
+    Секрет хука ищется по `hook_key` из URL и сравнивается с заголовком `X-Gitlab-Token`.
+    Событие передается в конвейер обработки (объединение всплесков, действия по правилам)
+    и выполняется в фоне, чтобы GitLab не ждал завершения действий.
+    При перегрузке событие не принимается: ответ 429/503 с `Retry-After`, и GitLab повторит доставку позже.
+    Контроль приема проверяется до чтения тела, чтобы при перегрузке не разбирать JSON
+    """
+    if not secret_registry.verify(hook_key, x_gitlab_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid X-Gitlab-Token")
+
+    decision = processor.admission.check(processor.depth)
+    if not decision.accepted:
+        return _rejected(decision)
+
+    try:
+        payload: Any = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload") from exc
+
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
+
+    decision = processor.submit(WebhookEvent.from_payload(hook_key, payload))
+    if not decision.accepted:
+        return _rejected(decision)
+    return JSONResponse({"status": "accepted"}, status_code=status.HTTP_202_ACCEPTED)
+
+
+def _rejected(decision: AdmissionDecision) -> JSONResponse:
+    """Ответ на непринятое событие"""
+    return JSONResponse(
+        {"status": "rejected"},
+        status_code=decision.status_code,
+        headers={"Retry-After": str(decision.retry_after)},
+    )
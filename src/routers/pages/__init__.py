@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from .browser import browser_router
 from .index import index_router
 from .users import users_router
 
 pages_router = APIRouter()
 pages_router.include_router(index_router)
 pages_router.include_router(users_router)
+pages_router.include_router(browser_router)
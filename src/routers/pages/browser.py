@@ -0,0 +1,202 @@
+from collections.abc import Awaitable
+from typing import Annotated, Any
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from fastapi.responses import HTMLResponse
+from starlette.status import HTTP_404_NOT_FOUND, HTTP_502_BAD_GATEWAY
+
+from src.app.templates import CommonTemplateResponseGenerator
+from src.dependencies.gitlab import get_gitlab_http
+from src.dependencies.pagination import ListParams, get_list_params
+from src.dependencies.service import verify_service_token
+from src.dependencies.templates import get_common_trg_prefill_path
+from src.models.pages.browser import BrowserColumn, BrowserPage
+from src.repository.http_requests.base import PageModel
+from src.repository.http_requests.gitlab import GitLabError, GitLabHTTPv4, GitLabNotFoundError
+
+browser_router = APIRouter(tags=["pages.browser"], default_response_class=HTMLResponse)
+
+GetTRGDep = Annotated[CommonTemplateResponseGenerator, Depends(get_common_trg_prefill_path("pages/browser"))]
+GitLabHTTPDep = Annotated[GitLabHTTPv4, Depends(get_gitlab_http)]
+ListParamsDep = Annotated[ListParams, Depends(get_list_params)]
+
+PROJECTS_PAGE = BrowserPage(
+    title="Репозитории",
+    columns=(
+        BrowserColumn("Репозиторий", "name_with_namespace", link="/projects/{id}/members"),
+        BrowserColumn("Ветка по умолчанию", "default_branch"),
+        BrowserColumn("Последняя активность", "last_activity_at"),
+    ),
+)
+GROUPS_PAGE = BrowserPage(
+    title="Группы",
+    columns=(
+        BrowserColumn("Группа", "full_path", link="/groups/{id}/members"),
+        BrowserColumn("Название", "name"),
+        BrowserColumn("Видимость", "visibility"),
+    ),
+)
+MEMBERS_PAGE = BrowserPage(
+    title="Пользователи",
+    columns=(
+        BrowserColumn("Имя пользователя", "username"),
+        BrowserColumn("Имя", "name"),
+        BrowserColumn("Уровень доступа", "access_level"),
+        BrowserColumn("Состояние", "state"),
+        BrowserColumn("Истекает", "expires_at"),
+    ),
+    search_placeholder="Имя, email или username",
+)
+TOKENS_PAGE = BrowserPage(
+    title="Токены",
+    columns=(
+        BrowserColumn("Название", "name"),
+        BrowserColumn("Пользователь", "user_id"),
+        BrowserColumn("Права", "scopes"),
+        BrowserColumn("Активен", "active"),
+        BrowserColumn("Истекает", "expires_at"),
+    ),
+)
+
+
+async def fetch_page(request: Awaitable[PageModel[Any]]) -> PageModel[Any]:
+    """Получить страницу записей из GitLab
+
+    Raises:
+        HTTPException: 404, если GitLab не нашел объект (группу, репозиторий), 502 - при другой ошибке GitLab
+    """
+    try:
+        return await request
+    except GitLabNotFoundError as exc:
+        raise HTTPException(HTTP_404_NOT_FOUND, "Не найдено в GitLab") from exc
+    except GitLabError as exc:
+        raise HTTPException(HTTP_502_BAD_GATEWAY, "GitLab вернул ошибку") from exc
+
+
+def render_browser_page(get_trg: CommonTemplateResponseGenerator,
+                        request: Request,
+                        browser: BrowserPage,
+                        page: PageModel[Any],
+                        params: ListParams,
+                        ) -> Response:
+    """Сгенерировать страницу списка или HTML фрагмент со строками следующей страницы
+
+    Запросы к `<путь страницы>/rows` возвращают только строки таблицы (для бесконечной прокрутки),
+    остальные - страницу целиком. В обоих случаях рендерится только одна страница записей.
+    Страница целиком отправляется потоком: `<head>` уходит клиенту до рендеринга строк таблицы,
+    и браузер начинает загружать стили раньше.
+
+    Args:
+        get_trg: генератор ответа
+        request: контекст запроса
+        browser: параметры страницы списка
+        page: страница записей из GitLab
+        params: параметры постраничного списка
+
+    Returns:
+        Страница списка или HTML фрагмент
+    """
+    page_path = request.url.path.removesuffix("/rows")
+    context: dict[str, Any] = {
+        "browser": browser,
+        "columns": browser.columns,
+        "items": page.items,
+        "total": page.total,
+        "search": params.search,
+        "next_rows_url": None,
+        "next_page_url": None,
+    }
+    if page.next_page is not None:
+        query: dict[str, int | str] = {"page": page.next_page, "per_page": params.per_page}
+        if params.search:
+            query["search"] = params.search
+        context["next_rows_url"] = f"{page_path}/rows?{urlencode(query)}"
+        context["next_page_url"] = f"{page_path}?{urlencode(query)}"
+
+    if request.url.path.endswith("/rows"):
+        return get_trg.generate_response("rows.html.j2", context, preload=False)
+    return get_trg.generate_streaming_response("list.html.j2", context)
+
+
+@browser_router.get("/projects", summary="Список репозиториев")
+@browser_router.get("/projects/rows", summary="Строки списка репозиториев (HTML фрагмент)")
+async def get_projects(request: Request,
+                       get_trg: GetTRGDep,
+                       gitlab_http: GitLabHTTPDep,
+                       params: ListParamsDep,
+                       ) -> Response:
+    """Список репозиториев GitLab с поиском и постраничной загрузкой"""
+    page = await fetch_page(
+        gitlab_http.list_projects_page(page=params.page, per_page=params.per_page, search=params.search),
+    )
+    return render_browser_page(get_trg, request, PROJECTS_PAGE, page, params)
+
+
+@browser_router.get("/groups", summary="Список групп")
+@browser_router.get("/groups/rows", summary="Строки списка групп (HTML фрагмент)")
+async def get_groups(request: Request,
+                     get_trg: GetTRGDep,
+                     gitlab_http: GitLabHTTPDep,
+                     params: ListParamsDep,
+                     ) -> Response:
+    """Список групп GitLab с поиском и постраничной загрузкой"""
+    page = await fetch_page(
+        gitlab_http.list_groups_page(page=params.page, per_page=params.per_page, search=params.search),
+    )
+    return render_browser_page(get_trg, request, GROUPS_PAGE, page, params)
+
+
+@browser_router.get("/groups/{group_id}/members", summary="Список пользователей группы")
+@browser_router.get("/groups/{group_id}/members/rows", summary="Строки списка пользователей группы (HTML фрагмент)")
+async def get_group_members(request: Request,
+                            get_trg: GetTRGDep,
+                            gitlab_http: GitLabHTTPDep,
+                            params: ListParamsDep,
+                            group_id: int = Path(description="Идентификатор группы"),
+                            ) -> Response:
+    """Список пользователей группы GitLab с поиском и постраничной загрузкой"""
+    page = await fetch_page(gitlab_http.list_group_members_page(group_id,
+                                                                page=params.page,
+                                                                per_page=params.per_page,
+                                                                query=params.search))
+    return render_browser_page(get_trg, request, MEMBERS_PAGE, page, params)
+
+
+@browser_router.get("/projects/{project_id}/members", summary="Список пользователей репозитория")
+@browser_router.get("/projects/{project_id}/members/rows",
+                    summary="Строки списка пользователей репозитория (HTML фрагмент)")
+async def get_project_members(request: Request,
+                              get_trg: GetTRGDep,
+                              gitlab_http: GitLabHTTPDep,
+                              params: ListParamsDep,
+                              project_id: int = Path(description="Идентификатор репозитория"),
+                              ) -> Response:
+    """Список пользователей репозитория GitLab с поиском и постраничной загрузкой"""
+    page = await fetch_page(gitlab_http.list_project_members_page(project_id,
+                                                                  page=params.page,
+                                                                  per_page=params.per_page,
+                                                                  query=params.search))
+    return render_browser_page(get_trg, request, MEMBERS_PAGE, page, params)
+
+
+@browser_router.get("/tokens",
+                    summary="Список Personal Access Token",
+                    dependencies=[Depends(verify_service_token)])
+@browser_router.get("/tokens/rows",
+                    summary="Строки списка Personal Access Token (HTML фрагмент)",
+                    dependencies=[Depends(verify_service_token)])
+async def get_tokens(request: Request,
+                     get_trg: GetTRGDep,
+                     gitlab_http: GitLabHTTPDep,
+                     params: ListParamsDep,
+                     ) -> Response:
+    """Список Personal Access Token GitLab с поиском и постраничной загрузкой
+
+    Токены всего инстанса запрашиваются сервисным токеном GitLab, поэтому страница требует заголовок
+    `X-Service-Token`
+    """
+    page = await fetch_page(gitlab_http.list_personal_access_tokens_page(page=params.page,
+                                                                         per_page=params.per_page,
+                                                                         search=params.search))
+    return render_browser_page(get_trg, request, TOKENS_PAGE, page, params)
@@ -4,17 +4,25 @@ from fastapi import APIRouter, Depends, Response, status
 from fastapi.responses import RedirectResponse
 
 from src.app.templates import CommonTemplateResponseGenerator
+from src.dashboard.collector import DashboardCollector
+from src.dependencies.dashboard import get_dashboard_collector
 from src.dependencies.templates import get_common_trg_prefill_path
 
 index_router = APIRouter(tags=["pages.index"])
 
 GetTRGDep = Annotated[CommonTemplateResponseGenerator, Depends(get_common_trg_prefill_path("pages/common"))]
+DashboardCollectorDep = Annotated[DashboardCollector, Depends(get_dashboard_collector)]
 
 
 @index_router.get("/", summary="Главная страница")
-async def index(get_trg: GetTRGDep) -> Response:
-    """Главная страница"""
-    return get_trg.generate_response("index.html.j2")
+async def index(get_trg: GetTRGDep, dashboard_collector: DashboardCollectorDep) -> Response:
+    """Главная страница с обзором инстанса GitLab
+
+    Обзор рендерится из последнего снимка в памяти (без запросов в GitLab), страница кэшируется до смены снимка.
+    """
+    snapshot = dashboard_collector.snapshot
+    context = {"dashboard": snapshot.to_context() if snapshot else None}
+    return get_trg.generate_response("index.html.j2", context, cache=True)
 
 @index_router.get("/favicon.ico", summary="Редирект фавикон", response_class=RedirectResponse)
 async def redirect_favicon() -> RedirectResponse:
@@ -17,11 +17,15 @@ async def get_sign_in(get_trg: GetTRGDep,
                       redirect: str = Query("/", description=("Страница, на которую произойдет редирект в случае "
                                                               "успешной авторизации")),
                       ) -> Response:
-    """Страница входа в админ панель"""
+    """Страница входа в админ панель
+
+    Кэшируется только со значением `redirect` по умолчанию: остальные значения задает клиент,
+    и каждое из них заняло бы отдельное место в кэше страниц.
+    """
     context = {
           "redirect": redirect,
     }
-    return get_trg.generate_response("sign_in.html.j2", context)
+    return get_trg.generate_response("sign_in.html.j2", context, cache=redirect == "/")
 
 @users_router.post("/sign_in", summary="Обработка авторизации")
 async def post_sign_in(get_trg: GetTRGDep,
@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal, TypedDict
 
 AccessLevel = Literal[0, 5, 10, 20, 30, 40, 50]
+UsersOrderBy = Literal["id", "name", "username", "created_at", "updated_at"]
 
 
 class _User(TypedDict):
@@ -167,6 +168,19 @@ class GetUserByAdmin(_User):
     """
 
 
+class ListedUserByAdmin(_User):
+    """Модель пользователя GitLab в списке пользователей при просмотре с правами администратора
+
+    Args:
+        last_activity_on: дата последней активности пользователя (None - пользователь еще не был активен)
+        bot: признак того, что пользователь является ботом
+
+    Example: см. GetUserByAdmin
+    """
+    last_activity_on: date | None
+    bot: bool
+
+
 class GetUser(_User):
     """Модель пользователя GitLab при просмотре под обычным пользователем
 
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from enum import IntEnum
+from http import HTTPStatus
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class Priority(IntEnum):
+    """Класс приоритета события вебхука. Меньшее значение - более важное событие"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+# События, влияющие на доступы и безопасность (участники, пользователи, токены, ключи)
+_HIGH_PRIORITY_KINDS = frozenset({
+    "member",
+    "access_token",
+    "user_create",
+    "user_destroy",
+    "user_rename",
+    "user_failed_login",
+    "user_add_to_team",
+    "user_remove_from_team",
+    "user_update_for_team",
+    "user_add_to_group",
+    "user_remove_from_group",
+    "user_update_for_group",
+    "key_create",
+    "key_destroy",
+    "project_transfer",
+    "group_rename",
+})
+# Шумные события CI
+_LOW_PRIORITY_KINDS = frozenset({"pipeline", "build", "job", "deployment", "feature_flag"})
+
+
+def get_priority(event_kind: str) -> Priority:
+    """Получить класс приоритета для вида события
+
+    Args:
+        event_kind: вид события (`object_kind`/`event_name`)
+
+    Returns:
+        Класс приоритета события
+    """
+    if event_kind in _HIGH_PRIORITY_KINDS:
+        return Priority.HIGH
+    if event_kind in _LOW_PRIORITY_KINDS:
+        return Priority.LOW
+    return Priority.NORMAL
+
+
+class AdmissionDecision(NamedTuple):
+    """Решение о приеме события
+
+    status_code: HTTP статус ответа: 202 - принято, 429 - отклонено из-за нагрузки,
+        503 - очередь или память переполнены
+    retry_after: через сколько секунд GitLab стоит повторить доставку (0 - событие принято)
+    """
+    status_code: int
+    retry_after: int = 0
+
+    @property
+    def accepted(self) -> bool:
+        """Принято ли событие"""
+        return self.status_code == HTTPStatus.ACCEPTED
+
+
+ACCEPTED = AdmissionDecision(HTTPStatus.ACCEPTED)
+
+
+def get_rss_bytes() -> int | None:
+    """Текущий объем резидентной памяти процесса (RSS) в байтах, None - не удалось определить (не Linux)"""
+    try:
+        with open("/proc/self/statm", "rb") as statm:  # noqa: PTH123
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class AdmissionController:
+    """Контроль приема событий вебхуков (backpressure и сброс нагрузки)
+
+    Неограниченная очередь при отставании обработчиков рано или поздно съест всю память, а молча
+    выброшенные события теряются. Поэтому при перегрузке событие не принимается, а GitLab получает
+    429/503 с `Retry-After` и повторяет доставку позже:
+
+    - глубина очереди >= `max_depth` или RSS >= `memory_hard_limit` - 503 для любых событий;
+    - глубина очереди >= водяной отметки класса приоритета - 429 (шумные CI события отсекаются раньше,
+      события по участникам и доступам принимаются до заполнения очереди);
+    - RSS >= `memory_soft_limit` - 429 для всех событий, кроме высокого приоритета.
+    """
+    def __init__(self,
+                 *,
+                 max_depth: int = 10_000,
+                 watermarks: Mapping[Priority, int] | None = None,
+                 memory_soft_limit: int = 0,
+                 memory_hard_limit: int = 0,
+                 retry_after: int = 30,
+                 memory_check_interval: float = 1.0,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            max_depth: максимальная глубина очереди
+            watermarks: глубина очереди, начиная с которой отклоняются события класса приоритета;
+                по умолчанию LOW - 50%, NORMAL - 80%, HIGH - 100% от max_depth
+            memory_soft_limit: RSS в байтах, начиная с которого принимаются только события высокого приоритета,
+                0 - не проверять
+            memory_hard_limit: RSS в байтах, начиная с которого не принимаются никакие события, 0 - не проверять
+            retry_after: значение заголовка `Retry-After` в секундах
+            memory_check_interval: как часто (в секундах) перечитывать RSS процесса
+        """
+        self._max_depth = max_depth
+        self._watermarks = dict(watermarks or {
+            Priority.LOW: max_depth // 2,
+            Priority.NORMAL: max_depth * 4 // 5,
+        })
+        self._memory_soft_limit = memory_soft_limit
+        self._memory_hard_limit = memory_hard_limit
+        self._retry_after = retry_after
+        self._memory_check_interval = memory_check_interval
+        self._rss: int | None = None
+        self._rss_checked_at = float("-inf")
+        self.rejected: Counter[tuple[Priority, int]] = Counter()
+
+    def admit(self, priority: Priority, depth: int) -> AdmissionDecision:
+        """Принять решение о приеме события
+
+        Args:
+            priority: класс приоритета события
+            depth: текущая глубина очереди
+
+        Returns:
+            Решение о приеме события
+        """
+        decision = self._decide(priority, depth)
+        if not decision.accepted:
+            self.rejected[priority, decision.status_code] += 1
+        return decision
+
+    def check(self, depth: int) -> AdmissionDecision:
+        """Предварительное решение о приеме, пока приоритет события еще неизвестен
+
+        Проверяется наиболее мягкий класс приоритета: если не было бы принято даже событие
+        высокого приоритета, тело запроса можно не читать. Отказ учитывается как отказ высокому приоритету
+
+        Args:
+            depth: текущая глубина очереди
+
+        Returns:
+            Решение о приеме события
+        """
+        return self.admit(Priority.HIGH, depth)
+
+    def _decide(self, priority: Priority, depth: int) -> AdmissionDecision:
+        """Принять решение о приеме события без учета статистики"""
+        if depth >= self._max_depth:
+            return AdmissionDecision(HTTPStatus.SERVICE_UNAVAILABLE, self._retry_after)
+
+        rss = self._get_rss()
+        if self._memory_hard_limit and rss is not None and rss >= self._memory_hard_limit:
+            return AdmissionDecision(HTTPStatus.SERVICE_UNAVAILABLE, self._retry_after)
+
+        if depth >= self._watermarks.get(priority, self._max_depth):
+            return AdmissionDecision(HTTPStatus.TOO_MANY_REQUESTS, self._retry_after)
+
+        if (self._memory_soft_limit and rss is not None and rss >= self._memory_soft_limit
+                and priority != Priority.HIGH):
+            return AdmissionDecision(HTTPStatus.TOO_MANY_REQUESTS, self._retry_after)
+
+        return ACCEPTED
+
+    def _get_rss(self) -> int | None:
+        """RSS процесса, перечитывается не чаще раза в `memory_check_interval` секунд"""
+        if not (self._memory_soft_limit or self._memory_hard_limit):
+            return None
+        now = time.monotonic()
+        if now - self._rss_checked_at >= self._memory_check_interval:
+            self._rss = get_rss_bytes()
+            self._rss_checked_at = now
+        return self._rss
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from .events import WebhookEvent
+
+CoalesceKey = Literal["project", "ref", "merge_request"]
+
+
+@dataclasses.dataclass(slots=True)
+class _Batch:
+    """Накопленные события по одному ключу"""
+    events: list[WebhookEvent]
+    timer: asyncio.TimerHandle
+
+
+def get_ref(payload: dict[str, Any]) -> str:
+    """Получить ref (ветку/тег) события: push, tag_push, pipeline, merge_request"""
+    object_attributes = payload.get("object_attributes") or {}
+    ref = payload.get("ref") or object_attributes.get("ref") or object_attributes.get("source_branch") or ""
+    return str(ref)
+
+
+def get_merge_request_iid(payload: dict[str, Any]) -> int | None:
+    """Получить iid MR события: merge_request, pipeline и note для MR"""
+    if payload.get("object_kind") == "merge_request":
+        iid = (payload.get("object_attributes") or {}).get("iid")
+    else:
+        iid = (payload.get("merge_request") or {}).get("iid")
+    return int(iid) if iid is not None else None
+
+
+class WebhookCoalescer:
+    """Объединение всплесков однотипных событий
+
+    Force-push или массовое слияние MR порождают десятки push/pipeline событий по одной ветке за секунды.
+    События группируются по ключу (вид события + проект, ветка или MR), и по истечении окна `window`
+    с момента первого события в группе (или при накоплении `max_batch` событий) выдается одно
+    объединенное событие. Окно отсчитывается от первого события, а не продлевается каждым новым,
+    поэтому задержка обработки ограничена `window` даже при непрерывном потоке событий.
+
+    Объединенное событие - последнее событие группы, в `coalesced` которого лежат все события группы
+    в порядке поступления.
+    """
+    def __init__(self,
+                 emit: Callable[[WebhookEvent], None],
+                 *,
+                 key: CoalesceKey = "ref",
+                 window: float = 2.0,
+                 max_batch: int = 50,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            emit: функция, которая получает объединенное событие
+            key: признак объединения: project - проект, ref - ветка/тег, merge_request - iid MR
+                (события без MR объединяются по ветке)
+            window: окно объединения в секундах, 0 - не объединять
+            max_batch: максимальное количество событий в одном объединенном событии
+        """
+        self._emit = emit
+        self._key = key
+        self._window = window
+        self._max_batch = max_batch
+        self._batches: dict[Hashable, _Batch] = {}
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Количество накопленных и еще не выданных событий"""
+        return self._pending
+
+    def add(self, event: WebhookEvent) -> None:
+        """Добавить событие. Должен вызываться из работающего event loop
+
+        Args:
+            event: событие вебхука
+        """
+        if self._window <= 0 or self._max_batch <= 1:
+            self._emit(event)
+            return
+
+        key = self.get_key(event)
+        batch = self._batches.get(key)
+        if batch is None:
+            timer = asyncio.get_running_loop().call_later(self._window, self._flush, key)
+            batch = self._batches[key] = _Batch([], timer)
+
+        batch.events.append(event)
+        self._pending += 1
+        if len(batch.events) >= self._max_batch:
+            self._flush(key)
+
+    def flush(self) -> None:
+        """Досрочно выдать все накопленные события (например, при остановке приложения)"""
+        for key in list(self._batches):
+            self._flush(key)
+
+    def get_key(self, event: WebhookEvent) -> Hashable:
+        """Ключ, по которому объединяются события
+
+        Args:
+            event: событие вебхука
+
+        Returns:
+            Ключ объединения
+        """
+        if self._key == "project":
+            return event.kind, event.project_path
+        if self._key == "merge_request":
+            iid = get_merge_request_iid(event.payload)
+            if iid is not None:
+                return event.kind, event.project_path, "!", iid
+        return event.kind, event.project_path, get_ref(event.payload)
+
+    def _flush(self, key: Hashable) -> None:
+        """Выдать объединенное событие по ключу"""
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        self._pending -= len(batch.events)
+        self._emit(dataclasses.replace(batch.events[-1], coalesced=tuple(batch.events)))
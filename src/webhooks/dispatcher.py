@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping
+
+    from .events import WebhookEvent
+    from .rules import WebhookRuleEngine
+
+    WebhookAction = Callable[[WebhookEvent], Awaitable[None]]
+
+logger = logging.getLogger("gitlab-wh.webhooks")
+
+
+async def log_event(event: WebhookEvent) -> None:
+    """Действие `log`: записать событие в лог"""
+    logger.info("Событие %s в %s (хук %s)", event.kind, event.project_path or "-", event.hook_key)
+
+
+default_actions: dict[str, WebhookAction] = {
+    "log": log_event,
+}
+
+
+class WebhookDispatcher:
+    """Выполнение действий по правилам для событий вебхуков"""
+    def __init__(self, rule_engine: WebhookRuleEngine, actions: Mapping[str, WebhookAction]) -> None:
+        """Конструктор
+
+        Args:
+            rule_engine: скомпилированный набор правил
+            actions: доступные действия {имя действия: корутина-обработчик}
+        """
+        self._rule_engine = rule_engine
+        self._actions = actions
+
+    async def dispatch(self, event: WebhookEvent) -> int:
+        """Выполнить действия всех правил, подходящих для события
+
+        Действия выполняются конкурентно. Ошибка одного действия логируется и не прерывает остальные.
+
+        Args:
+            event: событие вебхука
+
+        Returns:
+            Количество запущенных действий
+        """
+        actions = []
+        for rule in self._rule_engine.match(event.kind, event.project_path):
+            action = self._actions.get(rule.action)
+            if action is None:
+                logger.warning("Неизвестное действие %r в правиле %s", rule.action, rule)
+                continue
+            actions.append(action(event))
+
+        results = await asyncio.gather(*actions, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Ошибка выполнения действия для события %s", event.kind, exc_info=result)
+        return len(actions)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookEvent:
+    """Событие, полученное из вебхука GitLab
+
+    Args:
+        hook_key: ключ хука, на который пришло событие
+        kind: вид события (`object_kind` для вебхуков проекта/группы, `event_name` для системных хуков)
+        project_path: `path_with_namespace` проекта (или полный путь группы), к которому относится событие;
+            пустая строка, если событие не относится к проекту или группе
+        payload: тело вебхука
+        received_at: время получения события (time.monotonic)
+        coalesced: события, объединенные в это событие (см. `WebhookCoalescer`), в порядке поступления;
+            пусто, если событие не объединялось
+    """
+    hook_key: str
+    kind: str
+    project_path: str
+    payload: dict[str, Any]
+    received_at: float = field(default_factory=time.monotonic)
+    coalesced: tuple[WebhookEvent, ...] = ()
+
+    @property
+    def count(self) -> int:
+        """Количество исходных событий вебхука, которые представляет это событие"""
+        return len(self.coalesced) or 1
+
+    @classmethod
+    def from_payload(cls, hook_key: str, payload: dict[str, Any]) -> WebhookEvent:
+        """Создать событие из тела вебхука
+
+        Webhook events - https://docs.gitlab.com/ee/user/project/integrations/webhook_events.html
+        System hooks - https://docs.gitlab.com/ee/administration/system_hooks.html
+
+        Args:
+            hook_key: ключ хука, на который пришло событие
+            payload: тело вебхука
+
+        Returns:
+            Событие вебхука
+        """
+        return cls(
+            hook_key=hook_key,
+            kind=get_event_kind(payload),
+            project_path=get_project_path(payload),
+            payload=payload,
+        )
+
+
+def get_event_kind(payload: dict[str, Any]) -> str:
+    """Получить вид события из тела вебхука
+
+    Args:
+        payload: тело вебхука
+
+    Returns:
+        `object_kind` (push, merge_request, pipeline, ...) или `event_name` системного хука
+        (project_create, user_add_to_team, ...), пустая строка - вид события неизвестен
+    """
+    kind = payload.get("object_kind") or payload.get("event_name") or ""
+    return str(kind)
+
+
+def get_project_path(payload: dict[str, Any]) -> str:
+    """Получить путь проекта (или группы), к которому относится событие
+
+    Args:
+        payload: тело вебхука
+
+    Returns:
+        `path_with_namespace` проекта, полный путь группы или пустая строка
+    """
+    project = payload.get("project")
+    if isinstance(project, dict) and project.get("path_with_namespace"):
+        return str(project["path_with_namespace"])
+
+    for key in ("path_with_namespace", "project_path_with_namespace", "full_path", "group_path"):
+        if payload.get(key):
+            return str(payload[key])
+    return ""
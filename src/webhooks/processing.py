@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from typing import TYPE_CHECKING
+
+from .admission import AdmissionController, AdmissionDecision, Priority, get_priority
+from .coalescing import CoalesceKey, WebhookCoalescer
+
+if TYPE_CHECKING:
+    from .dispatcher import WebhookDispatcher
+    from .events import WebhookEvent
+
+
+class WebhookProcessor:
+    """Конвейер обработки событий вебхуков
+
+    Контроль приема -> объединение всплесков -> очередь с приоритетами -> воркеры, выполняющие действия
+    по правилам. Глубина конвейера (накопленные, ожидающие и выполняемые события) ограничена
+    `AdmissionController`, поэтому при отставании обработчиков память не растет бесконечно.
+    """
+    def __init__(self,
+                 dispatcher: WebhookDispatcher,
+                 *,
+                 coalesce_key: CoalesceKey = "ref",
+                 coalesce_window: float = 2.0,
+                 coalesce_max_batch: int = 50,
+                 admission: AdmissionController | None = None,
+                 workers: int = 4,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            dispatcher: диспетчер действий по правилам
+            coalesce_key: признак объединения событий (см. `WebhookCoalescer`)
+            coalesce_window: окно объединения событий в секундах, 0 - не объединять
+            coalesce_max_batch: максимальное количество событий в одном объединенном событии
+            admission: контроль приема событий, по умолчанию - с настройками `AdmissionController`
+            workers: количество воркеров, выполняющих действия
+        """
+        self._dispatcher = dispatcher
+        self._coalescer = WebhookCoalescer(
+            self._enqueue,
+            key=coalesce_key,
+            window=coalesce_window,
+            max_batch=coalesce_max_batch,
+        )
+        self._admission = admission or AdmissionController()
+        self._queue: asyncio.PriorityQueue[tuple[Priority, int, WebhookEvent]] = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers_count = workers
+        self._workers: list[asyncio.Task[None]] = []
+        self._in_progress = 0
+
+    @property
+    def depth(self) -> int:
+        """Глубина конвейера: накопленные для объединения, ожидающие в очереди и выполняемые события"""
+        return self._coalescer.pending + self._queue.qsize() + self._in_progress
+
+    @property
+    def admission(self) -> AdmissionController:
+        """Контроль приема событий"""
+        return self._admission
+
+    def submit(self, event: WebhookEvent) -> AdmissionDecision:
+        """Принять событие в обработку. Должен вызываться из работающего event loop
+
+        Args:
+            event: событие вебхука
+
+        Returns:
+            Решение о приеме события; если событие не принято, оно не попадает в конвейер
+        """
+        decision = self._admission.admit(get_priority(event.kind), self.depth)
+        if decision.accepted:
+            self._coalescer.add(event)
+        return decision
+
+    def start(self) -> None:
+        """Запустить воркеры. Должен вызываться из работающего event loop"""
+        loop = asyncio.get_running_loop()
+        self._workers.extend(loop.create_task(self._work()) for _ in range(self._workers_count - len(self._workers)))
+
+    async def close(self) -> None:
+        """Выдать накопленные события, дождаться их обработки и остановить воркеры"""
+        self._coalescer.flush()
+        if self._workers:
+            await self._queue.join()
+        else:
+            while not self._queue.empty():
+                *_, event = self._queue.get_nowait()
+                await self._dispatch(event)
+
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._workers.clear()
+        # Очередь привязывается к event loop воркеров, новая очередь позволяет запустить обработку повторно
+        self._queue = asyncio.PriorityQueue()
+
+    def _enqueue(self, event: WebhookEvent) -> None:
+        """Поставить (объединенное) событие в очередь"""
+        self._queue.put_nowait((get_priority(event.kind), next(self._sequence), event))
+
+    async def _work(self) -> None:
+        """Воркер: выполняет действия для событий из очереди в порядке приоритета"""
+        while True:
+            *_, event = await self._queue.get()
+            try:
+                await self._dispatch(event)
+            finally:
+                self._queue.task_done()
+
+    async def _dispatch(self, event: WebhookEvent) -> None:
+        """Выполнить действия для события, учитывая его в глубине конвейера"""
+        self._in_progress += 1
+        try:
+            await self._dispatcher.dispatch(event)
+        finally:
+            self._in_progress -= 1
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+logger = logging.getLogger("gitlab-wh.webhooks")
+
+ANY_EVENT = "*"
+_GLOB_CHARS = frozenset("*?[")
+
+
+class WebhookRule(NamedTuple):
+    """Правило обработки вебхука: "при событии `event` в проектах `project` выполнить `action`"
+
+    event: вид события (`object_kind`/`event_name`), `*` - любое событие
+    project: glob-шаблон по `path_with_namespace`, сегменты разделяются `/`:
+        `*` - ровно один сегмент, `**` - любое количество сегментов (в т.ч. ноль),
+        сегмент с `*`, `?` или `[...]` сопоставляется по правилам fnmatch (например, `backend-*`)
+    action: имя действия, которое будет выполнено
+    """
+    event: str
+    project: str
+    action: str
+
+
+class _TrieNode:
+    """Узел префиксного дерева по сегментам пути проекта"""
+    __slots__ = ("children", "star", "deep", "globs", "rules")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.star: _TrieNode | None = None
+        self.deep: _TrieNode | None = None
+        self.globs: list[tuple[re.Pattern[str], _TrieNode]] = []
+        self.rules: list[int] = []
+
+    def child(self, segment: str) -> _TrieNode:
+        """Получить (или создать) дочерний узел для сегмента шаблона"""
+        if segment == "**":
+            self.deep = self.deep or _TrieNode()
+            return self.deep
+        if segment == "*":
+            self.star = self.star or _TrieNode()
+            return self.star
+        if _GLOB_CHARS.intersection(segment):
+            pattern = re.compile(fnmatch.translate(segment))
+            for glob, node in self.globs:
+                if glob.pattern == pattern.pattern:
+                    return node
+            node = _TrieNode()
+            self.globs.append((pattern, node))
+            return node
+        return self.children.setdefault(segment, _TrieNode())
+
+    def collect(self, segments: list[str], index: int, matched: set[int]) -> None:
+        """Собрать номера правил, шаблоны которых совпадают с segments[index:]"""
+        if self.deep is not None:
+            # `**` поглощает от нуля до всех оставшихся сегментов
+            for deep_index in range(index, len(segments) + 1):
+                self.deep.collect(segments, deep_index, matched)
+
+        if index == len(segments):
+            matched.update(self.rules)
+            return
+
+        segment = segments[index]
+        child = self.children.get(segment)
+        if child is not None:
+            child.collect(segments, index + 1, matched)
+        if self.star is not None:
+            self.star.collect(segments, index + 1, matched)
+        for glob, node in self.globs:
+            if glob.match(segment):
+                node.collect(segments, index + 1, matched)
+
+
+class WebhookRuleEngine:
+    """Скомпилированный набор правил обработки вебхуков
+
+    Правила раскладываются в индекс по виду события, а внутри вида события - в префиксное дерево по
+    сегментам шаблона `project`. Поэтому сопоставление события стоит порядка O(глубина пути + число
+    совпавших правил), а не O(число правил), как при последовательном переборе.
+    Совпавшие правила возвращаются в порядке их объявления.
+    """
+    def __init__(self, rules: Iterable[WebhookRule] = ()) -> None:
+        """Конструктор. Компилирует правила в индекс
+
+        Args:
+            rules: правила обработки вебхуков
+        """
+        self._rules: list[WebhookRule] = []
+        self._index: dict[str, _TrieNode] = {}
+        for rule in rules:
+            self._add(rule)
+
+    def __len__(self) -> int:
+        """Количество правил"""
+        return len(self._rules)
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> WebhookRuleEngine:
+        """Загрузить правила из JSON файла
+
+        Формат файла: `[{"event": "push", "project": "backend/**", "action": "log"}, ...]`.
+        Если файла нет или его не удалось прочитать или разобрать, набор правил пуст: ошибка пишется в лог,
+        а воркер запускается и принимает вебхуки.
+
+        Args:
+            file_path: путь до JSON файла с правилами
+
+        Returns:
+            Скомпилированный набор правил
+        """
+        if not file_path.exists():
+            return cls()
+        try:
+            raw_rules = json.loads(file_path.read_text(encoding="utf-8"))
+            if not isinstance(raw_rules, list):
+                logger.error("Файл с правилами вебхуков должен содержать JSON массив: %s", file_path)
+                return cls()
+            rules = [WebhookRule(rule["event"], rule["project"], rule["action"]) for rule in raw_rules]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception("Не удалось прочитать файл с правилами вебхуков: %s", file_path)
+            return cls()
+        return cls(rules)
+
+    def match(self, event_kind: str, project_path: str) -> list[WebhookRule]:
+        """Найти правила, подходящие для события
+
+        Args:
+            event_kind: вид события
+            project_path: `path_with_namespace` проекта события
+
+        Returns:
+            Список подходящих правил в порядке объявления
+        """
+        segments = project_path.split("/") if project_path else []
+        matched: set[int] = set()
+        for kind in (event_kind, ANY_EVENT):
+            root = self._index.get(kind)
+            if root is not None:
+                root.collect(segments, 0, matched)
+        return [self._rules[rule_index] for rule_index in sorted(matched)]
+
+    def _add(self, rule: WebhookRule) -> None:
+        """Добавить правило в индекс"""
+        node = self._index.setdefault(rule.event, _TrieNode())
+        for segment in rule.project.strip("/").split("/") if rule.project.strip("/") else []:
+            node = node.child(segment)
+        node.rules.append(len(self._rules))
+        self._rules.append(rule)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+logger = logging.getLogger("gitlab-wh.webhooks")
+
+
+class WebhookSecretRegistry:
+    """Реестр секретов вебхуков GitLab (заголовок `X-Gitlab-Token`)
+
+    Секреты хранятся в словаре по ключу хука (ключ из URL, на который GitLab отправляет вебхук),
+    поэтому ожидаемый секрет находится за O(1) независимо от количества хуков, а сравнение с присланным
+    токеном выполняется за постоянное время (`hmac.compare_digest`).
+
+    Если задан `file_path`, секреты читаются из JSON файла вида `{"<hook_key>": "<secret>", ...}`.
+    Файл перечитывается без перезапуска воркеров: не чаще раза в `reload_interval` секунд проверяется
+    mtime и размер файла, и при изменении словарь секретов заменяется целиком одной операцией присваивания.
+    Поэтому конкурентные проверки видят либо старый, либо новый набор секретов, но не их смесь.
+    """
+    _DUMMY_SECRET = b"gitlab-wh-dummy-secret"
+
+    def __init__(self,
+                 secrets: Mapping[str, str] | None = None,
+                 *,
+                 file_path: Path | None = None,
+                 reload_interval: float = 5.0,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            secrets: начальный набор секретов {ключ хука: секрет}
+            file_path: путь до JSON файла с секретами для горячей перезагрузки
+            reload_interval: минимальный интервал (в секундах) между проверками изменения файла
+        """
+        self._secrets: dict[str, bytes] = self._encode(secrets or {})
+        self._file_path = file_path
+        self._reload_interval = reload_interval
+        self._file_signature: tuple[int, int] | None = None
+        self._next_check = 0.0
+        if file_path is not None:
+            self.reload_if_changed(force=True)
+
+    def __len__(self) -> int:
+        """Количество зарегистрированных хуков"""
+        return len(self._secrets)
+
+    def __contains__(self, hook_key: object) -> bool:
+        """Зарегистрирован ли хук с ключом hook_key"""
+        return hook_key in self._secrets
+
+    def verify(self, hook_key: str, token: str | None) -> bool:
+        """Проверить токен из заголовка `X-Gitlab-Token` для хука
+
+        Args:
+            hook_key: ключ хука
+            token: значение заголовка `X-Gitlab-Token` (None - заголовок не передан)
+
+        Returns:
+            True - токен совпадает с секретом хука, False - хук неизвестен или токен неверный
+        """
+        self.reload_if_changed()
+        expected = self._secrets.get(hook_key)
+        received = token.encode() if token is not None else b""
+        if expected is None or token is None:
+            # Сравнение выполняется и для неизвестного хука, чтобы время ответа не выдавало наличие ключа
+            hmac.compare_digest(self._DUMMY_SECRET, received)
+            return False
+        return hmac.compare_digest(expected, received)
+
+    def replace(self, secrets: Mapping[str, str]) -> None:
+        """Атомарно заменить весь набор секретов
+
+        Args:
+            secrets: новый набор секретов {ключ хука: секрет}
+        """
+        self._secrets = self._encode(secrets)
+
+    def reload_if_changed(self, *, force: bool = False) -> bool:
+        """Перечитать файл с секретами, если он изменился
+
+        Отсутствие файла, ошибка доступа к нему или ошибка его разбора не сбрасывают текущий набор секретов.
+
+        Args:
+            force: проверить файл, не дожидаясь истечения `reload_interval`
+
+        Returns:
+            True - набор секретов был перечитан, False - файл не менялся или не задан
+        """
+        if self._file_path is None:
+            return False
+
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self._reload_interval
+
+        try:
+            stat = self._file_path.stat()
+        except OSError as exc:
+            # Предупреждение пишется один раз, а не на каждой проверке: пока файл недоступен,
+            # используется последний успешно прочитанный набор (или переданный в конструктор)
+            if self._file_signature is not None or force:
+                logger.warning("Файл с секретами вебхуков недоступен, используются прежние секреты: %s", exc)
+            self._file_signature = None
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._file_signature:
+            return False
+
+        secrets = self._read_file(self._file_path)
+        if secrets is None:
+            return False
+
+        self.replace(secrets)
+        self._file_signature = signature
+        logger.info("Загружены секреты вебхуков: %s шт.", len(self._secrets))
+        return True
+
+    @staticmethod
+    def _read_file(file_path: Path) -> dict[str, str] | None:
+        """Прочитать JSON файл с секретами
+
+        Returns:
+            Набор секретов или None, если файл не удалось прочитать или разобрать
+        """
+        try:
+            secrets = json.loads(file_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.exception("Не удалось прочитать файл с секретами вебхуков: %s", file_path)
+            return None
+
+        if not isinstance(secrets, dict):
+            logger.error("Файл с секретами вебхуков должен содержать JSON объект: %s", file_path)
+            return None
+        return secrets
+
+    @staticmethod
+    def _encode(secrets: Mapping[str, str]) -> dict[str, bytes]:
+        """Подготовить секреты для сравнения за постоянное время"""
+        return {str(hook_key): str(secret).encode() for hook_key, secret in secrets.items()}
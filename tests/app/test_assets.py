@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.app.assets import AssetManifest, get_fingerprinted_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_get_fingerprinted_path() -> None:
+    """Testing get_fingerprinted_path"""
+    assert get_fingerprinted_path("css/bootstrap.min.css", "abc") == "css/bootstrap.min.abc.css"
+
+
+class TestAssetManifest:
+    """Testing class AssetManifest"""
+
+    def test_from_directory(self, tmp_path: Path) -> None:
+        """Testing AssetManifest.from_directory"""
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "style.css").write_bytes(b"body {}")
+        (tmp_path / "css" / "style.css.gz").write_bytes(b"")
+        manifest = AssetManifest.from_directory(tmp_path)
+        assert len(manifest) == 1
+
+        url = manifest.url("css/style.css")
+        assert url.startswith("/static/css/style.")
+        assert url != "/static/css/style.css"
+        asset = manifest.resolve(url.removeprefix("/static/"))
+        assert asset is not None
+        assert asset.path == "css/style.css"
+
+    def test_url_changes_with_content(self, tmp_path: Path) -> None:
+        """Testing AssetManifest.url after file change"""
+        (tmp_path / "style.css").write_bytes(b"body {}")
+        url = AssetManifest.from_directory(tmp_path).url("style.css")
+        (tmp_path / "style.css").write_bytes(b"body { color: red; }")
+        assert AssetManifest.from_directory(tmp_path).url("style.css") != url
+
+    def test_unknown(self) -> None:
+        """Testing AssetManifest with unknown files"""
+        manifest = AssetManifest({"style.css": "abc"})
+        assert manifest.url("/other.css") == "/static/other.css"
+        assert manifest.resolve("style.css") is None
+        assert manifest.resolve("style.def.css") is None
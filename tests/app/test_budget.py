@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.app.budget import GitLabBudget, SlidingWindow, get_job, gitlab_job, token_fingerprint
+from src.repository.http_requests.base import BaseHTTP, HTTPCall
+from src.repository.http_requests.fake_http import FakeClientSession
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
+
+class TestSlidingWindow:
+    """Testing class SlidingWindow"""
+
+    def test_totals(self) -> None:
+        """Testing SlidingWindow.totals drops requests older than the window"""
+        window = SlidingWindow(60, buckets=6)
+        window.add(100, 10)
+        window.add(125, 5)
+        assert window.totals(130) == (2, 15)
+        assert window.totals(165) == (1, 5)
+        assert window.totals(200) == (0, 0)
+
+    def test_retry_after(self) -> None:
+        """Testing SlidingWindow.retry_after waits until the oldest requests leave the window"""
+        window = SlidingWindow(60, buckets=6)
+        window.add(100)
+        window.add(125)
+        window.add(126)
+        assert window.retry_after(130, 4) == 0
+        assert window.retry_after(130, 3) == 30  # noqa: PLR2004
+        assert window.retry_after(130, 1) == 50  # noqa: PLR2004
+
+
+class TestGitLabBudget:
+    """Testing class GitLabBudget"""
+
+    @pytest.mark.asyncio()
+    async def test_observe_http_call(self) -> None:
+        """Testing GitLabBudget accounts BaseHTTP calls per token fingerprint and job"""
+        budget = GitLabBudget({"dashboard": 2})
+        session = FakeClientSession(data=[{"id": 1}], headers={"RateLimit-Limit": "600", "RateLimit-Remaining": "500"})
+        gitlab_http = GitLabHTTPv4(session, identity=token_fingerprint("token"))
+        BaseHTTP.add_observer(budget.observe_http_call)
+        try:
+            await gitlab_http.check()
+            with gitlab_job("dashboard"):
+                assert get_job() == "dashboard"
+                await gitlab_http.check()
+                await gitlab_http.check()
+        finally:
+            BaseHTTP.remove_observer(budget.observe_http_call)
+
+        assert get_job() == "request"
+        usage = {item["job"]: item for item in budget.usage()}
+        assert usage["request"]["60s"]["requests"] == 1
+        assert usage["dashboard"]["3600s"]["requests"] == 2  # noqa: PLR2004
+        assert usage["dashboard"]["rate_limit"]["remaining"] == 500  # noqa: PLR2004
+        assert usage["dashboard"]["identity"] == token_fingerprint("token") != "token"
+        assert budget.retry_after("dashboard", token_fingerprint("token")) > 0
+        assert budget.retry_after("request", token_fingerprint("token")) == 0
+
+    @pytest.mark.asyncio()
+    async def test_rate_limit_reserve(self) -> None:
+        """Testing GitLabBudget delays background jobs when the token is close to the GitLab rate limit"""
+        budget = GitLabBudget(rate_limit_reserve=0.1)
+        session = FakeClientSession(data=[], headers={"RateLimit-Limit": "600", "RateLimit-Remaining": "10"})
+        BaseHTTP.add_observer(budget.observe_http_call)
+        try:
+            await GitLabHTTPv4(session, identity="abc").check()
+        finally:
+            BaseHTTP.remove_observer(budget.observe_http_call)
+
+        assert 0 < budget.retry_after("dashboard", "abc") <= 60  # noqa: PLR2004
+        assert budget.retry_after("request", "abc") == 0
+        assert budget.retry_after("dashboard", "other") == 0
+
+    @pytest.mark.asyncio()
+    async def test_rate_limit_expires(self) -> None:
+        """Testing a background job resumes once the observed rate limit headroom is older than the window"""
+        budget = GitLabBudget(windows=(0.05, 1), rate_limit_reserve=0.1)
+        budget.observe_http_call(HTTPCall("GET", "/api/v4/users", 200, 0.1, 0.0, 2, identity="abc",
+                                          rate_limit=600, rate_limit_remaining=10))
+        assert budget.retry_after("dashboard", "abc") > 0
+        await asyncio.sleep(0.06)
+        assert budget.retry_after("dashboard", "abc") == 0
+        assert budget.usage()[0]["rate_limit"] is None
+
+    def test_rate_limit_reset(self) -> None:
+        """Testing the headroom is ignored after RateLimit-Reset"""
+        budget = GitLabBudget(rate_limit_reserve=0.1)
+        budget.observe_http_call(HTTPCall("GET", "/api/v4/users", 200, 0.1, 0.0, 2, identity="abc", rate_limit=600,
+                                          rate_limit_remaining=10, rate_limit_reset=int(time.time()) - 1))
+        assert budget.retry_after("dashboard", "abc") == 0
+        budget.observe_http_call(HTTPCall("GET", "/api/v4/users", 200, 0.1, 0.0, 2, identity="abc", rate_limit=600,
+                                          rate_limit_remaining=10, rate_limit_reset=int(time.time()) + 30))
+        assert 0 < budget.retry_after("dashboard", "abc") <= 30  # noqa: PLR2004
+
+    def test_fingerprint(self) -> None:
+        """Testing token_fingerprint"""
+        assert token_fingerprint("") == ""
+        assert token_fingerprint("a") == token_fingerprint("a") != token_fingerprint("b")
@@ -0,0 +1,63 @@
+from src.app.critical_css import build_critical_css, collect_used_selectors, extract_critical_css, is_selector_used
+
+HTML = """
+<html>
+<body>
+    <nav class="navbar {{ extra_class }}" id="main-nav">
+        <a class="nav-link" href="/">{{ title }}</a>
+    </nav>
+</body>
+</html>
+"""
+CSS = """/*! comment */
+@charset "UTF-8";
+:root{--bs-blue:#0d6efd}
+body{margin:0}
+.navbar,.card{display:flex}
+.card-body{padding:1rem}
+a.nav-link:hover{color:red}
+#main-nav>.nav-link{padding:0}
+[data-bs-theme=dark]{color-scheme:dark}
+@media (min-width:992px){.navbar{flex-wrap:nowrap}.card{width:50%}}
+@media print{.card{display:none}}
+@keyframes spin{to{transform:rotate(360deg)}}
+"""
+
+
+def test_collect_used_selectors() -> None:
+    """Testing collect_used_selectors"""
+    used = collect_used_selectors(HTML)
+    assert used.classes == {"navbar", "nav-link"}
+    assert used.ids == {"main-nav"}
+    assert {"nav", "a", "html", "body"} <= used.tags
+    assert {"href", "data-bs-theme"} <= used.attributes
+
+
+def test_is_selector_used() -> None:
+    """Testing is_selector_used"""
+    used = collect_used_selectors(HTML)
+    assert is_selector_used("a.nav-link:hover", used)
+    assert is_selector_used(":root", used)
+    assert not is_selector_used(".card", used)
+    assert not is_selector_used("table", used)
+
+
+def test_extract_critical_css() -> None:
+    """Testing extract_critical_css"""
+    critical_css = extract_critical_css(CSS, collect_used_selectors(HTML))
+    assert critical_css == (
+        ":root{--bs-blue:#0d6efd}"
+        "body{margin:0}"
+        ".navbar{display:flex}"
+        "a.nav-link:hover{color:red}"
+        "#main-nav>.nav-link{padding:0}"
+        "[data-bs-theme=dark]{color-scheme:dark}"
+        "@media (min-width:992px){.navbar{flex-wrap:nowrap}}"
+    )
+
+
+def test_build_critical_css() -> None:
+    """Testing build_critical_css with application templates"""
+    critical_css = build_critical_css()
+    assert ".navbar{" in critical_css
+    assert ".table{" not in critical_css
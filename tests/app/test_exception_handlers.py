@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+
+from src.app.exception_handlers import (
+    ErrorPages,
+    error_messages,
+    error_pages,
+    get_error_page_context,
+    get_html_error_page,
+    html_http_exception_handler,
+)
+from src.app.templates import CommonTemplateResponseGenerator
+from src.main import gitlab_wh
+
+
+def test_get_error_page_context() -> None:
+    """Testing get_error_page_context"""
+    context = get_error_page_context(404, error_message="Проект не найден")
+    assert context["error_message"] == "Проект не найден"
+    assert context["error_title"] == "Страница не найдена"
+    assert error_messages[404]["error_message"] == "В адресе есть ошибка или страница удалена."
+    assert "debug" not in get_error_page_context(404)
+
+
+class TestErrorPages:
+    """Testing class ErrorPages"""
+
+    def test_prerender(self) -> None:
+        """Testing ErrorPages.prerender"""
+        error_pages = ErrorPages()
+        assert error_pages.get(404) is None
+        error_pages.prerender([404, 503])
+        assert len(error_pages) == 2  # noqa: PLR2004
+        page = error_pages.get(404)
+        assert page is not None
+        assert "Страница не найдена".encode() in page
+
+    def test_not_found(self) -> None:
+        """Testing prerendered error page response"""
+        with TestClient(gitlab_wh.app) as client:
+            response = client.get("/not-found")
+        assert response.status_code == 404  # noqa: PLR2004
+        assert "Страница не найдена" in response.text
+        assert "language-python" not in response.text
+
+    def test_method_not_allowed(self) -> None:
+        """Testing prerendered page for HTTPException without custom detail"""
+        with TestClient(gitlab_wh.app) as client:
+            response = client.delete("/users/sign_in")
+            page = error_pages.get(405)
+        assert response.status_code == 405  # noqa: PLR2004
+        assert page is not None
+        assert response.content == page
+
+    def test_traceback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Testing error page with traceback enabled"""
+        monkeypatch.setattr("src.config.SHOW_TRACEBACK", True)
+        with TestClient(gitlab_wh.app) as client:
+            response = client.get("/not-found")
+        assert response.status_code == 404  # noqa: PLR2004
+        assert "language-python" in response.text
+
+    @pytest.mark.asyncio()
+    async def test_custom_message_not_cached(self) -> None:
+        """Testing error page with custom message is not stored in page cache"""
+        page_cache = CommonTemplateResponseGenerator._page_cache  # noqa: SLF001
+        cached_pages = len(page_cache)
+        request = Request({"type": "http", "method": "GET", "path": "/projects", "headers": []})
+        for index in range(5):
+            response = await get_html_error_page(request, 409, error_message=f"Конфликт {index}")
+            assert "ETag" not in response.headers
+        assert len(page_cache) == cached_pages
+
+    @pytest.mark.asyncio()
+    async def test_non_standard_status(self) -> None:
+        """Testing html_http_exception_handler with a status code missing from HTTPStatus"""
+        request = Request({"type": "http", "method": "GET", "path": "/projects", "headers": []})
+        response = await html_http_exception_handler(request, HTTPException(499, "Клиент закрыл соединение"))
+        assert response.status_code == 499  # noqa: PLR2004
+        assert "Клиент закрыл соединение".encode() in response.body
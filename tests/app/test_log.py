@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import sys
+
+from src.app.log import AccessLogRule, AccessLogSampler, JSONFormatter, setup_logging
+
+
+def test_json_formatter() -> None:
+    """Testing JSONFormatter.format"""
+    record = logging.LogRecord("gitlab-wh.access", logging.INFO, "", 0, "%s %s", ("GET", "/"), None)
+    record.status_code = 200
+    data = json.loads(JSONFormatter().format(record))
+    assert data["message"] == "GET /"
+    assert data["level"] == "INFO"
+    assert data["logger"] == "gitlab-wh.access"
+    assert data["status_code"] == 200  # noqa: PLR2004
+    assert "args" not in data
+
+
+def test_json_formatter_exception() -> None:
+    """Testing JSONFormatter.format with exc_info"""
+    try:
+        int("boom")
+    except ValueError:
+        record = logging.LogRecord("test", logging.ERROR, "", 0, "failed", None, sys.exc_info())
+    data = json.loads(JSONFormatter().format(record))
+    assert "ValueError" in data["exc_info"]
+
+
+def test_setup_logging() -> None:
+    """Testing setup_logging: records are written by the QueueListener thread"""
+    root_handlers = logging.getLogger().handlers[:]
+    stream = io.StringIO()
+    listener = setup_logging(json_format=True, stream=stream)
+    try:
+        logging.getLogger("gitlab-wh.test").info("hello %s", "world", extra={"path": "/"})
+    finally:
+        listener.stop()
+        logging.getLogger().handlers[:] = root_handlers
+    data = json.loads(stream.getvalue())
+    assert data["message"] == "hello world"
+    assert data["path"] == "/"
+
+
+def test_setup_logging_exception() -> None:
+    """Testing setup_logging: traceback is written to exc_info, not to message"""
+    root_handlers = logging.getLogger().handlers[:]
+    stream = io.StringIO()
+    listener = setup_logging(json_format=True, stream=stream)
+    try:
+        try:
+            int("boom")
+        except ValueError:
+            logging.getLogger("gitlab-wh.test").exception("failed %s", "twice")
+    finally:
+        listener.stop()
+        logging.getLogger().handlers[:] = root_handlers
+    data = json.loads(stream.getvalue())
+    assert data["message"] == "failed twice"
+    assert "ValueError" in data["exc_info"]
+
+
+class TestAccessLogSampler:
+    """Testing class AccessLogSampler"""
+
+    def test_should_log(self) -> None:
+        """Testing AccessLogSampler.should_log with the longest prefix"""
+        sampler = AccessLogSampler({"/static/": (0.0, 0), "/static/img/": (1.0, 0)})
+        assert sampler.should_log("/", 200)
+        assert not sampler.should_log("/static/css/style.css", 200)
+        assert sampler.should_log("/static/img/favicon.ico", 200)
+
+    def test_should_log_server_error(self) -> None:
+        """Testing AccessLogSampler.should_log always logs server errors"""
+        sampler = AccessLogSampler({}, default=AccessLogRule(sample_rate=0.0))
+        assert not sampler.should_log("/", 404)
+        assert sampler.should_log("/", 500)
+
+    def test_should_log_rate_limit(self) -> None:
+        """Testing AccessLogSampler.should_log with rate limit"""
+        sampler = AccessLogSampler({"/api/service/ping": (1.0, 2)})
+        results = [sampler.should_log("/api/service/ping", 200) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert sampler.should_log("/api/service/other", 200)
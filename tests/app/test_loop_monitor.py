@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.app.loop_monitor import LoopMonitor
+from src.app.metrics import AppMetrics
+
+
+def block_event_loop(seconds: float) -> None:
+    """Блокирует event loop синхронной работой"""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Testing class LoopMonitor"""
+
+    @pytest.mark.asyncio()
+    async def test_slow_callback(self) -> None:
+        """Testing LoopMonitor detects a blocked event loop with its stack"""
+        metrics = AppMetrics()
+        monitor = LoopMonitor(metrics, interval=0.01, slow_threshold=0.05)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            block_event_loop(0.2)
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.close()
+
+        stats = monitor.stats()
+        assert stats["slow_callbacks"] == 1
+        assert "block_event_loop" in stats["last_slow_callback"]["stack"]
+        assert stats["lag_max"] >= 0.1  # noqa: PLR2004
+        assert metrics.event_loop_slow_callbacks.get() == 1
+        assert metrics.event_loop_lag.get_count() > 0
+
+    @pytest.mark.asyncio()
+    async def test_idle(self) -> None:
+        """Testing LoopMonitor does not report an idle event loop"""
+        monitor = LoopMonitor(interval=0.01, slow_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.close()
+        assert monitor.slow_callbacks == 0
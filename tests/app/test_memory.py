@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.app.memory import (
+    MemoryTracingDisabledError,
+    is_memory_tracing,
+    memory_span,
+    memory_stats,
+    start_memory_tracing,
+    stop_memory_tracing,
+    top_allocations,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture()
+def _memory_tracing() -> Iterator[None]:
+    """Включает учет памяти с бюджетом 1 МБ на время теста"""
+    start_memory_tracing(budget=2**20)
+    yield
+    stop_memory_tracing()
+
+
+def allocate(size: int) -> bytearray:
+    """Выделяет `size` байт"""
+    return bytearray(size)
+
+
+@pytest.mark.usefixtures("_memory_tracing")
+class TestMemorySpan:
+    """Testing memory_span"""
+
+    def test_peak(self) -> None:
+        """Testing memory_span records the peak of freed allocations"""
+        with memory_span("pagination", "/api/v4/projects"):
+            allocate(3 * 2**19)
+
+        record = memory_stats()["operations"]["pagination"]["largest"]
+        assert record["description"] == "/api/v4/projects"
+        assert record["peak"] >= 3 * 2**19
+
+    def test_nested(self) -> None:
+        """Testing the outer memory_span keeps the peak of the inner one"""
+        with memory_span("render", "outer"):
+            with memory_span("pagination", "inner"):
+                allocate(2**20)
+            allocate(2**10)
+
+        operations = memory_stats()["operations"]
+        assert operations["render"]["recent"][-1]["peak"] >= 2**20
+        assert operations["pagination"]["recent"][-1]["peak"] >= 2**20
+
+    def test_budget_warning(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Testing memory_span warns about operations over the memory budget"""
+        with caplog.at_level(logging.WARNING, "gitlab-wh.memory"):
+            with memory_span("render", "small.html.j2"):
+                allocate(2**10)
+            with memory_span("render", "large.html.j2"):
+                allocate(2 * 2**20)
+
+        messages = [record.getMessage() for record in caplog.records if record.name == "gitlab-wh.memory"]
+        assert len(messages) == 1
+        assert "large.html.j2" in messages[0]
+
+    def test_top_allocations(self) -> None:
+        """Testing top_allocations reports where the live memory was allocated"""
+        data = allocate(2**20)
+        [top] = top_allocations(1)
+        assert top["size"] >= 2**20
+        assert "test_memory.py" in top["traceback"][-1]
+        del data
+
+
+def test_disabled() -> None:
+    """Testing memory_span and top_allocations without tracing"""
+    assert not is_memory_tracing()
+    with memory_span("render", "disabled"):
+        allocate(2**10)
+    assert all(
+        record["description"] != "disabled"
+        for operation in memory_stats()["operations"].values()
+        for record in operation["recent"]
+    )
+    with pytest.raises(MemoryTracingDisabledError):
+        top_allocations()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from src.app.metrics import AppMetrics, Histogram, MetricsRegistry
+from src.app.middleware import MetricsMiddleware
+from src.repository.http_requests.base import HTTPCall
+
+
+class TestHistogram:
+    """Testing class Histogram"""
+
+    def test_observe(self) -> None:
+        """Testing Histogram.observe and Histogram.samples"""
+        histogram = Histogram("latency", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, ("/",))
+        assert list(histogram.samples()) == [
+            'latency_bucket{route="/",le="0.1"} 2',
+            'latency_bucket{route="/",le="1.0"} 3',
+            'latency_bucket{route="/",le="+Inf"} 4',
+            'latency_sum{route="/"} 3.65',
+            'latency_count{route="/"} 4',
+        ]
+
+
+class TestMetricsRegistry:
+    """Testing class MetricsRegistry"""
+
+    def test_render(self) -> None:
+        """Testing MetricsRegistry.render"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("name",))
+        counter.inc(('say "hi"',))
+        counter.inc(('say "hi"',), 2)
+        assert registry.render() == (
+            "# HELP events_total Events\n"
+            "# TYPE events_total counter\n"
+            'events_total{name="say \\"hi\\""} 3\n'
+        )
+
+
+class TestAppMetrics:
+    """Testing class AppMetrics"""
+
+    def test_observe_http_call(self) -> None:
+        """Testing AppMetrics.observe_http_call"""
+        metrics = AppMetrics()
+        call = HTTPCall("GET", "/api/v4/groups/5/members", 200, 0.2, 0.01, 1024, page=2)
+        metrics.observe_http_call(call)
+        metrics.observe_http_call(call._replace(page=None))
+        endpoint = "/api/v4/groups/{id}/members"
+        assert metrics.http_client_requests.get_count(("GET", endpoint, "200")) == 2  # noqa: PLR2004
+        assert metrics.http_client_response_bytes.get(("GET", endpoint)) == 2048  # noqa: PLR2004
+        assert metrics.http_client_pages.get((endpoint,)) == 1
+
+
+def test_metrics_middleware() -> None:
+    """Testing MetricsMiddleware route templates"""
+    metrics = AppMetrics()
+    app = FastAPI(middleware=[Middleware(MetricsMiddleware, metrics=metrics)])
+
+    @app.get("/groups/{group_id}")
+    @app.get("/groups/{group_id}/rows")
+    async def group(group_id: int) -> PlainTextResponse:
+        return PlainTextResponse(str(group_id))
+
+    client = TestClient(app)
+    client.get("/groups/1")
+    client.get("/groups/2")
+    client.get("/groups/3/rows")
+    client.get("/missing")
+    assert metrics.requests.get_count(("GET", "/groups/{group_id}", "2xx")) == 2  # noqa: PLR2004
+    assert metrics.requests.get_count(("GET", "/groups/{group_id}/rows", "2xx")) == 1
+    assert metrics.requests.get_count(("GET", MetricsMiddleware.UNMATCHED_ROUTE, "4xx")) == 1
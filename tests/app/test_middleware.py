@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import zlib
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from src.app.log import AccessLogSampler
+from src.app.middleware import AccessLogMiddleware, CompressionMiddleware, EarlyHintsMiddleware
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from starlette.types import Message, Receive, Scope, Send
+
+HTML = "<p>" + "Строка таблицы " * 200 + "</p>"
+CHUNKS = [f"<tr><td>{number}</td></tr>" * 100 for number in range(5)]
+
+
+@pytest.fixture()
+def compression_client() -> TestClient:
+    """Возвращает клиент приложения со сжатием ответов"""
+    app = FastAPI(middleware=[Middleware(CompressionMiddleware, minimum_size=500, compress_level=6)])
+
+    @app.get("/html")
+    async def html() -> HTMLResponse:
+        return HTMLResponse(HTML)
+
+    @app.get("/etag")
+    async def etag() -> HTMLResponse:
+        return HTMLResponse(HTML, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small() -> HTMLResponse:
+        return HTMLResponse("<p>ok</p>")
+
+    @app.get("/json")
+    async def json() -> JSONResponse:
+        return JSONResponse({"items": list(range(500))})
+
+    @app.get("/text")
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse(HTML)
+
+    @app.get("/encoded")
+    async def encoded() -> HTMLResponse:
+        return HTMLResponse(gzip.compress(HTML.encode()), headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def generate() -> AsyncIterator[str]:
+            for chunk in CHUNKS:
+                yield chunk
+
+        return StreamingResponse(generate(), media_type="text/html")
+
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """Testing class CompressionMiddleware"""
+
+    @pytest.mark.parametrize("path", ["/html", "/json"])
+    def test_compressed(self, compression_client: TestClient, path: str) -> None:
+        """Testing CompressionMiddleware with compressible responses"""
+        response = compression_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < len(response.content)
+
+    @pytest.mark.parametrize("path", ["/small", "/text"])
+    def test_not_compressed(self, compression_client: TestClient, path: str) -> None:
+        """Testing CompressionMiddleware with small responses and not allowed content types"""
+        response = compression_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_etag(self, compression_client: TestClient) -> None:
+        """Testing CompressionMiddleware weakens ETag of compressed response"""
+        response = compression_client.get("/etag", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == 'W/"abc"'
+        response = compression_client.get("/etag", headers={"Accept-Encoding": "identity"})
+        assert response.headers["ETag"] == '"abc"'
+
+    def test_not_accepted(self, compression_client: TestClient) -> None:
+        """Testing CompressionMiddleware without gzip in Accept-Encoding"""
+        response = compression_client.get("/html", headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.text == HTML
+
+    def test_already_encoded(self, compression_client: TestClient) -> None:
+        """Testing CompressionMiddleware with already compressed response"""
+        response = compression_client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+        assert response.text == HTML
+
+    def test_streaming(self, compression_client: TestClient) -> None:
+        """Testing CompressionMiddleware with streaming response"""
+        response = compression_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert response.text == "".join(CHUNKS)
+
+    @pytest.mark.asyncio()
+    async def test_streaming_chunks(self) -> None:
+        """Testing CompressionMiddleware with streaming response: every chunk is sent and decompressible on arrival"""
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/html")]})
+            for chunk in CHUNKS:
+                await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        messages: list[Message] = []
+
+        async def send(message: Message) -> None:
+            messages.append(message)
+
+        async def receive() -> Message:
+            return {"type": "http.request"}
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app, minimum_size=500)(scope, receive, send)
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parts = [decompressor.decompress(message["body"]).decode() for message in messages[1:]]
+        assert parts[:-1] == CHUNKS
+        assert decompressor.eof
+
+
+class TestEarlyHintsMiddleware:
+    """Testing class EarlyHintsMiddleware"""
+
+    @staticmethod
+    async def _call(path: str, extensions: dict[str, Any]) -> list[Message]:
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        messages: list[Message] = []
+
+        async def send(message: Message) -> None:
+            messages.append(message)
+
+        async def receive() -> Message:
+            return {"type": "http.request"}
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "headers": [(b"accept", b"text/html,application/xhtml+xml")],
+            "extensions": extensions,
+        }
+        middleware = EarlyHintsMiddleware(app, links=["</static/css/style.css>; rel=preload; as=style"])
+        await middleware(scope, receive, send)
+        return messages
+
+    @pytest.mark.asyncio()
+    async def test_early_hint(self) -> None:
+        """Testing EarlyHintsMiddleware with server support"""
+        messages = await self._call("/projects", {"http.response.early_hint": {}})
+        assert messages[0] == {
+            "type": "http.response.early_hint",
+            "links": [b"</static/css/style.css>; rel=preload; as=style"],
+        }
+        assert messages[1]["type"] == "http.response.start"
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(("path", "extensions"), [
+        ("/projects", {}),
+        ("/api/service/ping", {"http.response.early_hint": {}}),
+    ])
+    async def test_no_early_hint(self, path: str, extensions: dict[str, Any]) -> None:
+        """Testing EarlyHintsMiddleware without server support and for API"""
+        messages = await self._call(path, extensions)
+        assert [message["type"] for message in messages] == ["http.response.start"]
+
+
+def test_access_log(caplog: pytest.LogCaptureFixture) -> None:
+    """Testing AccessLogMiddleware"""
+    app = FastAPI(middleware=[Middleware(AccessLogMiddleware)])
+
+    @app.get("/ok")
+    async def ok() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    with caplog.at_level(logging.INFO, logger="gitlab-wh.access"):
+        TestClient(app).get("/ok", params={"a": "1"})
+    [record] = [record for record in caplog.records if record.name == "gitlab-wh.access"]
+    assert '"GET /ok?a=1 HTTP/1.1" 200 OK' in record.getMessage()
+    assert record.status_code == 200  # type: ignore[attr-defined]  # noqa: PLR2004
+    assert record.path == "/ok"  # type: ignore[attr-defined]
+    assert isinstance(record.duration_ms, float)  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio()
+async def test_access_log_no_response(caplog: pytest.LogCaptureFixture) -> None:
+    """Testing AccessLogMiddleware when the application did not start a response"""
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+        return
+
+    async def receive() -> Message:
+        return {"type": "http.disconnect"}
+
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"", "http_version": "1.1"}
+    with caplog.at_level(logging.INFO, logger="gitlab-wh.access"):
+        await AccessLogMiddleware(app)(scope, receive, send)
+    assert not messages
+    [record] = [record for record in caplog.records if record.name == "gitlab-wh.access"]
+    assert record.status_code == -1  # type: ignore[attr-defined]
+
+
+def test_access_log_sampler(caplog: pytest.LogCaptureFixture) -> None:
+    """Testing AccessLogMiddleware with sampler"""
+    app = FastAPI(middleware=[Middleware(AccessLogMiddleware, sampler=AccessLogSampler({"/skip": (0.0, 0)}))])
+
+    @app.get("/skip")
+    async def skip() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    with caplog.at_level(logging.INFO, logger="gitlab-wh.access"):
+        TestClient(app).get("/skip")
+    assert not [record for record in caplog.records if record.name == "gitlab-wh.access"]
@@ -0,0 +1,47 @@
+from src.app.page_cache import RenderedPageCache, etag_matches, make_page_cache_key
+from src.models.pages.alert import Alert
+
+
+class TestRenderedPageCache:
+    """Testing class RenderedPageCache"""
+
+    def test_get_put(self) -> None:
+        """Testing RenderedPageCache.get and RenderedPageCache.put"""
+        cache = RenderedPageCache(max_bytes=100)
+        assert cache.get("key") is None
+        page = cache.put("key", b"<html></html>")
+        assert cache.get("key") == page
+        assert page.etag.startswith('"')
+        assert page.etag == cache.put("other", b"<html></html>").etag
+
+    def test_eviction(self) -> None:
+        """Testing RenderedPageCache eviction by size"""
+        cache = RenderedPageCache(max_bytes=10)
+        cache.put("first", b"12345")
+        cache.put("second", b"12345")
+        cache.get("first")
+        cache.put("third", b"12345")
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.size == 10  # noqa: PLR2004
+
+        cache.put("too_big", b"12345678901")
+        assert cache.get("too_big") is None
+
+
+def test_make_page_cache_key() -> None:
+    """Testing make_page_cache_key"""
+    key = make_page_cache_key("index.html.j2", {"a": 1, "alert": Alert("info", "msg")})
+    assert key == make_page_cache_key("index.html.j2", {"alert": Alert("info", "msg"), "a": 1})
+    assert key != make_page_cache_key("index.html.j2", {"a": 2, "alert": Alert("info", "msg")})
+    assert make_page_cache_key("index.html.j2", {"a": object()}) is None
+
+
+def test_etag_matches() -> None:
+    """Testing etag_matches"""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"other", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"other"', '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.app.profiler import ProfileBusyError, SamplingProfiler
+
+
+def busy_loop(seconds: float) -> None:
+    """Занимает поток на `seconds` секунд"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+class TestSamplingProfiler:
+    """Testing class SamplingProfiler"""
+
+    @pytest.mark.asyncio()
+    async def test_profile(self) -> None:
+        """Testing SamplingProfiler.profile"""
+        async def blocking_task() -> None:
+            await asyncio.sleep(0.02)
+            busy_loop(0.1)
+
+        async def waiting_task() -> None:
+            await asyncio.sleep(1)
+
+        profiler = SamplingProfiler(interval=0.001, task_interval=0.01)
+        waiting = asyncio.create_task(waiting_task())
+        blocking = asyncio.create_task(blocking_task())
+        result = await profiler.profile(0.2)
+        await blocking
+        waiting.cancel()
+
+        assert result.samples > 0
+        assert any(stack.endswith("tests.app.test_profiler:busy_loop") for stack in result.stacks)
+        assert result.collapsed().splitlines()[0].rsplit(" ", 1)[1].isdigit()
+        assert any(task.startswith("TestSamplingProfiler.test_profile.<locals>.waiting_task") for task in result.tasks)
+
+    @pytest.mark.asyncio()
+    async def test_profile_busy(self) -> None:
+        """Testing SamplingProfiler.profile while another profile is running"""
+        profiler = SamplingProfiler(interval=0.01)
+        running = asyncio.create_task(profiler.profile(0.05))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfileBusyError):
+            await profiler.profile(0.05)
+        await running
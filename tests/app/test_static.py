@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import gzip
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.assets import AssetManifest
+from src.app.static import PrecompressedStaticFiles, parse_accept_encoding, precompress
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CSS = b"body { color: red; }\n" * 200
+
+
+@pytest.fixture()
+def static_client(tmp_path: Path) -> TestClient:
+    """Возвращает клиент приложения, раздающего статику из временной директории со сжатыми копиями"""
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "style.css").write_bytes(CSS)
+    precompress(tmp_path)
+    app = FastAPI()
+    static_files = PrecompressedStaticFiles(directory=tmp_path, manifest=AssetManifest.from_directory(tmp_path))
+    app.mount("/static", static_files, name="static")
+    return TestClient(app)
+
+
+def test_parse_accept_encoding() -> None:
+    """Testing parse_accept_encoding"""
+    assert parse_accept_encoding("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert parse_accept_encoding("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert parse_accept_encoding("") == set()
+
+
+def test_precompress(tmp_path: Path) -> None:
+    """Testing precompress"""
+    (tmp_path / "style.css").write_bytes(CSS)
+    (tmp_path / "small.css").write_bytes(b"a{}")
+    assert precompress(tmp_path) >= 1
+    assert gzip.decompress((tmp_path / "style.css.gz").read_bytes()) == CSS
+    assert not (tmp_path / "small.css.gz").exists()
+
+
+class TestPrecompressedStaticFiles:
+    """Testing class PrecompressedStaticFiles"""
+
+    def test_gzip(self, static_client: TestClient) -> None:
+        """Testing PrecompressedStaticFiles.get_response with gzip"""
+        response = static_client.get("/static/css/style.css", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200  # noqa: PLR2004
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Content-Type"].startswith("text/css")
+        assert int(response.headers["Content-Length"]) < len(CSS)
+        assert response.content == CSS
+
+    def test_identity(self, static_client: TestClient) -> None:
+        """Testing PrecompressedStaticFiles.get_response without compression"""
+        response = static_client.get("/static/css/style.css", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.content == CSS
+
+    def test_not_modified(self, static_client: TestClient) -> None:
+        """Testing PrecompressedStaticFiles.get_response with If-None-Match"""
+        headers = {"Accept-Encoding": "gzip"}
+        etag = static_client.get("/static/css/style.css", headers=headers).headers["ETag"]
+        response = static_client.get("/static/css/style.css", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304  # noqa: PLR2004
+
+    def test_fingerprinted(self, static_client: TestClient, tmp_path: Path) -> None:
+        """Testing PrecompressedStaticFiles.get_response with content hash in path"""
+        url = AssetManifest.from_directory(tmp_path).url("css/style.css")
+        identity = static_client.get(url, headers={"Accept-Encoding": "identity"})
+        assert identity.status_code == 200  # noqa: PLR2004
+        assert identity.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert identity.content == CSS
+
+        compressed = static_client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["ETag"] != identity.headers["ETag"]
+        assert not compressed.headers["ETag"].startswith("W/")
+
+        headers = {"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+        response = static_client.get(url, headers=headers)
+        assert response.status_code == 304  # noqa: PLR2004
+
+    def test_fingerprinted_outdated(self, static_client: TestClient) -> None:
+        """Testing PrecompressedStaticFiles.get_response with outdated content hash"""
+        assert static_client.get("/static/css/style.0000000000000000.css").status_code == 404  # noqa: PLR2004
+
+    def test_stale_variant(self, tmp_path: Path) -> None:
+        """Testing PrecompressedStaticFiles.get_response skips compressed copy older than the file"""
+        (tmp_path / "style.css").write_bytes(CSS)
+        precompress(tmp_path)
+        changed = CSS.replace(b"red", b"blue")
+        (tmp_path / "style.css").write_bytes(changed)
+        original_mtime = (tmp_path / "style.css").stat().st_mtime
+        os.utime(tmp_path / "style.css.gz", (original_mtime - 10, original_mtime - 10))
+
+        manifest = AssetManifest.from_directory(tmp_path)
+        app = FastAPI()
+        app.mount("/static", PrecompressedStaticFiles(directory=tmp_path, manifest=manifest), name="static")
+        client = TestClient(app)
+        for url in ("/static/style.css", manifest.url("style.css")):
+            response = client.get(url, headers={"Accept-Encoding": "gzip"})
+            assert "Content-Encoding" not in response.headers
+            assert response.content == changed
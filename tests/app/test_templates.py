@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import Request
+from jinja2 import FileSystemBytecodeCache
+
+from src import config
+from src.app.templates import CommonTemplateResponseGenerator, create_bytecode_cache
+from src.app.timing import start_request_timing, stop_request_timing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestCommonTemplateResponseGenerator:
+    """Testing class CommonTemplateResponseGenerator"""
+
+    def test_precompile(self) -> None:
+        """Testing CommonTemplateResponseGenerator.precompile"""
+        templates_count = len(list(config.HTML_TEMPLATES_FOLDER_PATH.rglob("*.j2")))
+        assert CommonTemplateResponseGenerator.precompile() == templates_count
+
+    @pytest.mark.asyncio()
+    async def test_generate_streaming_response(self) -> None:
+        """Testing CommonTemplateResponseGenerator.generate_streaming_response"""
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+        generator = CommonTemplateResponseGenerator(request, "pages/common")
+        response = generator.generate_streaming_response("index.html.j2")
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert len(chunks) > 1
+        assert "</head>" in chunks[0]
+        assert "<nav" not in chunks[0]
+
+        expected = CommonTemplateResponseGenerator(request, "pages/common").generate_response("index.html.j2")
+        assert "".join(map(str, chunks)).encode() == expected.body
+
+    @pytest.mark.asyncio()
+    async def test_streaming_render_span(self) -> None:
+        """Testing render span of streaming response lasts until the last chunk"""
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+        timing, token = start_request_timing()
+        try:
+            response = CommonTemplateResponseGenerator(request, "pages/common").generate_streaming_response(
+                "index.html.j2",
+            )
+            assert not timing.spans
+            chunks = [chunk async for chunk in response.body_iterator]
+        finally:
+            stop_request_timing(token)
+        assert chunks
+        assert [span.name for span in timing.spans] == ["render"]
+
+    def test_render_critical_css(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Testing base.html.j2 with inlined critical CSS"""
+        monkeypatch.setitem(CommonTemplateResponseGenerator._templates.env.globals, "critical_css", ".navbar{}")  # noqa: SLF001
+        html = CommonTemplateResponseGenerator.render("pages/common/index.html.j2", {})
+        assert "<style>.navbar{}</style>" in html
+        assert 'rel="preload" as="style"' in html
+        assert "<noscript>" in html
+
+
+def test_create_bytecode_cache(tmp_path: Path) -> None:
+    """Testing create_bytecode_cache"""
+    assert create_bytecode_cache("") is None
+    cache_path = tmp_path / "jinja"
+    assert isinstance(create_bytecode_cache(cache_path), FileSystemBytecodeCache)
+    assert cache_path.is_dir()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from src import config
+from src.app.middleware import ServerTimingMiddleware
+from src.app.timing import (
+    RequestTiming,
+    get_request_timing,
+    observe_http_call,
+    start_request_timing,
+    stop_request_timing,
+    timing_span,
+)
+from src.repository.http_requests.base import HTTPCall
+
+CALL = HTTPCall("GET", "/api/v4/projects", 200, duration=0.02, decode_duration=0.005, size=100)
+
+
+class TestRequestTiming:
+    """Testing class RequestTiming"""
+
+    def test_server_timing(self) -> None:
+        """Testing RequestTiming.server_timing"""
+        timing = RequestTiming()
+        start = timing.start_time
+        timing.add("gitlab", start, start + 0.010)
+        timing.add("gitlab", start + 0.010, start + 0.015)
+        timing.add("render", start + 0.015, start + 0.017)
+        assert timing.server_timing(start + 0.020) == (
+            'gitlab;dur=15.0;desc="2", render;dur=2.0;desc="1", total;dur=20.0'
+        )
+
+    def test_format_tree(self) -> None:
+        """Testing RequestTiming.format_tree"""
+        timing = RequestTiming()
+        start = timing.start_time
+        timing.add("json", start + 0.002, start + 0.003, "/api/v4/projects", 1)
+        timing.add("gitlab", start, start + 0.003, "GET /api/v4/projects")
+        lines = timing.format_tree().splitlines()
+        assert lines[0].endswith("gitlab GET /api/v4/projects")
+        assert lines[1].startswith("  ")
+        assert lines[1].endswith("json /api/v4/projects")
+
+
+def test_timing_span() -> None:
+    """Testing timing_span and observe_http_call nesting"""
+    timing, token = start_request_timing()
+    try:
+        with timing_span("dashboard"):
+            observe_http_call(CALL)
+    finally:
+        stop_request_timing(token)
+    assert get_request_timing() is None
+    assert [(span.name, span.depth) for span in timing.spans] == [("gitlab", 1), ("json", 2), ("dashboard", 0)]
+    assert timing.spans[0].duration == pytest.approx(15, abs=0.1)
+
+
+def test_timing_span_outside_request() -> None:
+    """Testing timing_span and observe_http_call without request timing"""
+    with timing_span("render"):
+        observe_http_call(CALL)
+    assert get_request_timing() is None
+
+
+def test_server_timing_middleware(caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Testing ServerTimingMiddleware"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    app = FastAPI(middleware=[Middleware(ServerTimingMiddleware, debug=True)])
+
+    @app.get("/")
+    async def index() -> PlainTextResponse:
+        observe_http_call(CALL)
+        with timing_span("render", "index.html.j2"):
+            return PlainTextResponse("ok")
+
+    with caplog.at_level(logging.INFO, logger="gitlab-wh.timing"):
+        response = TestClient(app).get("/", headers={"X-Service-Token": "secret"})
+    metrics = [metric.split(";")[0] for metric in response.headers["Server-Timing"].split(", ")]
+    assert metrics == ["gitlab", "json", "render", "total"]
+    assert any("render index.html.j2" in record.getMessage() for record in caplog.records)
+
+    assert "Server-Timing" not in TestClient(app).get("/").headers
+    assert "Server-Timing" not in TestClient(app).get("/", headers={"X-Service-Token": "wrong"}).headers
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from src.app.budget import GitLabBudget, gitlab_job
+from src.dashboard.collector import JOB, DashboardCollector
+from src.repository.http_requests.base import HTTPCall
+from src.repository.http_requests.fake_http import FakeClientSession, FakeResponse
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
+TODAY = datetime.now(UTC).date()
+
+
+class RoutingFakeClientSession(FakeClientSession):
+    """FakeClientSession с ответами по URL-адресу"""
+    def __init__(self, responses: dict[str, FakeResponse[Any]]) -> None:
+        """Конструктор
+
+        Args:
+            responses: ответы по URL-адресу
+        """
+        super().__init__()
+        self.responses = responses
+
+    def fake_request(self, _url: str, *_args: Any, **_kwargs: Any) -> FakeResponse[Any]:
+        """Mock ClientSession.get"""
+        return self.responses[_url]
+
+    get = fake_request  # type: ignore[assignment]
+
+
+def create_session(users: list[dict[str, Any]]) -> RoutingFakeClientSession:
+    """Fake GitLab с группами, репозиториями, токенами и пользователями"""
+    return RoutingFakeClientSession({
+        "/api/v4/groups": FakeResponse([{"id": 1}], headers={"X-Total": "7"}),
+        "/api/v4/projects": FakeResponse(
+            [{"id": 5, "name_with_namespace": "group / project", "last_activity_at": "2024-02-13T21:50:44.824Z"}],
+            headers={"X-Total": "42"},
+        ),
+        "/api/v4/personal_access_tokens": FakeResponse(
+            [
+                {"name": "later", "user_id": 2, "expires_at": str(TODAY + timedelta(days=5))},
+                {"name": "sooner", "user_id": 3, "expires_at": str(TODAY + timedelta(days=1))},
+            ],
+            headers={"X-Total-Pages": "1"},
+        ),
+        "/api/v4/users": FakeResponse(users, headers={"X-Total": "3", "X-Total-Pages": "1"}),
+    })
+
+
+USERS: list[dict[str, Any]] = [
+    {"username": "active", "name": "A", "web_url": "", "last_activity_on": str(TODAY), "bot": False},
+    {"username": "never", "name": "N", "web_url": "", "last_activity_on": None, "bot": False},
+    {"username": "old", "name": "O", "web_url": "", "last_activity_on": str(TODAY - timedelta(days=200)),
+     "bot": False},
+    {"username": "bot", "name": "B", "web_url": "", "last_activity_on": None, "bot": True},
+]
+
+
+class TestDashboardCollector:
+    """Testing class DashboardCollector"""
+
+    @pytest.mark.asyncio()
+    async def test_refresh(self) -> None:
+        """Testing DashboardCollector.refresh"""
+        session = create_session(USERS)
+        collector = DashboardCollector(lambda: GitLabHTTPv4(session))
+        snapshot = await collector.refresh()
+
+        assert snapshot is not None
+        assert collector.snapshot is snapshot
+        assert snapshot.groups_count == 7  # noqa: PLR2004
+        assert snapshot.projects_count == 42  # noqa: PLR2004
+        assert snapshot.active_users_count == 3  # noqa: PLR2004
+        assert [project["id"] for project in snapshot.recent_projects] == [5]
+        assert [token["name"] for token in snapshot.expiring_tokens] == ["sooner", "later"]
+        assert [user["username"] for user in snapshot.inactive_users] == ["never", "old"]
+        assert snapshot.inactive_users_count == 2  # noqa: PLR2004
+        assert snapshot.users_updated_at is not None
+
+    @pytest.mark.asyncio()
+    async def test_refresh_incremental(self) -> None:
+        """Testing DashboardCollector.refresh reuses inactive users until the full refresh"""
+        session = create_session(USERS)
+        collector = DashboardCollector(lambda: GitLabHTTPv4(session), full_refresh_interval=3600)
+        first = await collector.refresh()
+        session.responses["/api/v4/users"] = FakeResponse([], headers={"X-Total": "0", "X-Total-Pages": "1"})
+        second = await collector.refresh()
+
+        assert first is not None
+        assert second is not None
+        assert second.active_users_count == 0
+        assert second.inactive_users == first.inactive_users
+        assert second.users_updated_at == first.users_updated_at
+
+        third = await collector.refresh(full=True)
+        assert third is not None
+        assert third.inactive_users_count == 0
+
+    @pytest.mark.asyncio()
+    async def test_refresh_not_configured(self) -> None:
+        """Testing DashboardCollector.refresh without GitLab"""
+        collector = DashboardCollector(lambda: None)
+        assert await collector.refresh() is None
+        assert collector.snapshot is None
+
+    @pytest.mark.asyncio()
+    async def test_to_context(self) -> None:
+        """Testing DashboardSnapshot.to_context"""
+        collector = DashboardCollector(lambda: GitLabHTTPv4(create_session(USERS)))
+        snapshot = await collector.refresh()
+        assert snapshot is not None
+
+        context = snapshot.to_context()
+        assert isinstance(context["updated_at"], str)
+        assert isinstance(context["inactive_users"], list)
+
+    @pytest.mark.asyncio()
+    async def test_start_close(self) -> None:
+        """Testing DashboardCollector.start and DashboardCollector.close"""
+        session = create_session(USERS)
+        collector = DashboardCollector(lambda: GitLabHTTPv4(session), refresh_interval=60)
+        collector.start()
+        await collector.close()
+        collector.start()
+        await collector.close()
+
+    @pytest.mark.asyncio()
+    async def test_over_budget(self) -> None:
+        """Testing DashboardCollector postpones refresh when the dashboard job is over budget"""
+        budget = GitLabBudget(rate_limit_reserve=0.5)
+        budget.observe_http_call(HTTPCall("GET", "/projects", 200, 0.1, 0.0, 2, rate_limit=10, rate_limit_remaining=1))
+        session = create_session(USERS)
+        collector = DashboardCollector(lambda: GitLabHTTPv4(session), refresh_interval=60, budget=budget)
+        collector.start()
+        await asyncio.sleep(0.05)
+        await collector.close()
+        assert collector.snapshot is None
+
+    @pytest.mark.asyncio()
+    async def test_over_budget_mid_refresh(self) -> None:
+        """Testing DashboardCollector.refresh skips the full user scan when the budget runs out mid-refresh"""
+        budget = GitLabBudget(limits={JOB: 3})
+        GitLabHTTPv4.add_observer(budget.observe_http_call)
+        try:
+            collector = DashboardCollector(lambda: GitLabHTTPv4(create_session(USERS)), budget=budget)
+            with gitlab_job(JOB):
+                snapshot = await collector.refresh()
+        finally:
+            GitLabHTTPv4.remove_observer(budget.observe_http_call)
+
+        assert snapshot is not None
+        assert snapshot.groups_count == 7  # noqa: PLR2004
+        assert snapshot.inactive_users_count is None
+        assert snapshot.users_updated_at is None
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from src.dependencies.gitlab import GitLabHealthProbe
+from src.repository.http_requests.fake_http import FakeClientSession
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
+
+class CountingGitLabHTTP(GitLabHTTPv4):
+    """GitLabHTTPv4 со счетчиком проверок доступности"""
+    checks = 0
+
+    async def check(self) -> bool:
+        """Считает вызовы GitLabHTTPv4.check"""
+        type(self).checks += 1
+        await asyncio.sleep(0.01)
+        return await super().check()
+
+
+class UnreachableGitLabHTTP(GitLabHTTPv4):
+    """GitLabHTTPv4 без соединения с GitLab"""
+
+    async def check(self) -> bool:
+        """Всегда ошибка соединения"""
+        raise ClientConnectionError
+
+
+class InvalidJSONGitLabHTTP(GitLabHTTPv4):
+    """GitLabHTTPv4, которому GitLab отвечает не JSON"""
+
+    async def check(self) -> bool:
+        """Всегда ошибка разбора JSON"""
+        return bool(json.loads("<html>"))
+
+
+class TestGitLabHealthProbe:
+    """Testing class GitLabHealthProbe"""
+
+    @pytest.mark.asyncio()
+    async def test_check_shared(self) -> None:
+        """Testing GitLabHealthProbe.check shares one probe between callers"""
+        CountingGitLabHTTP.checks = 0
+        gitlab_http = CountingGitLabHTTP(FakeClientSession(data=[{"id": 1}]))
+        probe = GitLabHealthProbe(lambda: gitlab_http, ttl=60)
+        results = await asyncio.gather(*(probe.check() for _ in range(5)))
+        assert await probe.check() is results[0]
+        assert CountingGitLabHTTP.checks == 1
+        assert results[0] is not None
+        assert results[0].available
+
+    @pytest.mark.asyncio()
+    async def test_check_expired(self) -> None:
+        """Testing GitLabHealthProbe.check after ttl"""
+        CountingGitLabHTTP.checks = 0
+        gitlab_http = CountingGitLabHTTP(FakeClientSession(data=[{"id": 1}]))
+        probe = GitLabHealthProbe(lambda: gitlab_http, ttl=0)
+        await probe.check()
+        await probe.check()
+        assert CountingGitLabHTTP.checks == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_check_unavailable(self) -> None:
+        """Testing GitLabHealthProbe.check with connection error"""
+        probe = GitLabHealthProbe(lambda: UnreachableGitLabHTTP(FakeClientSession()))
+        health = await probe.check()
+        assert health is not None
+        assert not health.available
+
+    @pytest.mark.asyncio()
+    async def test_check_invalid_json(self) -> None:
+        """Testing GitLabHealthProbe.check with invalid JSON body: unavailable, and the result is cached"""
+        probe = GitLabHealthProbe(lambda: InvalidJSONGitLabHTTP(FakeClientSession()), ttl=60)
+        health = await probe.check()
+        assert health is not None
+        assert not health.available
+        assert await probe.check() is health
+
+    @pytest.mark.asyncio()
+    async def test_check_not_configured(self) -> None:
+        """Testing GitLabHealthProbe.check without GitLab"""
+        assert await GitLabHealthProbe(lambda: None).check() is None
@@ -0,0 +1,572 @@
+"""Локальный fake GitLab API для тестов и бенчмарков без настоящего GitLab
+
+В отличие от `FakeClientSession`, который на любой запрос возвращает один и тот же ответ, `FakeGitLab` -
+настоящий HTTP сервер (aiohttp test server) с состоянием: группы, репозитории, пользователи, участники
+и токены. Он отдает заголовки offset пагинации как GitLab (без `X-Total` и `X-Total-Pages` для списков
+больше 10 000 записей), поддерживает keyset пагинацию, заголовки `RateLimit-*` с ответом 429 при
+превышении лимита и задержку ответа со случайным разбросом.
+
+Пример:
+    async with FakeGitLab(FakeGitLabData.generate(projects=500), latency=0.01) as fake_gitlab:
+        async with fake_gitlab.session() as session:
+            projects = await GitLabHTTPv4(session).list_projects()
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Self
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+
+    from yarl import URL
+
+    Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+MAX_COUNTED_RECORDS = 10_000  # для списков длиннее GitLab не возвращает X-Total и X-Total-Pages
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+FAKE_TOKEN = "fake-gitlab-token"  # noqa: S105
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+
+Record = dict[str, Any]
+
+
+def _timestamp(days: float) -> str:
+    """Время в формате GitLab через `days` дней после начала данных"""
+    return (_EPOCH + timedelta(days=days)).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(slots=True)
+class FakeGitLabData:
+    """Состояние fake GitLab: записи в том виде, в котором их возвращает GitLab API
+
+    Участники групп и репозиториев хранятся как уровни доступа по id пользователя,
+    токены групп и репозиториев - по id группы или репозитория.
+    """
+    base_url: str = "http://gitlab.example.com"
+    groups: list[Record] = field(default_factory=list)
+    projects: list[Record] = field(default_factory=list)
+    users: list[Record] = field(default_factory=list)
+    group_members: dict[int, dict[int, int]] = field(default_factory=dict)
+    project_members: dict[int, dict[int, int]] = field(default_factory=dict)
+    personal_access_tokens: list[Record] = field(default_factory=list)
+    group_access_tokens: dict[int, list[Record]] = field(default_factory=dict)
+    project_access_tokens: dict[int, list[Record]] = field(default_factory=dict)
+
+    @classmethod
+    def generate(cls,
+                 *,
+                 groups: int = 10,
+                 projects: int = 100,
+                 users: int = 100,
+                 members: int = 10,
+                 tokens: int = 1,
+                 seed: int = 0,
+                 ) -> FakeGitLabData:
+        """Сгенерировать данные
+
+        Args:
+            groups: количество групп (каждая пятая - подгруппа предыдущей группы верхнего уровня)
+            projects: количество репозиториев (распределяются по группам по кругу)
+            users: количество пользователей (кроме администратора, каждый десятый - бот)
+            members: количество участников в каждой группе и каждом репозитории
+            tokens: количество Personal Access Token у каждого пользователя, Group/Project Access Token
+                у каждой группы и репозитория
+            seed: зерно генератора (одинаковые параметры - одинаковые данные)
+
+        Returns:
+            Данные fake GitLab
+        """
+        rng = random.Random(seed)
+        data = cls()
+        data.add_user("root", "Administrator", is_admin=True)
+        for index in range(users):
+            data.add_user(f"user{index}", f"User {index}", bot=(index + 1) % 10 == 0, days=rng.uniform(0, 365))
+
+        top_level_id = None
+        for index in range(groups):
+            parent_id = top_level_id if index % 5 == 4 else None  # noqa: PLR2004
+            group = data.add_group(f"Group {index}", f"group-{index}", parent_id=parent_id)
+            top_level_id = top_level_id if parent_id else group["id"]
+
+        for index in range(projects):
+            namespace = data.groups[index % len(data.groups)] if data.groups else None
+            data.add_project(f"Project {index}", f"project-{index}", namespace, days=rng.uniform(0, 365))
+
+        user_ids = [user["id"] for user in data.users]
+        for members_by_id in (*data.group_members.values(), *data.project_members.values()):
+            for user_id in rng.sample(user_ids, min(members, len(user_ids))):
+                members_by_id[user_id] = rng.choice((10, 20, 30, 40, 50))
+
+        for user in data.users:
+            for index in range(tokens):
+                data.personal_access_tokens.append(
+                    data.make_token(f"token-{index}", user["id"], expires_in_days=rng.randint(-30, 365)),
+                )
+        for owner_id, owner_tokens in (*data.group_access_tokens.items(), *data.project_access_tokens.items()):
+            owner_tokens.extend(
+                {**data.make_token(f"bot-token-{index}", owner_id, expires_in_days=365), "access_level": 30}
+                for index in range(tokens)
+            )
+        return data
+
+    def add_user(self,
+                 username: str,
+                 name: str,
+                 *,
+                 is_admin: bool = False,
+                 bot: bool = False,
+                 days: float = 0,
+                 ) -> Record:
+        """Добавить пользователя
+
+        Args:
+            username: никнейм
+            name: имя
+            is_admin: администратор
+            bot: бот (Project/Group Access Token)
+            days: сколько дней назад (от конца года) пользователь был активен
+
+        Returns:
+            Пользователь в формате GitLab API для администратора
+        """
+        user_id = len(self.users) + 1
+        user = {
+            "id": user_id,
+            "username": username,
+            "name": name,
+            "state": "active" if user_id % 20 else "blocked",
+            "locked": False,
+            "avatar_url": f"https://www.gravatar.com/avatar/{user_id:032x}?s=80&d=identicon",
+            "web_url": f"{self.base_url}/{username}",
+            "created_at": _timestamp(0),
+            "bio": "",
+            "email": f"{username}@example.com",
+            "is_admin": is_admin,
+            "bot": bot,
+            "last_activity_on": str((_EPOCH + timedelta(days=365 - days)).date()),
+        }
+        self.users.append(user)
+        return user
+
+    def add_group(self, name: str, path: str, *, parent_id: int | None = None) -> Record:
+        """Добавить группу
+
+        Args:
+            name: имя группы
+            path: путь группы
+            parent_id: id родительской группы, None - группа верхнего уровня
+
+        Returns:
+            Группа в формате GitLab API
+        """
+        group_id = len(self.groups) + 1
+        parent = self.groups[parent_id - 1] if parent_id else None
+        full_path = f"{parent['full_path']}/{path}" if parent else path
+        group = {
+            "id": group_id,
+            "name": name,
+            "path": path,
+            "description": f"Fake group {name}",
+            "visibility": "private",
+            "full_name": f"{parent['full_name']} / {name}" if parent else name,
+            "full_path": full_path,
+            "parent_id": parent_id,
+            "web_url": f"{self.base_url}/groups/{full_path}",
+            "created_at": _timestamp(group_id),
+        }
+        self.groups.append(group)
+        self.group_members[group_id] = {}
+        self.group_access_tokens[group_id] = []
+        return group
+
+    def add_project(self, name: str, path: str, namespace: Record | None = None, *, days: float = 0) -> Record:
+        """Добавить репозиторий
+
+        Args:
+            name: имя репозитория
+            path: путь репозитория
+            namespace: группа репозитория, None - пространство администратора
+            days: через сколько дней после начала данных репозиторий создан
+
+        Returns:
+            Репозиторий в формате GitLab API
+        """
+        project_id = len(self.projects) + 1
+        namespace_path = namespace["full_path"] if namespace else "root"
+        namespace_name = namespace["full_name"] if namespace else "Administrator"
+        path_with_namespace = f"{namespace_path}/{path}"
+        project = {
+            "id": project_id,
+            "description": f"Fake project {name}",
+            "name": name,
+            "name_with_namespace": f"{namespace_name} / {name}",
+            "path": path,
+            "path_with_namespace": path_with_namespace,
+            "created_at": _timestamp(days),
+            "last_activity_at": _timestamp(days + 1),
+            "default_branch": "main",
+            "topics": [],
+            "ssh_url_to_repo": f"git@gitlab.example.com:{path_with_namespace}.git",
+            "http_url_to_repo": f"{self.base_url}/{path_with_namespace}.git",
+            "web_url": f"{self.base_url}/{path_with_namespace}",
+            "forks_count": 0,
+            "star_count": 0,
+            "visibility": "private",
+            "archived": False,
+            "namespace": {
+                "id": namespace["id"] if namespace else 1,
+                "name": namespace_name,
+                "path": namespace["path"] if namespace else "root",
+                "kind": "group" if namespace else "user",
+                "full_path": namespace_path,
+                "parent_id": namespace["parent_id"] if namespace else None,
+            },
+            "_links": {
+                "self": f"{self.base_url}/api/v4/projects/{project_id}",
+                "members": f"{self.base_url}/api/v4/projects/{project_id}/members",
+            },
+        }
+        self.projects.append(project)
+        self.project_members[project_id] = {}
+        self.project_access_tokens[project_id] = []
+        return project
+
+    def make_token(self, name: str, user_id: int, *, expires_in_days: int) -> Record:
+        """Токен в формате GitLab API (истекает через `expires_in_days` дней после текущей даты)"""
+        expires_at = date.today() + timedelta(days=expires_in_days)
+        return {
+            "id": len(self.personal_access_tokens) + 1,
+            "name": name,
+            "revoked": False,
+            "created_at": _timestamp(0),
+            "scopes": ["api"],
+            "user_id": user_id,
+            "last_used_at": None,
+            "active": expires_in_days > 0,
+            "expires_at": str(expires_at),
+        }
+
+    def get_member(self, user_id: int, access_level: int) -> Record:
+        """Участник группы или репозитория в формате GitLab API"""
+        user = self.users[user_id - 1]
+        return {
+            key: user[key] for key in ("id", "username", "name", "state", "locked", "avatar_url", "web_url")
+        } | {"access_level": access_level, "created_at": user["created_at"], "expires_at": None}
+
+
+class FakeGitLab:
+    """Fake GitLab API на локальном HTTP сервере (`aiohttp.test_utils.TestServer`)
+
+    Ведет счетчики запросов (`requests`, `requests_by_path`) и одновременных запросов (`max_in_flight`),
+    чтобы тесты и бенчмарки могли проверять поведение клиента, а не только результат.
+    """
+    def __init__(self,
+                 data: FakeGitLabData | None = None,
+                 *,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 rate_limit: int = 0,
+                 rate_limit_period: float = 60.0,
+                 max_counted_records: int = MAX_COUNTED_RECORDS,
+                 seed: int = 0,
+                 ) -> None:
+        """Конструктор
+
+        Args:
+            data: состояние fake GitLab, None - данные `FakeGitLabData.generate()` по умолчанию
+            latency: задержка каждого ответа в секундах
+            jitter: случайная добавка к задержке от 0 до `jitter` секунд
+            rate_limit: количество запросов за `rate_limit_period`, после которого отвечать 429, 0 - без лимита
+            rate_limit_period: длина окна лимита запросов в секундах
+            max_counted_records: для списков длиннее не возвращать X-Total и X-Total-Pages
+            seed: зерно генератора задержек
+        """
+        self.data = data if data is not None else FakeGitLabData.generate()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_limit_period = rate_limit_period
+        self.max_counted_records = max_counted_records
+        self.requests = 0
+        self.requests_by_path: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._rng = random.Random(seed)
+        self._rate_limit_window_start = time.monotonic()
+        self._rate_limit_used = 0
+        self._server: TestServer | None = None
+
+    async def __aenter__(self) -> Self:
+        """Запустить сервер"""
+        await self.start()
+        return self
+
+    async def __aexit__(self,
+                        exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None,
+                        ) -> None:
+        """Остановить сервер"""
+        await self.close()
+
+    @property
+    def url(self) -> URL:
+        """Адрес сервера (без пути)"""
+        if self._server is None:
+            msg = "FakeGitLab is not started"
+            raise RuntimeError(msg)
+        return self._server.make_url("")
+
+    async def start(self) -> None:
+        """Запустить сервер на свободном порту localhost"""
+        if self._server is None:
+            self._server = TestServer(self._create_app())
+            await self._server.start_server()
+
+    async def close(self) -> None:
+        """Остановить сервер"""
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    def session(self, **kwargs: Any) -> ClientSession:
+        """Сессия aiohttp для запросов к серверу (как `GitLabConnection`: с базовым адресом и токеном)"""
+        return ClientSession(self.url, headers={"PRIVATE-TOKEN": FAKE_TOKEN}, **kwargs)
+
+    def reset_counters(self) -> None:
+        """Обнулить счетчики запросов и окно лимита запросов"""
+        self.requests = 0
+        self.requests_by_path.clear()
+        self.max_in_flight = self.in_flight
+        self._rate_limit_window_start = time.monotonic()
+        self._rate_limit_used = 0
+
+    def _create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/v4/projects", self._list_projects)
+        app.router.add_post("/api/v4/projects", self._create_project)
+        app.router.add_get("/api/v4/groups", self._list_groups)
+        app.router.add_post("/api/v4/groups", self._create_group)
+        app.router.add_get("/api/v4/users", self._list_users)
+        app.router.add_get("/api/v4/users/{user_id:\\d+}", self._get_user)
+        app.router.add_get("/api/v4/user", self._get_current_user)
+        app.router.add_get("/api/v4/personal_access_tokens", self._list_personal_access_tokens)
+        for kind in ("groups", "projects"):
+            app.router.add_get(f"/api/v4/{kind}/{{owner_id:\\d+}}/members", self._list_members)
+            app.router.add_post(f"/api/v4/{kind}/{{owner_id:\\d+}}/members", self._add_member)
+            app.router.add_get(f"/api/v4/{kind}/{{owner_id:\\d+}}/access_tokens", self._list_access_tokens)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        """Счетчики, задержка и лимит запросов"""
+        self.requests += 1
+        self.requests_by_path[request.path] = self.requests_by_path.get(request.path, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.latency + self._rng.uniform(0, self.jitter) if self.jitter else self.latency
+            if delay:
+                await asyncio.sleep(delay)
+            if not self.rate_limit:
+                return await handler(request)
+
+            headers = self._consume_rate_limit()
+            if self._rate_limit_used > self.rate_limit:
+                return web.json_response(
+                    {"message": "Retry later"},
+                    status=HTTPStatus.TOO_MANY_REQUESTS,
+                    headers={**headers, "Retry-After": headers["RateLimit-Reset-After"]},
+                )
+            response = await handler(request)
+            response.headers.update(headers)
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def _consume_rate_limit(self) -> dict[str, str]:
+        """Учесть запрос в окне лимита и вернуть заголовки `RateLimit-*`"""
+        now = time.monotonic()
+        if now - self._rate_limit_window_start >= self.rate_limit_period:
+            self._rate_limit_window_start = now
+            self._rate_limit_used = 0
+        self._rate_limit_used += 1
+        reset_after = math.ceil(self._rate_limit_window_start + self.rate_limit_period - now)
+        return {
+            "RateLimit-Limit": str(self.rate_limit),
+            "RateLimit-Observed": str(self._rate_limit_used),
+            "RateLimit-Remaining": str(max(0, self.rate_limit - self._rate_limit_used)),
+            "RateLimit-Reset": str(int(time.time()) + reset_after),
+            "RateLimit-Reset-After": str(reset_after),
+        }
+
+    def _paginate(self, request: web.Request, records: list[Record]) -> web.Response:
+        """Ответ со страницей записей: keyset (`pagination=keyset`) или offset пагинация"""
+        query = request.query
+        per_page = min(max(int(query.get("per_page", DEFAULT_PER_PAGE)), 1), MAX_PER_PAGE)
+        if query.get("pagination") == "keyset":
+            return self._paginate_keyset(request, records, per_page)
+
+        page = max(int(query.get("page", 1)), 1)
+        total = len(records)
+        total_pages = max(math.ceil(total / per_page), 1)
+        headers = {
+            "X-Page": str(page),
+            "X-Per-Page": str(per_page),
+            "X-Next-Page": str(page + 1) if page < total_pages else "",
+            "X-Prev-Page": str(page - 1) if page > 1 else "",
+        }
+        links = {"first": 1}
+        if page < total_pages:
+            links["next"] = page + 1
+        if page > 1:
+            links["prev"] = page - 1
+        if total <= self.max_counted_records:
+            headers["X-Total"] = str(total)
+            headers["X-Total-Pages"] = str(total_pages)
+            links["last"] = total_pages
+        headers["Link"] = ", ".join(
+            f'<{request.url.update_query(page=link_page)}>; rel="{rel}"' for rel, link_page in links.items()
+        )
+        return web.json_response(records[(page - 1) * per_page:page * per_page], headers=headers)
+
+    @staticmethod
+    def _paginate_keyset(request: web.Request, records: list[Record], per_page: int) -> web.Response:
+        """Keyset пагинация по id: следующая страница передается в заголовке Link (`rel="next"`)"""
+        query = request.query
+        descending = query.get("sort", "asc") == "desc"
+        ordered = sorted(records, key=lambda record: record["id"], reverse=descending)
+        if "id_after" in query:
+            ordered = [record for record in ordered if record["id"] > int(query["id_after"])]
+        if "id_before" in query:
+            ordered = [record for record in ordered if record["id"] < int(query["id_before"])]
+        chunk = ordered[:per_page]
+        headers = {}
+        if len(ordered) > per_page:
+            cursor = {"id_before" if descending else "id_after": chunk[-1]["id"]}
+            next_url = request.url.without_query_params("id_after", "id_before").update_query(cursor)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return web.json_response(chunk, headers=headers)
+
+    @staticmethod
+    def _sort(request: web.Request, records: list[Record], order_by: str, sort: str) -> list[Record]:
+        """Сортировка по `order_by` и `sort` из запроса (id - дополнительный ключ сортировки)"""
+        key = request.query.get("order_by", order_by)
+        reverse = request.query.get("sort", sort) == "desc"
+        return sorted(records, key=lambda record: (str(record.get(key) or ""), record["id"]), reverse=reverse)
+
+    @staticmethod
+    def _search(request: web.Request, records: list[Record], *fields: str) -> list[Record]:
+        """Фильтрация по подстроке `search` (или `query` для участников) в полях `fields`"""
+        search = (request.query.get("search") or request.query.get("query") or "").lower()
+        if not search:
+            return records
+        return [record for record in records if any(search in str(record[name]).lower() for name in fields)]
+
+    async def _list_projects(self, request: web.Request) -> web.Response:
+        projects = self._sort(request, self._search(request, self.data.projects, "name", "path"), "created_at", "desc")
+        if request.query.get("simple") == "true":
+            projects = [
+                {key: project[key] for key in ("id", "name", "path", "path_with_namespace", "web_url")}
+                for project in projects
+            ]
+        return self._paginate(request, projects)
+
+    async def _list_groups(self, request: web.Request) -> web.Response:
+        groups = self._sort(request, self._search(request, self.data.groups, "name", "path"), "name", "asc")
+        return self._paginate(request, groups)
+
+    async def _list_users(self, request: web.Request) -> web.Response:
+        users = self._search(request, self.data.users, "username", "name", "email")
+        if request.query.get("active") == "true":
+            users = [user for user in users if user["state"] == "active"]
+        if request.query.get("without_project_bots") == "true":
+            users = [user for user in users if not user["bot"]]
+        return self._paginate(request, self._sort(request, users, "id", "asc"))
+
+    async def _get_user(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info["user_id"])
+        if not 0 < user_id <= len(self.data.users):
+            return web.json_response({"message": "404 User Not Found"}, status=HTTPStatus.NOT_FOUND)
+        return web.json_response(self.data.users[user_id - 1])
+
+    async def _get_current_user(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.data.users[0])
+
+    async def _list_personal_access_tokens(self, request: web.Request) -> web.Response:
+        query = request.query
+        tokens = self._search(request, self.data.personal_access_tokens, "name")
+        if "revoked" in query:
+            tokens = [token for token in tokens if token["revoked"] == (query["revoked"] == "true")]
+        if "state" in query:
+            tokens = [token for token in tokens if token["active"] == (query["state"] == "active")]
+        if "expires_before" in query:
+            expires_before = query["expires_before"]
+            tokens = [token for token in tokens if token["expires_at"] and token["expires_at"] < expires_before]
+        if "user_id" in query:
+            tokens = [token for token in tokens if token["user_id"] == int(query["user_id"])]
+        return self._paginate(request, tokens)
+
+    def _get_members(self, request: web.Request) -> dict[int, int] | None:
+        """Участники группы или репозитория из пути запроса, None - группа или репозиторий не найдены"""
+        members = self.data.group_members if request.path.startswith("/api/v4/groups/") else self.data.project_members
+        return members.get(int(request.match_info["owner_id"]))
+
+    async def _list_members(self, request: web.Request) -> web.Response:
+        members = self._get_members(request)
+        if members is None:
+            return web.json_response({"message": "404 Not found"}, status=HTTPStatus.NOT_FOUND)
+        records = [self.data.get_member(user_id, access_level) for user_id, access_level in members.items()]
+        records = self._search(request, records, "username", "name")
+        if user_ids := request.query.getall("user_ids[]", []):
+            records = [record for record in records if str(record["id"]) in user_ids]
+        if skip_users := request.query.getall("skip_users[]", []):
+            records = [record for record in records if str(record["id"]) not in skip_users]
+        return self._paginate(request, records)
+
+    async def _add_member(self, request: web.Request) -> web.Response:
+        members = self._get_members(request)
+        body = await request.json()
+        user_id = int(body["user_id"])
+        if members is None or not 0 < user_id <= len(self.data.users):
+            return web.json_response({"message": "404 Not found"}, status=HTTPStatus.NOT_FOUND)
+        if user_id in members:
+            return web.json_response({"message": "Member already exists"}, status=HTTPStatus.CONFLICT)
+        members[user_id] = int(body["access_level"])
+        return web.json_response(self.data.get_member(user_id, members[user_id]), status=HTTPStatus.CREATED)
+
+    async def _list_access_tokens(self, request: web.Request) -> web.Response:
+        owner_tokens = (
+            self.data.group_access_tokens if request.path.startswith("/api/v4/groups/")
+            else self.data.project_access_tokens
+        )
+        tokens = owner_tokens.get(int(request.match_info["owner_id"]))
+        if tokens is None:
+            return web.json_response({"message": "404 Not found"}, status=HTTPStatus.NOT_FOUND)
+        return self._paginate(request, tokens)
+
+    async def _create_project(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        namespace_id = body.get("namespace_id")
+        namespace = self.data.groups[int(namespace_id) - 1] if namespace_id else None
+        project = self.data.add_project(body["name"], body.get("path") or body["name"], namespace)
+        return web.json_response(project, status=HTTPStatus.CREATED)
+
+    async def _create_group(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        parent_id = body.get("parent_id")
+        group = self.data.add_group(body["name"], body["path"], parent_id=int(parent_id) if parent_id else None)
+        return web.json_response(group, status=HTTPStatus.CREATED)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.repository.http_requests.gitlab import GitLabError, GitLabHTTPv4
+from tests.repository.http_requests.fake_gitlab import FakeGitLab, FakeGitLabData
+
+
+@pytest.mark.asyncio()
+class TestFakeGitLab:
+    """Testing class FakeGitLab"""
+
+    async def test_offset_pagination(self) -> None:
+        """Testing GitLabHTTPv4 pagination against FakeGitLab"""
+        async with FakeGitLab(FakeGitLabData.generate(projects=250, users=30)) as fake_gitlab, \
+                fake_gitlab.session() as session:
+            gitlab_http = GitLabHTTPv4(session)
+            projects = await gitlab_http.list_projects()
+            assert len(projects) == 250  # noqa: PLR2004
+            assert len({project["id"] for project in projects}) == 250  # noqa: PLR2004
+            assert fake_gitlab.requests_by_path["/api/v4/projects"] == 3  # noqa: PLR2004
+
+            page = await gitlab_http.list_projects_page(page=2, per_page=20)
+            assert (page.page, page.next_page, page.total) == (2, 3, 250)
+            assert await gitlab_http.count_users(without_project_bots=False) == 31  # noqa: PLR2004
+
+    async def test_uncounted_pagination(self) -> None:
+        """Testing GitLabHTTPv4 follows X-Next-Page when GitLab omits X-Total-Pages"""
+        fake_gitlab = FakeGitLab(FakeGitLabData.generate(projects=250, users=150), max_counted_records=100)
+        async with fake_gitlab, fake_gitlab.session() as session:
+            gitlab_http = GitLabHTTPv4(session)
+            projects = await gitlab_http.list_projects()
+            assert len(projects) == 250  # noqa: PLR2004
+            assert fake_gitlab.max_in_flight == 1
+            assert await gitlab_http.count_users() is None
+
+    async def test_keyset_pagination(self) -> None:
+        """Testing FakeGitLab keyset pagination through the Link header"""
+        async with FakeGitLab(FakeGitLabData.generate(projects=45)) as fake_gitlab, \
+                fake_gitlab.session() as session:
+            ids: list[int] = []
+            url = "/api/v4/projects?pagination=keyset&order_by=id&sort=asc&per_page=20"
+            while url:
+                async with session.get(url) as response:
+                    ids.extend(project["id"] for project in await response.json())
+                    url = str(response.links["next"]["url"]) if "next" in response.links else ""
+            assert ids == list(range(1, 46))
+
+    async def test_rate_limit(self) -> None:
+        """Testing FakeGitLab RateLimit headers and 429 responses"""
+        async with FakeGitLab(rate_limit=2) as fake_gitlab, fake_gitlab.session() as session:
+            gitlab_http = GitLabHTTPv4(session)
+            assert await gitlab_http.check()
+            async with session.get("/api/v4/user") as response:
+                assert response.headers["RateLimit-Remaining"] == "0"
+            with pytest.raises(GitLabError):
+                await gitlab_http.list_groups()
+            async with session.get("/api/v4/user") as response:
+                assert response.status == 429  # noqa: PLR2004
+                assert int(response.headers["Retry-After"]) > 0
+
+    @pytest.mark.parametrize("max_counted_records", [10_000, 100])
+    async def test_rate_limited_pagination(self, max_counted_records: int) -> None:
+        """Testing GitLabHTTPv4 pagination raises when a page in the middle of a listing gets 429"""
+        fake_gitlab = FakeGitLab(
+            FakeGitLabData.generate(projects=500), rate_limit=3, max_counted_records=max_counted_records,
+        )
+        async with fake_gitlab, fake_gitlab.session() as session:
+            with pytest.raises(GitLabError) as exc_info:
+                await GitLabHTTPv4(session).list_projects()
+        assert exc_info.value.args == ({"message": "Retry later"},)
+        assert fake_gitlab.requests <= 5  # noqa: PLR2004
+
+    async def test_latency(self) -> None:
+        """Testing FakeGitLab latency and concurrent page requests"""
+        async with FakeGitLab(FakeGitLabData.generate(projects=500), latency=0.05, jitter=0.01) as fake_gitlab, \
+                fake_gitlab.session() as session:
+            start_time = time.perf_counter()
+            projects = await GitLabHTTPv4(session).list_projects()
+            duration = time.perf_counter() - start_time
+        assert len(projects) == 500  # noqa: PLR2004
+        assert fake_gitlab.max_in_flight == 4  # noqa: PLR2004
+        assert 0.1 <= duration < 0.5  # noqa: PLR2004
+
+    async def test_members(self) -> None:
+        """Testing FakeGitLab keeps added members"""
+        async with FakeGitLab(FakeGitLabData.generate(groups=2, users=20, members=3)) as fake_gitlab, \
+                fake_gitlab.session() as session:
+            gitlab_http = GitLabHTTPv4(session)
+            members = await gitlab_http.list_group_members(1)
+            new_user_id = next(user["id"] for user in fake_gitlab.data.users if user["id"] not in
+                               {member["id"] for member in members})
+            assert await gitlab_http.add_user_to_group(1, new_user_id, 30) == new_user_id
+            members = await gitlab_http.list_group_members(1)
+            assert len(members) == 4  # noqa: PLR2004
+            assert len(await gitlab_http.list_group_access_tokens(2)) == 1
+            tokens, _ = await asyncio.gather(
+                gitlab_http.list_personal_access_tokens(state="active"),
+                gitlab_http.list_project_access_tokens(1),
+            )
+            assert len(tokens) == sum(token["active"] for token in fake_gitlab.data.personal_access_tokens)
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, ClassVar
 from uuid import uuid4
 
 import pytest
 from aiohttp import ClientSession
 
+from src.repository.http_requests.base import BaseHTTP
 from src.repository.http_requests.fake_http import FakeClientSession
-from src.repository.http_requests.gitlab import GitLabHTTPv4
+from src.repository.http_requests.gitlab import GitLabError, GitLabHTTPv4
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterator
+
+    from src.repository.http_requests.base import HTTPCall
 
 
 class TestGitLabHTTP:
@@ -57,6 +61,73 @@ class TestGitLabHTTP:
         gitlab_http = GitLabHTTPv4(fake_client_session)
         assert await gitlab_http.check() is expected
 
+    @pytest.mark.asyncio()
+    async def test_list_projects_page(self) -> None:
+        """Testing GitLabHTTP.list_projects_page"""
+        fake_client_session = FakeClientSession(data=[{"id": 1}], headers={"X-Next-Page": "3", "X-Total": "41"})
+        page = await GitLabHTTPv4(fake_client_session).list_projects_page(page=2, per_page=20)
+        assert [project["id"] for project in page.items] == [1]
+        assert page.page == 2  # noqa: PLR2004
+        assert page.next_page == 3  # noqa: PLR2004
+        assert page.total == 41  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_list_projects_page_last(self) -> None:
+        """Testing GitLabHTTP.list_projects_page on the last page without X-Total"""
+        fake_client_session = FakeClientSession(data=[], headers={"X-Next-Page": ""})
+        page = await GitLabHTTPv4(fake_client_session).list_projects_page()
+        assert page.next_page is None
+        assert page.total is None
+
+    @pytest.mark.asyncio()
+    async def test_list_projects_page_error(self) -> None:
+        """Testing GitLabHTTP.list_projects_page with GitLab error"""
+        fake_client_session = FakeClientSession(data={"message": "401 Unauthorized"}, status=401)
+        with pytest.raises(GitLabError):
+            await GitLabHTTPv4(fake_client_session).list_projects_page()
+
+
+    @pytest.mark.asyncio()
+    async def test_observers(self) -> None:
+        """Testing GitLabHTTP requests are passed to BaseHTTP observers"""
+        calls: list[HTTPCall] = []
+        BaseHTTP.add_observer(calls.append)
+        try:
+            fake_client_session = FakeClientSession(data=[{"id": 1}], headers={"X-Total-Pages": "1"})
+            await GitLabHTTPv4(fake_client_session).list_group_members(5)
+        finally:
+            BaseHTTP.remove_observer(calls.append)
+        [call] = calls
+        assert call.method == "GET"
+        assert call.endpoint == "/api/v4/groups/{id}/members"
+        assert call.page == 1
+        assert call.size == len(b'[{"id": 1}]')
+
+    @pytest.mark.asyncio()
+    async def test_pagination_error_body(self) -> None:
+        """Testing GitLabHTTP pagination raises on pages that are not lists instead of merging them"""
+        fake_client_session = FakeClientSession(data={"message": "error"}, headers={"X-Total-Pages": "2"})
+        with pytest.raises(GitLabError):
+            await GitLabHTTPv4(fake_client_session).list_projects()
+
+    @pytest.mark.asyncio()
+    async def test_pagination_trackers(self) -> None:
+        """Testing paginated GitLabHTTP requests run inside BaseHTTP pagination trackers"""
+        urls: list[str] = []
+
+        @contextmanager
+        def tracker(url: str) -> Iterator[None]:
+            urls.append(url)
+            yield
+
+        BaseHTTP.add_pagination_tracker(tracker)
+        try:
+            fake_client_session = FakeClientSession(data=[{"id": 1}], headers={"X-Total-Pages": "1"})
+            await GitLabHTTPv4(fake_client_session).list_group_members(5)
+            await GitLabHTTPv4(fake_client_session).check()
+        finally:
+            BaseHTTP.remove_pagination_tracker(tracker)
+        assert urls == ["/api/v4/groups/5/members"]
 
 @pytest.mark.integration()
 @pytest.mark.asyncio()
@@ -2,7 +2,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from src import config
+from src.app.memory import start_memory_tracing, stop_memory_tracing
+from src.dependencies.gitlab import GitLabHealthProbe, get_gitlab_health_probe
+from src.main import gitlab_wh
+from src.repository.http_requests.fake_http import FakeClientSession
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
 if TYPE_CHECKING:
+    import pytest
     from fastapi.testclient import TestClient
 
 
@@ -10,3 +18,92 @@ def test_ping(client: TestClient) -> None:
     """Test /tools/ping"""
     response = client.get("/api/service/ping")
     assert response.text == "pong"
+
+
+def test_metrics(client: TestClient) -> None:
+    """Test /api/service/metrics"""
+    client.get("/api/service/ping")
+    response = client.get("/api/service/metrics")
+    assert response.headers["Content-Type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert 'route="/api/service/ping",status="2xx"' in response.text
+    assert "# TYPE gitlab_wh_http_client_request_duration_seconds histogram" in response.text
+
+
+def test_profile(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/profile"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    response = client.get("/api/service/profile",
+                          params={"seconds": 0.05, "format": "collapsed"},
+                          headers={"X-Service-Token": "secret"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.headers["Content-Type"].startswith("text/plain")
+
+    response = client.get("/api/service/profile", params={"seconds": 0.05}, headers={"X-Service-Token": "secret"})
+    assert response.json()["seconds"] == 0.05  # noqa: PLR2004
+
+
+def test_profile_unauthorized(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/profile without a valid X-Service-Token"""
+    assert client.get("/api/service/profile").status_code == 403  # noqa: PLR2004
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    response = client.get("/api/service/profile", headers={"X-Service-Token": "wrong"})
+    assert response.status_code == 401  # noqa: PLR2004
+
+
+def test_profile_non_ascii_token(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/profile with a non-ASCII X-Service-Token"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    response = client.get("/api/service/profile", headers={b"X-Service-Token": b"secr\xe9t"})
+    assert response.status_code == 401  # noqa: PLR2004
+
+
+def test_loop_stats(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/loop"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    response = client.get("/api/service/loop", headers={"X-Service-Token": "secret"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert {"lag_last", "lag_max", "slow_callbacks"} <= response.json().keys()
+
+
+def test_budget(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/budget"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    response = client.get("/api/service/budget", headers={"X-Service-Token": "secret"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert isinstance(response.json(), list)
+    assert client.get("/api/service/budget").status_code == 401  # noqa: PLR2004
+
+
+def test_memory(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test /api/service/memory"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    headers = {"X-Service-Token": "secret"}
+    assert client.get("/api/service/memory", headers=headers).status_code == 409  # noqa: PLR2004
+
+    start_memory_tracing()
+    try:
+        response = client.get("/api/service/memory", params={"limit": 5}, headers=headers)
+    finally:
+        stop_memory_tracing()
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json()["enabled"] is True
+    assert len(response.json()["top"]) <= 5  # noqa: PLR2004
+
+
+def test_ping_deep(client: TestClient) -> None:
+    """Test /api/service/ping/deep"""
+    probe = GitLabHealthProbe(lambda: GitLabHTTPv4(FakeClientSession(data={"message": "502"}, status=502)))
+    gitlab_wh.app.dependency_overrides[get_gitlab_health_probe] = lambda: probe
+    try:
+        response = client.get("/api/service/ping/deep")
+    finally:
+        gitlab_wh.app.dependency_overrides.pop(get_gitlab_health_probe, None)
+    assert response.status_code == 503  # noqa: PLR2004
+    assert response.json()["gitlab"]["available"] is False
+
+
+def test_ping_deep_not_configured(client: TestClient) -> None:
+    """Test /api/service/ping/deep without GitLab"""
+    response = client.get("/api/service/ping/deep")
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json() == {"status": "pong", "gitlab": None}
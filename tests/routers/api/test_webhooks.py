@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.dependencies.webhooks import get_webhook_processor, get_webhook_secret_registry
+from src.main import gitlab_wh
+from src.webhooks.admission import AdmissionController
+from src.webhooks.dispatcher import WebhookDispatcher
+from src.webhooks.processing import WebhookProcessor
+from src.webhooks.rules import WebhookRuleEngine
+from src.webhooks.secrets import WebhookSecretRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from fastapi.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def secret_registry() -> Generator[WebhookSecretRegistry, None, None]:
+    """Подменяет реестр секретов вебхуков на тестовый"""
+    registry = WebhookSecretRegistry({"hook-1": "secret-1"})
+    gitlab_wh.app.dependency_overrides[get_webhook_secret_registry] = lambda: registry
+    yield registry
+    gitlab_wh.app.dependency_overrides.pop(get_webhook_secret_registry)
+
+
+def test_receive_webhook(client: TestClient) -> None:
+    """Test POST /api/webhooks/{hook_key}"""
+    response = client.post("/api/webhooks/hook-1", json={"object_kind": "push"},
+                           headers={"X-Gitlab-Token": "secret-1"})
+    assert response.status_code == 202  # noqa: PLR2004
+    assert response.json() == {"status": "accepted"}
+
+
+@pytest.mark.parametrize(("hook_key", "token"), [("hook-1", "wrong"), ("hook-1", None), ("unknown", "secret-1")])
+def test_receive_webhook_unauthorized(client: TestClient, hook_key: str, token: str | None) -> None:
+    """Test POST /api/webhooks/{hook_key} with invalid token"""
+    headers = {"X-Gitlab-Token": token} if token else {}
+    response = client.post(f"/api/webhooks/{hook_key}", json={"object_kind": "push"}, headers=headers)
+    assert response.status_code == 401  # noqa: PLR2004
+
+
+def test_receive_webhook_invalid_payload(client: TestClient) -> None:
+    """Test POST /api/webhooks/{hook_key} with invalid JSON"""
+    response = client.post("/api/webhooks/hook-1", content=b"not json", headers={"X-Gitlab-Token": "secret-1"})
+    assert response.status_code == 400  # noqa: PLR2004
+
+
+def test_receive_webhook_overloaded(client: TestClient) -> None:
+    """Test POST /api/webhooks/{hook_key} with overloaded queue"""
+    processor = WebhookProcessor(
+        WebhookDispatcher(WebhookRuleEngine(), {}),
+        admission=AdmissionController(max_depth=0, retry_after=15),
+    )
+    gitlab_wh.app.dependency_overrides[get_webhook_processor] = lambda: processor
+    try:
+        response = client.post("/api/webhooks/hook-1", json={"object_kind": "pipeline"},
+                               headers={"X-Gitlab-Token": "secret-1"})
+    finally:
+        gitlab_wh.app.dependency_overrides.pop(get_webhook_processor)
+    assert response.status_code == 503  # noqa: PLR2004
+    assert response.headers["Retry-After"] == "15"
+
+
+def test_receive_webhook_overloaded_before_parsing(client: TestClient) -> None:
+    """Test POST /api/webhooks/{hook_key} with overloaded queue does not parse the body"""
+    processor = WebhookProcessor(
+        WebhookDispatcher(WebhookRuleEngine(), {}),
+        admission=AdmissionController(max_depth=0, retry_after=15),
+    )
+    gitlab_wh.app.dependency_overrides[get_webhook_processor] = lambda: processor
+    try:
+        response = client.post("/api/webhooks/hook-1", content=b"not json", headers={"X-Gitlab-Token": "secret-1"})
+    finally:
+        gitlab_wh.app.dependency_overrides.pop(get_webhook_processor)
+    assert response.status_code == 503  # noqa: PLR2004
+    assert response.headers["Retry-After"] == "15"
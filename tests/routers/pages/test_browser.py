@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from src import config
+from src.dependencies.gitlab import get_gitlab_http
+from src.main import gitlab_wh
+from src.repository.http_requests.fake_http import FakeClientSession
+from src.repository.http_requests.gitlab import GitLabHTTPv4
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from fastapi.testclient import TestClient
+
+PROJECTS = [
+    {
+        "id": number,
+        "name_with_namespace": f"group / project-{number}",
+        "default_branch": "main",
+        "last_activity_at": "2024-02-13T21:50:44.824Z",
+    }
+    for number in range(3)
+]
+
+
+@pytest.fixture()
+def fake_gitlab() -> Iterator[Callable[..., None]]:
+    """Подменяет клиент GitLab API на клиент с FakeClientSession"""
+    def override(data: list[dict[str, Any]], headers: dict[str, str] | None = None) -> None:
+        gitlab_http = GitLabHTTPv4(FakeClientSession(data=data, headers=headers))
+        gitlab_wh.app.dependency_overrides[get_gitlab_http] = lambda: gitlab_http
+
+    yield override
+    gitlab_wh.app.dependency_overrides.pop(get_gitlab_http, None)
+
+
+def test_projects(client: TestClient, fake_gitlab: Callable[..., None]) -> None:
+    """Test /projects"""
+    fake_gitlab(PROJECTS, {"X-Next-Page": "2", "X-Total": "60"})
+    response = client.get("/projects", params={"search": "project"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert "group / project-2" in response.text
+    assert 'href="/projects/1/members"' in response.text
+    assert "/projects/rows?page=2&amp;per_page=20&amp;search=project" in response.text
+    assert "<html" in response.text
+
+
+def test_projects_rows(client: TestClient, fake_gitlab: Callable[..., None]) -> None:
+    """Test /projects/rows: HTML fragment of the last page"""
+    fake_gitlab(PROJECTS, {"X-Next-Page": ""})
+    response = client.get("/projects/rows", params={"page": 3})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert "group / project-0" in response.text
+    assert "<html" not in response.text
+    assert "browser-next" not in response.text
+
+
+@pytest.mark.parametrize("path", ["/groups", "/groups/1/members", "/projects/1/members", "/tokens"])
+def test_lists(client: TestClient,
+               fake_gitlab: Callable[..., None],
+               monkeypatch: pytest.MonkeyPatch,
+               path: str,
+               ) -> None:
+    """Test browser pages"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    fake_gitlab([])
+    response = client.get(path, headers={"X-Service-Token": "secret"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert "Ничего не найдено" in response.text
+
+
+@pytest.mark.parametrize(("status", "expected"), [(404, 404), (403, 502), (500, 502)])
+def test_gitlab_error(client: TestClient, status: int, expected: int) -> None:
+    """Test browser pages with GitLab error"""
+    gitlab_http = GitLabHTTPv4(FakeClientSession(data={"message": "error"}, status=status))
+    gitlab_wh.app.dependency_overrides[get_gitlab_http] = lambda: gitlab_http
+    try:
+        response = client.get("/groups/999/members")
+    finally:
+        gitlab_wh.app.dependency_overrides.pop(get_gitlab_http, None)
+    assert response.status_code == expected
+
+
+@pytest.mark.parametrize("path", ["/tokens", "/tokens/rows"])
+def test_tokens_unauthorized(client: TestClient,
+                             fake_gitlab: Callable[..., None],
+                             monkeypatch: pytest.MonkeyPatch,
+                             path: str,
+                             ) -> None:
+    """Test /tokens without a valid X-Service-Token"""
+    fake_gitlab([])
+    assert client.get(path).status_code == 403  # noqa: PLR2004
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    assert client.get(path, headers={"X-Service-Token": "wrong"}).status_code == 401  # noqa: PLR2004
+
+
+def test_per_page_limit(client: TestClient, fake_gitlab: Callable[..., None]) -> None:
+    """Test browser pages per_page limit"""
+    fake_gitlab([])
+    assert client.get("/projects", params={"per_page": 1000}).status_code == 422  # noqa: PLR2004
+
+
+def test_gitlab_not_configured(client: TestClient) -> None:
+    """Test browser pages without GitLab"""
+    assert client.get("/projects").status_code == 503  # noqa: PLR2004
+
+
+def test_projects_server_timing(client: TestClient,
+                                fake_gitlab: Callable[..., None],
+                                monkeypatch: pytest.MonkeyPatch,
+                                ) -> None:
+    """Test /projects Server-Timing: streamed page is rendered after the headers are sent"""
+    monkeypatch.setattr(config, "SERVICE_TOKEN", "secret")
+    fake_gitlab(PROJECTS)
+    headers = {"X-Service-Token": "secret"}
+    server_timing = client.get("/projects", headers=headers).headers["Server-Timing"]
+    assert "gitlab;dur=" in server_timing
+    assert "json;dur=" in server_timing
+    assert "render;dur=" not in server_timing
+    assert "render;dur=" in client.get("/projects/rows", headers=headers).headers["Server-Timing"]
+    assert "Server-Timing" not in client.get("/projects").headers
+
+
+def test_projects_streaming(client: TestClient, fake_gitlab: Callable[..., None]) -> None:
+    """Test /projects is streamed and /projects/rows is not"""
+    fake_gitlab(PROJECTS)
+    assert "Content-Length" not in client.get("/projects").headers
+    assert "Content-Length" in client.get("/projects/rows").headers
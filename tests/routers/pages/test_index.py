@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from src.dashboard.collector import DashboardCollector
+from src.dashboard.snapshot import DashboardSnapshot
+from src.dependencies.dashboard import get_dashboard_collector
+from src.main import gitlab_wh
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+
+def test_index(client: TestClient) -> None:
+    """Test /"""
+    response = client.get("/")
+    assert response.status_code == 200  # noqa: PLR2004
+    assert "Главная" in response.text
+    assert response.headers["ETag"]
+
+
+def test_index_not_modified(client: TestClient) -> None:
+    """Test / with If-None-Match"""
+    etag = client.get("/").headers["ETag"]
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304  # noqa: PLR2004
+    assert response.content == b""
+
+
+def test_index_not_modified_gzip(client: TestClient) -> None:
+    """Test / with If-None-Match from a compressed response"""
+    etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    assert etag.startswith("W/")
+    assert client.get("/", headers={"Accept-Encoding": "identity"}).headers["ETag"] == etag
+    response = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304  # noqa: PLR2004
+    assert response.headers["ETag"] == etag
+
+
+def test_index_static_urls(client: TestClient) -> None:
+    """Test / static urls with content hash"""
+    response = client.get("/")
+    assert "/static/css/bootstrap.min.css" not in response.text
+    assert "/static/css/bootstrap.min." in response.text
+
+
+def test_index_preload(client: TestClient) -> None:
+    """Test / Link preload header"""
+    response = client.get("/")
+    assert "rel=preload; as=style" in response.headers["Link"]
+    assert "/static/css/bootstrap.min." in response.headers["Link"]
+
+
+def test_index_dashboard(client: TestClient) -> None:
+    """Test / with dashboard snapshot"""
+    snapshot = DashboardSnapshot(
+        updated_at=datetime(2024, 2, 13, 21, 50, tzinfo=UTC),
+        duration=0.1,
+        groups_count=7,
+        projects_count=42,
+        active_users_count=3,
+        recent_projects=({"id": 5, "name_with_namespace": "group / project", "last_activity_at": "2024-02-13"},),
+        expiring_tokens=(),
+        expiring_tokens_count=0,
+    )
+    collector = DashboardCollector(lambda: None)
+    collector._snapshot = snapshot  # noqa: SLF001
+    gitlab_wh.app.dependency_overrides[get_dashboard_collector] = lambda: collector
+    try:
+        response = client.get("/")
+    finally:
+        gitlab_wh.app.dependency_overrides.pop(get_dashboard_collector, None)
+    assert "Обновлено: 2024-02-13 21:50:00 UTC" in response.text
+    assert "group / project" in response.text
+    assert ">42<" in response.text
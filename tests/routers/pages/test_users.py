@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.app.templates import CommonTemplateResponseGenerator
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+
+def test_sign_in(client: TestClient) -> None:
+    """Test /users/sign_in"""
+    response = client.get("/users/sign_in", params={"redirect": "/projects"})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert "/projects" in response.text
+
+
+def test_sign_in_cached(client: TestClient) -> None:
+    """Test /users/sign_in with default redirect is cached"""
+    etag = client.get("/users/sign_in").headers["ETag"]
+    response = client.get("/users/sign_in", headers={"If-None-Match": etag})
+    assert response.status_code == 304  # noqa: PLR2004
+
+
+def test_sign_in_not_cached(client: TestClient) -> None:
+    """Test /users/sign_in with different redirects does not fill page cache"""
+    page_cache = CommonTemplateResponseGenerator._page_cache  # noqa: SLF001
+    cached_pages = len(page_cache)
+    for index in range(5):
+        response = client.get("/users/sign_in", params={"redirect": f"/page-{index}"})
+        assert "ETag" not in response.headers
+    assert len(page_cache) == cached_pages
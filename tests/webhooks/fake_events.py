@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+FakeEventKind = Literal["push", "merge_request", "pipeline", "member", "system"]
+FAKE_EVENT_KINDS: tuple[FakeEventKind, ...] = ("push", "merge_request", "pipeline", "member", "system")
+
+
+class FakeWebhookPayloads:
+    """Генератор реалистичных тел вебхуков GitLab для тестов и бенчмарков
+
+    Структура тел повторяет документацию GitLab:
+        Webhook events - https://docs.gitlab.com/ee/user/project/integrations/webhook_events.html
+        System hooks - https://docs.gitlab.com/ee/administration/system_hooks.html
+
+    Размер тела регулируется параметром `size`: количество коммитов в push, изменений в MR,
+    джобов в pipeline.
+    """
+    def __init__(self, *, projects: int = 100, users: int = 50, size: int = 3, seed: int | None = None) -> None:
+        """Конструктор
+
+        Args:
+            projects: количество различных проектов, по которым генерируются события
+            users: количество различных пользователей
+            size: размер тела события (коммиты/изменения/джобы)
+            seed: seed генератора случайных чисел для воспроизводимости
+        """
+        self._random = random.Random(seed)
+        self._projects = projects
+        self._users = users
+        self._size = size
+
+    def payload(self, kind: FakeEventKind) -> dict[str, Any]:
+        """Сгенерировать тело вебхука заданного вида
+
+        Args:
+            kind: вид события
+
+        Returns:
+            Тело вебхука
+        """
+        return getattr(self, kind)()  # type: ignore[no-any-return]
+
+    def random_payload(self, weights: dict[FakeEventKind, float] | None = None) -> dict[str, Any]:
+        """Сгенерировать тело вебхука случайного вида
+
+        Args:
+            weights: веса видов событий, по умолчанию - равные
+
+        Returns:
+            Тело вебхука
+        """
+        weights = weights or dict.fromkeys(FAKE_EVENT_KINDS, 1.0)
+        kind = self._random.choices(list(weights), list(weights.values()))[0]
+        return self.payload(kind)
+
+    def push(self) -> dict[str, Any]:
+        """Push event"""
+        project = self._project()
+        user = self._user()
+        commits = [self._commit(project, user) for _ in range(self._size)]
+        return {
+            "object_kind": "push",
+            "event_name": "push",
+            "before": self._sha(),
+            "after": commits[-1]["id"] if commits else self._sha(),
+            "ref": f"refs/heads/{self._branch()}",
+            "ref_protected": True,
+            "checkout_sha": commits[-1]["id"] if commits else None,
+            "user_id": user["id"],
+            "user_name": user["name"],
+            "user_username": user["username"],
+            "user_email": user["email"],
+            "user_avatar": None,
+            "project_id": project["id"],
+            "project": project,
+            "repository": self._repository(project),
+            "commits": commits,
+            "total_commits_count": len(commits),
+        }
+
+    def merge_request(self) -> dict[str, Any]:
+        """Merge request event"""
+        project = self._project()
+        user = self._user()
+        iid = self._random.randint(1, 500)
+        source_branch = self._branch()
+        return {
+            "object_kind": "merge_request",
+            "event_type": "merge_request",
+            "user": user,
+            "project": project,
+            "repository": self._repository(project),
+            "object_attributes": {
+                "id": self._random.randint(1, 10**6),
+                "iid": iid,
+                "target_branch": project["default_branch"],
+                "source_branch": source_branch,
+                "source_project_id": project["id"],
+                "target_project_id": project["id"],
+                "author_id": user["id"],
+                "title": f"Merge {source_branch}",
+                "description": "Lorem ipsum " * self._size,
+                "state": "opened",
+                "merge_status": "can_be_merged",
+                "action": self._random.choice(["open", "update", "approved", "merge"]),
+                "url": f"{project['web_url']}/-/merge_requests/{iid}",
+                "last_commit": self._commit(project, user),
+                "created_at": self._timestamp(),
+                "updated_at": self._timestamp(),
+            },
+            "labels": [],
+            "changes": {
+                f"field_{number}": {"previous": number, "current": number + 1} for number in range(self._size)
+            },
+        }
+
+    def pipeline(self) -> dict[str, Any]:
+        """Pipeline event"""
+        project = self._project()
+        user = self._user()
+        pipeline_id = self._random.randint(1, 10**6)
+        status = self._random.choice(["pending", "running", "success", "failed"])
+        return {
+            "object_kind": "pipeline",
+            "object_attributes": {
+                "id": pipeline_id,
+                "iid": self._random.randint(1, 10**4),
+                "ref": self._branch(),
+                "tag": False,
+                "sha": self._sha(),
+                "source": "push",
+                "status": status,
+                "stages": ["build", "test", "deploy"],
+                "created_at": self._timestamp(),
+                "finished_at": None,
+                "duration": None,
+                "url": f"{project['web_url']}/-/pipelines/{pipeline_id}",
+            },
+            "merge_request": None,
+            "user": user,
+            "project": project,
+            "commit": self._commit(project, user),
+            "builds": [
+                {
+                    "id": pipeline_id * 100 + number,
+                    "stage": ("build", "test", "deploy")[number % 3],
+                    "name": f"job-{number}",
+                    "status": status,
+                    "created_at": self._timestamp(),
+                    "when": "on_success",
+                    "manual": False,
+                    "allow_failure": False,
+                    "user": user,
+                    "runner": None,
+                }
+                for number in range(self._size)
+            ],
+        }
+
+    def member(self) -> dict[str, Any]:
+        """Group member event"""
+        user = self._user()
+        group_id = self._random.randint(1, max(self._projects // 10, 1))
+        return {
+            "event_name": "user_add_to_group",
+            "created_at": self._timestamp(),
+            "updated_at": self._timestamp(),
+            "group_name": f"group-{group_id}",
+            "group_path": f"group-{group_id}",
+            "group_id": group_id,
+            "user_username": user["username"],
+            "user_name": user["name"],
+            "user_email": user["email"],
+            "user_id": user["id"],
+            "group_access": self._random.choice(["Guest", "Reporter", "Developer", "Maintainer"]),
+            "group_plan": None,
+            "expires_at": None,
+        }
+
+    def system(self) -> dict[str, Any]:
+        """System hook: project_create/user_create"""
+        if self._random.random() < 0.5:  # noqa: PLR2004
+            project = self._project()
+            return {
+                "event_name": "project_create",
+                "created_at": self._timestamp(),
+                "updated_at": self._timestamp(),
+                "name": project["name"],
+                "owner_email": "owner@example.com",
+                "owner_name": "Owner",
+                "owners": [{"name": "Owner", "email": "owner@example.com"}],
+                "path": project["path"],
+                "path_with_namespace": project["path_with_namespace"],
+                "project_id": project["id"],
+                "project_visibility": "private",
+            }
+        user = self._user()
+        return {
+            "event_name": "user_create",
+            "created_at": self._timestamp(),
+            "updated_at": self._timestamp(),
+            "email": user["email"],
+            "name": user["name"],
+            "username": user["username"],
+            "user_id": user["id"],
+        }
+
+    def _project(self) -> dict[str, Any]:
+        project_id = self._random.randint(1, self._projects)
+        group = f"group-{project_id % max(self._projects // 10, 1) + 1}"
+        path = f"project-{project_id}"
+        web_url = f"http://gitlab.example.com/{group}/{path}"
+        return {
+            "id": project_id,
+            "name": path,
+            "description": None,
+            "web_url": web_url,
+            "avatar_url": None,
+            "git_ssh_url": f"git@gitlab.example.com:{group}/{path}.git",
+            "git_http_url": f"{web_url}.git",
+            "namespace": group,
+            "visibility_level": 0,
+            "path": path,
+            "path_with_namespace": f"{group}/{path}",
+            "default_branch": "main",
+            "ci_config_path": None,
+            "homepage": web_url,
+            "url": f"git@gitlab.example.com:{group}/{path}.git",
+            "ssh_url": f"git@gitlab.example.com:{group}/{path}.git",
+            "http_url": f"{web_url}.git",
+        }
+
+    def _user(self) -> dict[str, Any]:
+        user_id = self._random.randint(1, self._users)
+        return {
+            "id": user_id,
+            "name": f"User {user_id}",
+            "username": f"user{user_id}",
+            "avatar_url": None,
+            "email": f"user{user_id}@example.com",
+        }
+
+    def _repository(self, project: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "name": project["name"],
+            "url": project["url"],
+            "description": project["description"],
+            "homepage": project["homepage"],
+            "git_http_url": project["git_http_url"],
+            "git_ssh_url": project["git_ssh_url"],
+            "visibility_level": project["visibility_level"],
+        }
+
+    def _commit(self, project: dict[str, Any], user: dict[str, Any]) -> dict[str, Any]:
+        sha = self._sha()
+        return {
+            "id": sha,
+            "message": f"Update file {self._random.randint(1, 1000)}\n",
+            "title": "Update file",
+            "timestamp": self._timestamp(),
+            "url": f"{project['web_url']}/-/commit/{sha}",
+            "author": {"name": user["name"], "email": user["email"]},
+            "added": [],
+            "modified": [f"src/module_{self._random.randint(1, 100)}.py"],
+            "removed": [],
+        }
+
+    def _branch(self) -> str:
+        return self._random.choice(["main", "develop", f"feature/{self._random.randint(1, 50)}"])
+
+    def _sha(self) -> str:
+        return hashlib.sha1(self._random.randbytes(8), usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
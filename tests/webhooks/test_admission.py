@@ -0,0 +1,48 @@
+from typing import ClassVar
+
+import pytest
+
+from src.webhooks.admission import AdmissionController, Priority, get_priority
+
+
+class TestAdmissionController:
+    """Testing class AdmissionController"""
+    test_admit_data: ClassVar[list[tuple[Priority, int, int]]] = [
+        (Priority.LOW, 0, 202),
+        (Priority.LOW, 50, 429),
+        (Priority.NORMAL, 50, 202),
+        (Priority.NORMAL, 80, 429),
+        (Priority.HIGH, 99, 202),
+        (Priority.HIGH, 100, 503),
+    ]
+
+    @pytest.mark.parametrize(("priority", "depth", "expected"), test_admit_data)
+    def test_admit(self, priority: Priority, depth: int, expected: int) -> None:
+        """Testing AdmissionController.admit by queue depth"""
+        decision = AdmissionController(max_depth=100, retry_after=7).admit(priority, depth)
+        assert decision.status_code == expected
+        assert decision.retry_after == (0 if decision.accepted else 7)
+
+    def test_admit_memory(self) -> None:
+        """Testing AdmissionController.admit by memory watermarks"""
+        soft = AdmissionController(memory_soft_limit=1)
+        assert soft.admit(Priority.NORMAL, 0).status_code == 429  # noqa: PLR2004
+        assert soft.admit(Priority.HIGH, 0).accepted
+
+        hard = AdmissionController(memory_hard_limit=1)
+        assert hard.admit(Priority.HIGH, 0).status_code == 503  # noqa: PLR2004
+        assert hard.rejected[Priority.HIGH, 503] == 1
+
+    def test_check(self) -> None:
+        """Testing AdmissionController.check"""
+        controller = AdmissionController(max_depth=100)
+        assert controller.check(99).accepted
+        assert controller.check(100).status_code == 503  # noqa: PLR2004
+        assert controller.rejected[Priority.HIGH, 503] == 1
+
+
+def test_get_priority() -> None:
+    """Testing get_priority"""
+    assert get_priority("member") == Priority.HIGH
+    assert get_priority("push") == Priority.NORMAL
+    assert get_priority("pipeline") == Priority.LOW
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.webhooks.coalescing import WebhookCoalescer
+from src.webhooks.events import WebhookEvent
+
+
+def push_event(ref: str, number: int) -> WebhookEvent:
+    """Создает push событие"""
+    payload = {"object_kind": "push", "ref": ref, "after": str(number), "project": {"path_with_namespace": "a/b"}}
+    return WebhookEvent.from_payload("hook", payload)
+
+
+def merge_request_event(iid: int) -> WebhookEvent:
+    """Создает merge_request событие"""
+    payload = {
+        "object_kind": "merge_request",
+        "object_attributes": {"iid": iid, "source_branch": "feature"},
+        "project": {"path_with_namespace": "a/b"},
+    }
+    return WebhookEvent.from_payload("hook", payload)
+
+
+class TestWebhookCoalescer:
+    """Testing class WebhookCoalescer"""
+
+    @pytest.mark.asyncio()
+    async def test_window(self) -> None:
+        """Testing WebhookCoalescer.add with time window"""
+        emitted: list[WebhookEvent] = []
+        coalescer = WebhookCoalescer(emitted.append, key="ref", window=0.01)
+        for number in range(5):
+            coalescer.add(push_event("refs/heads/main", number))
+        coalescer.add(push_event("refs/heads/dev", 0))
+        assert coalescer.pending == 6  # noqa: PLR2004
+        assert emitted == []
+
+        await asyncio.sleep(0.05)
+        assert coalescer.pending == 0
+        main, dev = emitted
+        assert main.count == 5  # noqa: PLR2004
+        assert main.payload["after"] == "4"
+        assert dev.count == 1
+
+    @pytest.mark.asyncio()
+    async def test_max_batch(self) -> None:
+        """Testing WebhookCoalescer.add with max batch size"""
+        emitted: list[WebhookEvent] = []
+        coalescer = WebhookCoalescer(emitted.append, key="project", window=60, max_batch=3)
+        for number in range(4):
+            coalescer.add(push_event(f"refs/heads/{number}", number))
+        assert [event.count for event in emitted] == [3]
+
+        coalescer.flush()
+        assert [event.count for event in emitted] == [3, 1]
+
+    @pytest.mark.asyncio()
+    async def test_merge_request_key(self) -> None:
+        """Testing WebhookCoalescer.get_key by merge request iid"""
+        coalescer = WebhookCoalescer(lambda _event: None, key="merge_request")
+        assert coalescer.get_key(merge_request_event(1)) == coalescer.get_key(merge_request_event(1))
+        assert coalescer.get_key(merge_request_event(1)) != coalescer.get_key(merge_request_event(2))
+
+    def test_disabled(self) -> None:
+        """Testing WebhookCoalescer.add with window=0"""
+        emitted: list[WebhookEvent] = []
+        coalescer = WebhookCoalescer(emitted.append, window=0)
+        coalescer.add(push_event("refs/heads/main", 0))
+        assert len(emitted) == 1
@@ -0,0 +1,46 @@
+import pytest
+
+from src.webhooks.dispatcher import WebhookDispatcher
+from src.webhooks.events import WebhookEvent
+from src.webhooks.rules import WebhookRule, WebhookRuleEngine
+
+
+class TestWebhookEvent:
+    """Testing class WebhookEvent"""
+
+    def test_from_payload(self) -> None:
+        """Testing WebhookEvent.from_payload"""
+        event = WebhookEvent.from_payload("hook", {"object_kind": "push", "project": {"path_with_namespace": "a/b"}})
+        assert event.kind == "push"
+        assert event.project_path == "a/b"
+
+    def test_from_system_hook_payload(self) -> None:
+        """Testing WebhookEvent.from_payload with system hook"""
+        event = WebhookEvent.from_payload("hook", {"event_name": "project_create", "path_with_namespace": "a/b"})
+        assert event.kind == "project_create"
+        assert event.project_path == "a/b"
+
+
+class TestWebhookDispatcher:
+    """Testing class WebhookDispatcher"""
+
+    @pytest.mark.asyncio()
+    async def test_dispatch(self) -> None:
+        """Testing WebhookDispatcher.dispatch"""
+        called: list[str] = []
+
+        async def action(event: WebhookEvent) -> None:
+            called.append(event.project_path)
+
+        async def failing_action(_event: WebhookEvent) -> None:
+            raise RuntimeError
+
+        engine = WebhookRuleEngine([
+            WebhookRule("push", "a/**", "action"),
+            WebhookRule("push", "a/**", "failing_action"),
+            WebhookRule("push", "a/**", "unknown_action"),
+        ])
+        dispatcher = WebhookDispatcher(engine, {"action": action, "failing_action": failing_action})
+        event = WebhookEvent.from_payload("hook", {"object_kind": "push", "project": {"path_with_namespace": "a/b"}})
+        assert await dispatcher.dispatch(event) == 2  # noqa: PLR2004
+        assert called == ["a/b"]
@@ -0,0 +1,23 @@
+import pytest
+
+from src.webhooks.admission import Priority, get_priority
+from src.webhooks.events import WebhookEvent
+from tests.webhooks.fake_events import FAKE_EVENT_KINDS, FakeEventKind, FakeWebhookPayloads
+
+
+class TestFakeWebhookPayloads:
+    """Testing class FakeWebhookPayloads"""
+
+    @pytest.mark.parametrize("kind", FAKE_EVENT_KINDS)
+    def test_payload(self, kind: FakeEventKind) -> None:
+        """Testing FakeWebhookPayloads.payload"""
+        event = WebhookEvent.from_payload("hook", FakeWebhookPayloads(seed=1).payload(kind))
+        assert event.kind
+        assert event.project_path
+        if kind == "member":
+            assert get_priority(event.kind) == Priority.HIGH
+
+    def test_size(self) -> None:
+        """Testing FakeWebhookPayloads with size"""
+        payload = FakeWebhookPayloads(size=10, seed=1).push()
+        assert len(payload["commits"]) == payload["total_commits_count"] == 10  # noqa: PLR2004
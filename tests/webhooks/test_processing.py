@@ -0,0 +1,55 @@
+import pytest
+
+from src.webhooks.admission import AdmissionController
+from src.webhooks.dispatcher import WebhookDispatcher
+from src.webhooks.events import WebhookEvent
+from src.webhooks.processing import WebhookProcessor
+from src.webhooks.rules import WebhookRule, WebhookRuleEngine
+
+
+class TestWebhookProcessor:
+    """Testing class WebhookProcessor"""
+
+    @pytest.mark.asyncio()
+    async def test_submit_and_close(self) -> None:
+        """Testing WebhookProcessor.submit and WebhookProcessor.close"""
+        handled: list[WebhookEvent] = []
+
+        async def action(event: WebhookEvent) -> None:
+            handled.append(event)
+
+        dispatcher = WebhookDispatcher(WebhookRuleEngine([WebhookRule("push", "**", "action")]), {"action": action})
+        processor = WebhookProcessor(dispatcher, coalesce_key="project", coalesce_window=60)
+        for _ in range(3):
+            processor.submit(WebhookEvent.from_payload("hook", {"object_kind": "push"}))
+        assert handled == []
+
+        await processor.close()
+        assert [event.count for event in handled] == [3]
+
+    @pytest.mark.asyncio()
+    async def test_workers(self) -> None:
+        """Testing WebhookProcessor.start"""
+        handled: list[str] = []
+
+        async def action(event: WebhookEvent) -> None:
+            handled.append(event.kind)
+
+        engine = WebhookRuleEngine([WebhookRule("*", "**", "action")])
+        processor = WebhookProcessor(WebhookDispatcher(engine, {"action": action}), coalesce_window=0)
+        processor.start()
+        processor.submit(WebhookEvent.from_payload("hook", {"object_kind": "pipeline"}))
+        processor.submit(WebhookEvent.from_payload("hook", {"object_kind": "member"}))
+        await processor.close()
+        assert sorted(handled) == ["member", "pipeline"]
+        assert processor.depth == 0
+
+    def test_submit_rejected(self) -> None:
+        """Testing WebhookProcessor.submit with overloaded queue"""
+        processor = WebhookProcessor(
+            WebhookDispatcher(WebhookRuleEngine(), {}),
+            admission=AdmissionController(max_depth=0),
+        )
+        decision = processor.submit(WebhookEvent.from_payload("hook", {"object_kind": "push"}))
+        assert decision.status_code == 503  # noqa: PLR2004
+        assert processor.depth == 0
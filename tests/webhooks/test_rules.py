@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, ClassVar
+
+import pytest
+
+from src.webhooks.rules import WebhookRule, WebhookRuleEngine
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestWebhookRuleEngine:
+    """Testing class WebhookRuleEngine"""
+    rules: ClassVar[list[WebhookRule]] = [
+        WebhookRule("push", "backend/api", "exact"),
+        WebhookRule("push", "backend/*", "one_segment"),
+        WebhookRule("push", "backend/**", "any_depth"),
+        WebhookRule("merge_request", "*/service-*", "glob"),
+        WebhookRule("*", "**", "everything"),
+        WebhookRule("pipeline", "frontend/**/web", "deep_middle"),
+    ]
+    test_match_data: ClassVar[list[tuple[str, str, list[str]]]] = [
+        ("push", "backend/api", ["exact", "one_segment", "any_depth", "everything"]),
+        ("push", "backend/libs/core", ["any_depth", "everything"]),
+        ("push", "backend", ["any_depth", "everything"]),
+        ("push", "frontend/web", ["everything"]),
+        ("merge_request", "backend/service-users", ["glob", "everything"]),
+        ("merge_request", "backend/libs/service-users", ["everything"]),
+        ("pipeline", "frontend/web", ["everything", "deep_middle"]),
+        ("pipeline", "frontend/apps/main/web", ["everything", "deep_middle"]),
+        ("user_create", "", ["everything"]),
+    ]
+
+    @pytest.mark.parametrize(("event_kind", "project_path", "expected"), test_match_data)
+    def test_match(self, event_kind: str, project_path: str, expected: list[str]) -> None:
+        """Testing WebhookRuleEngine.match"""
+        engine = WebhookRuleEngine(self.rules)
+        assert [rule.action for rule in engine.match(event_kind, project_path)] == expected
+
+    def test_empty(self) -> None:
+        """Testing WebhookRuleEngine.match without rules"""
+        assert WebhookRuleEngine().match("push", "backend/api") == []
+
+    def test_from_file(self, tmp_path: Path) -> None:
+        """Testing WebhookRuleEngine.from_file"""
+        file_path = tmp_path / "rules.json"
+        file_path.write_text(json.dumps([{"event": "push", "project": "backend/**", "action": "log"}]))
+        engine = WebhookRuleEngine.from_file(file_path)
+        assert [rule.action for rule in engine.match("push", "backend/api")] == ["log"]
+        assert len(WebhookRuleEngine.from_file(tmp_path / "missing.json")) == 0
+
+    @pytest.mark.parametrize("content", ["[{broken", '{"event": "push"}', '[{"event": "push"}]', '["push"]'])
+    def test_from_broken_file(self, tmp_path: Path, content: str) -> None:
+        """Testing WebhookRuleEngine.from_file with broken JSON or missing keys"""
+        file_path = tmp_path / "rules.json"
+        file_path.write_text(content)
+        assert len(WebhookRuleEngine.from_file(file_path)) == 0
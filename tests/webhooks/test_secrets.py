@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+from src.webhooks.secrets import WebhookSecretRegistry
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestWebhookSecretRegistry:
+    """Testing class WebhookSecretRegistry"""
+
+    def test_verify(self) -> None:
+        """Testing WebhookSecretRegistry.verify"""
+        registry = WebhookSecretRegistry({"hook-1": "secret-1", "hook-2": "secret-2"})
+        assert registry.verify("hook-1", "secret-1")
+        assert registry.verify("hook-2", "secret-2")
+        assert not registry.verify("hook-1", "secret-2")
+        assert not registry.verify("hook-1", None)
+        assert not registry.verify("unknown", "secret-1")
+
+    def test_replace(self) -> None:
+        """Testing WebhookSecretRegistry.replace"""
+        registry = WebhookSecretRegistry({"hook-1": "secret-1"})
+        registry.replace({"hook-2": "secret-2"})
+        assert "hook-1" not in registry
+        assert registry.verify("hook-2", "secret-2")
+
+    def test_reload_if_changed(self, tmp_path: Path) -> None:
+        """Testing WebhookSecretRegistry.reload_if_changed"""
+        file_path = tmp_path / "secrets.json"
+        file_path.write_text(json.dumps({"hook-1": "secret-1"}))
+        registry = WebhookSecretRegistry(file_path=file_path, reload_interval=0)
+        assert registry.verify("hook-1", "secret-1")
+
+        file_path.write_text(json.dumps({"hook-1": "new-secret", "hook-2": "secret-2"}))
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert registry.verify("hook-1", "new-secret")
+        assert not registry.verify("hook-1", "secret-1")
+        assert len(registry) == 2  # noqa: PLR2004
+
+    def test_reload_broken_file(self, tmp_path: Path) -> None:
+        """Testing WebhookSecretRegistry.reload_if_changed with broken JSON"""
+        file_path = tmp_path / "secrets.json"
+        file_path.write_text(json.dumps({"hook-1": "secret-1"}))
+        registry = WebhookSecretRegistry(file_path=file_path, reload_interval=0)
+
+        file_path.write_text("{broken")
+        assert not registry.reload_if_changed(force=True)
+        assert registry.verify("hook-1", "secret-1")
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Testing WebhookSecretRegistry with missing file"""
+        registry = WebhookSecretRegistry(file_path=tmp_path / "missing.json")
+        assert len(registry) == 0
+
+    def test_missing_file_keeps_secrets(self, tmp_path: Path) -> None:
+        """Testing WebhookSecretRegistry keeps secrets when the file is missing"""
+        registry = WebhookSecretRegistry({"hook-1": "secret-1"}, file_path=tmp_path / "missing.json")
+        assert registry.verify("hook-1", "secret-1")
+
+    def test_inaccessible_file(self, tmp_path: Path) -> None:
+        """Testing WebhookSecretRegistry.reload_if_changed keeps the last good secrets on OSError"""
+        directory = tmp_path / "secrets"
+        directory.mkdir()
+        file_path = directory / "secrets.json"
+        file_path.write_text(json.dumps({"hook-1": "secret-1"}))
+        registry = WebhookSecretRegistry(file_path=file_path, reload_interval=0)
+
+        file_path.unlink()
+        directory.rmdir()
+        directory.write_text("")  # stat() -> NotADirectoryError
+        assert not registry.reload_if_changed(force=True)
+        assert registry.verify("hook-1", "secret-1")